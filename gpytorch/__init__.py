@@ -9,6 +9,7 @@ from . import (
     means,
     mlls,
     models,
+    optim,
     priors,
     settings,
     utils,
@@ -49,6 +50,7 @@ __all__ = [
     "means",
     "mlls",
     "models",
+    "optim",
     "priors",
     "utils",
     "variational",
@@ -9,6 +9,7 @@ class InvMatmul(Function):
     def __init__(self, representation_tree, has_left=False):
         self.representation_tree = representation_tree
         self.has_left = has_left
+        self._settings = settings._captured_settings()
 
     def forward(self, *args):
         left_tensor = None
@@ -52,7 +53,12 @@ class InvMatmul(Function):
 
         return res
 
-    def backward(self, grad_output):
+    def backward(self, *grad_outputs):
+        # The backward pass runs in a PyTorch worker thread, with the settings of the forward pass
+        with self._settings:
+            return self._backward(*grad_outputs)
+
+    def _backward(self, grad_output):
         # Extract items that were saved
         if self.has_left:
             solves, left_tensor, right_tensor, *matrix_args = self.saved_tensors
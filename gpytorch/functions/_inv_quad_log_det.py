@@ -50,6 +50,7 @@ class InvQuadLogDet(Function):
 
         self.probe_vectors = probe_vectors
         self.probe_vector_norms = probe_vector_norms
+        self._settings = settings._captured_settings()
 
     def forward(self, *args):
         """
@@ -138,7 +139,12 @@ class InvQuadLogDet(Function):
 
         return inv_quad_term, logdet_term
 
-    def backward(self, inv_quad_grad_output, logdet_grad_output):
+    def backward(self, *grad_outputs):
+        # The backward pass runs in a PyTorch worker thread, with the settings of the forward pass
+        with self._settings:
+            return self._backward(*grad_outputs)
+
+    def _backward(self, inv_quad_grad_output, logdet_grad_output):
         matrix_arg_grads = None
         inv_quad_rhs_grad = None
 
@@ -7,6 +7,7 @@ from .. import settings
 class Matmul(Function):
     def __init__(self, representation_tree):
         self.representation_tree = representation_tree
+        self._settings = settings._captured_settings()
 
     def forward(self, rhs, *matrix_args):
         orig_rhs = rhs
@@ -30,7 +31,12 @@ class Matmul(Function):
             res = res.squeeze(-1)
         return res
 
-    def backward(self, grad_output):
+    def backward(self, *grad_outputs):
+        # The backward pass runs in a PyTorch worker thread, with the settings of the forward pass
+        with self._settings:
+            return self._backward(*grad_outputs)
+
+    def _backward(self, grad_output):
         rhs = self.saved_tensors[0]
         matrix_args = self.saved_tensors[1:]
         rhs_shape = rhs.shape
@@ -38,19 +44,21 @@ class Matmul(Function):
         rhs_grad = None
         arg_grads = [None] * len(matrix_args)
 
+        # Get the LazyTensor (reconstructing it at most once for both gradients)
+        if any(self.needs_input_grad):
+            if hasattr(self, "_lazy_tsr"):
+                lazy_tsr = self._lazy_tsr
+            else:
+                lazy_tsr = self.representation_tree(*matrix_args)
+
         # input_1 gradient
         if any(self.needs_input_grad[1:]):
             rhs = rhs.unsqueeze(-1) if (rhs.ndimension() == 1) else rhs
             grad_output_matrix = grad_output.unsqueeze(-1) if grad_output.ndimension() == 1 else grad_output
-            arg_grads = self.representation_tree(*matrix_args)._quad_form_derivative(grad_output_matrix, rhs)
+            arg_grads = lazy_tsr._quad_form_derivative(grad_output_matrix, rhs)
 
         # input_2 gradient
         if self.needs_input_grad[0]:
-            if hasattr(self, "_lazy_tsr"):
-                lazy_tsr = self._lazy_tsr
-            else:
-                lazy_tsr = self.representation_tree(*matrix_args)
-
             if grad_output.dim() == 1:
                 # Confusing Cublas_Sgemv bug when grad_output is single dimensional on GPU.
                 rhs_grad = lazy_tsr._t_matmul(grad_output.unsqueeze(-1)).squeeze(-1)
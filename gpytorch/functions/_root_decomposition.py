@@ -28,6 +28,7 @@ class RootDecomposition(Function):
         self.root = root
         self.inverse = inverse
         self.initial_vectors = initial_vectors
+        self._settings = settings._captured_settings()
 
     def forward(self, *matrix_args):
         """
@@ -100,7 +101,12 @@ class RootDecomposition(Function):
         self.save_for_backward(*to_save)
         return root, inverse
 
-    def backward(self, root_grad_output, inverse_grad_output):
+    def backward(self, *grad_outputs):
+        # The backward pass runs in a PyTorch worker thread, with the settings of the forward pass
+        with self._settings:
+            return self._backward(*grad_outputs)
+
+    def _backward(self, root_grad_output, inverse_grad_output):
         # Taken from http://homepages.inf.ed.ac.uk/imurray2/pub/16choldiff/choldiff.pdf
         if any(self.needs_input_grad):
             def is_empty(tensor):
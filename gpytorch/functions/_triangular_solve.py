@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+
+from torch.autograd import Function
+from ..utils.cholesky import triangular_solve
+
+
+class TriangularSolve(Function):
+    """
+    Solves :math:`L x = b` (or :math:`L^\\top x = b` if `transpose`) for a lower triangular :math:`L`.
+
+    Unlike :func:`torch.trtrs`, the gradient with respect to :math:`L` is not restricted to its lower triangle.
+    This matches the gradient of a :obj:`~gpytorch.lazy.RootLazyTensor` with root :math:`L`.
+    """
+
+    def __init__(self, transpose=False):
+        self.transpose = transpose
+
+    def forward(self, rhs, chol):
+        res = triangular_solve(rhs, chol, upper=False, transpose=self.transpose)
+        self.save_for_backward(chol, res)
+        return res
+
+    def backward(self, grad_output):
+        chol, res = self.saved_tensors
+        rhs_grad = None
+        chol_grad = None
+
+        inv_grad = triangular_solve(grad_output, chol, upper=False, transpose=not self.transpose)
+        if self.needs_input_grad[0]:
+            rhs_grad = inv_grad
+        if self.needs_input_grad[1]:
+            if self.transpose:
+                chol_grad = res.matmul(inv_grad.transpose(-1, -2)).mul_(-1)
+            else:
+                chol_grad = inv_grad.matmul(res.transpose(-1, -2)).mul_(-1)
+
+        return rhs_grad, chol_grad
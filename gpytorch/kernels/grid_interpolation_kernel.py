@@ -3,6 +3,7 @@
 import torch
 from .grid_kernel import GridKernel
 from ..lazy import InterpolatedLazyTensor
+from ..utils import sparse
 from ..utils.interpolation import Interpolation
 
 
@@ -113,7 +114,38 @@ class GridInterpolationKernel(GridKernel):
             for bound, spacing in zip(self.grid_bounds, grid_spacings)
         )
 
-    def _compute_grid(self, inputs, batch_dims):
+    def _compute_grid(self, inputs, batch_dims, num_grid_points):
+        """
+        Returns the interpolation indices and values of the inputs, and their sparse (transposed) interpolation
+        matrix.
+
+        The interpolation only depends on the inputs and the grid, so we reuse it if neither has changed
+        (e.g. for fixed training data).
+        """
+        if not inputs.requires_grad and hasattr(self, "_compute_grid_memo"):
+            memo_inputs, memo_batch_dims, memo_grid, memo_grid_version, memo_res = self._compute_grid_memo
+            if (
+                memo_batch_dims == batch_dims
+                and memo_grid is self.grid
+                and memo_grid_version == self.grid._version
+                and memo_inputs.shape == inputs.shape
+                and memo_inputs.dtype == inputs.dtype
+                and memo_inputs.device == inputs.device
+                and torch.equal(memo_inputs, inputs)
+            ):
+                return memo_res
+
+        interp_indices, interp_values = self._compute_interp(inputs, batch_dims)
+        # The sparse matrix is only used inside of autograd Functions, so we don't need to track gradients
+        sparse_interp_t = sparse.make_sparse_from_indices_and_values(
+            interp_indices, interp_values.detach(), num_grid_points
+        )
+        res = (interp_indices, interp_values, sparse_interp_t)
+        if not inputs.requires_grad:
+            self._compute_grid_memo = (inputs.clone(), batch_dims, self.grid, self.grid._version, res)
+        return res
+
+    def _compute_interp(self, inputs, batch_dims):
         batch_size, n_data, n_dimensions = inputs.size()
         if batch_dims == (0, 2):
             inputs = inputs.view(inputs.size(0), inputs.size(1), -1, 1)
@@ -164,19 +196,27 @@ class GridInterpolationKernel(GridKernel):
         if x1.size(0) > 1:
             base_lazy_tsr = base_lazy_tsr.repeat(x1.size(0), 1, 1)
 
-        left_interp_indices, left_interp_values = self._compute_grid(x1, batch_dims)
+        num_grid_points = base_lazy_tsr.size(-1)
+        left_interp_indices, left_interp_values, sparse_left_interp_t = self._compute_grid(
+            x1, batch_dims, num_grid_points
+        )
         if torch.equal(x1, x2):
             right_interp_indices = left_interp_indices
             right_interp_values = left_interp_values
+            sparse_right_interp_t = sparse_left_interp_t
         else:
-            right_interp_indices, right_interp_values = self._compute_grid(x2, batch_dims)
+            right_interp_indices, right_interp_values, sparse_right_interp_t = self._compute_grid(
+                x2, batch_dims, num_grid_points
+            )
 
         res = InterpolatedLazyTensor(
             base_lazy_tsr,
-            left_interp_indices.detach(),
+            left_interp_indices,
             left_interp_values,
-            right_interp_indices.detach(),
+            right_interp_indices,
             right_interp_values,
+            sparse_left_interp_t=sparse_left_interp_t,
+            sparse_right_interp_t=sparse_right_interp_t,
         )
 
         return res
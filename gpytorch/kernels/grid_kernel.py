@@ -2,7 +2,7 @@
 
 import torch
 from .kernel import Kernel
-from ..lazy import delazify, ToeplitzLazyTensor, KroneckerProductLazyTensor
+from ..lazy import delazify, BTTBLazyTensor, ToeplitzLazyTensor, KroneckerProductLazyTensor
 from .. import settings
 from gpytorch.utils.grid import create_data_from_grid
 
@@ -14,6 +14,10 @@ class GridKernel(Kernel):
 
     GridKernel exploits Toeplitz and Kronecker structure within the covariance matrix.
     See `Fast kernel learning for multidimensional pattern extrapolation`_ for more info.
+    Kernels that don't factorize over dimensions (see :attr:`~gpytorch.kernels.Kernel.is_separable`),
+    such as Matern or Spectral Mixture kernels on 2 or 3 dimensional grids, have no Kronecker structure.
+    For these, GridKernel returns a :obj:`~gpytorch.lazy.BTTBLazyTensor` (block Toeplitz with Toeplitz blocks).
+    (Non-separable kernels are not supported on grids with more than 3 dimensions.)
 
     .. note::
 
@@ -57,6 +61,35 @@ class GridKernel(Kernel):
             del self._cached_kernel_mat
         return self
 
+    def _nonseparable_covar(self, **params):
+        """
+        The covariance matrix of the (stationary) base kernel on the full grid, for base kernels that don't
+        factorize over dimensions. It is block Toeplitz with Toeplitz blocks, and only depends on the kernel
+        evaluated at all of the possible offsets between grid points.
+        """
+        n_dim = self.grid.size(-1)
+        if n_dim > 3:
+            # The dense covariance matrix on a grid with more than 3 dimensions is almost always too large to store
+            raise RuntimeError(
+                "GridKernel only supports base kernels that don't factorize over dimensions (is_separable=False) on "
+                "grids with at most 3 dimensions. Got a {} with a {}-dimensional grid.".format(
+                    self.base_kernel.__class__.__name__, n_dim
+                )
+            )
+
+        # Offsets -(n - 1), ..., (n - 1) along each dimension.
+        # The last dimension of the grid is the outermost level of Toeplitz structure
+        offsets = []
+        for i in range(n_dim - 1, -1, -1):
+            dim_offsets = self.grid[:, i] - self.grid[0, i]
+            offsets.append(torch.cat([dim_offsets[1:].flip(0).neg(), dim_offsets]))
+        offsets = torch.stack(torch.meshgrid(*offsets), -1).flip(-1).view(1, -1, n_dim)
+
+        origin = torch.zeros(1, 1, n_dim, dtype=offsets.dtype, device=offsets.device)
+        stencil = delazify(self.base_kernel(offsets, origin, **params))
+        stencil = stencil.view(*stencil.shape[:-2], *(2 * self.grid.size(0) - 1 for _ in range(n_dim)))
+        return BTTBLazyTensor(stencil, n_dim)
+
     def forward(self, x1, x2, diag=False, batch_dims=None, **params):
         grid = self.grid.unsqueeze(0)
 
@@ -72,25 +105,29 @@ class GridKernel(Kernel):
 
             n_dim = x1.size(-1)
 
-            if settings.use_toeplitz.on():
-                first_item = grid[:, 0:1]
-                covar_columns = self.base_kernel(first_item, grid, diag=False, batch_dims=(0, 2), **params)
-                covar_columns = delazify(covar_columns).squeeze(-2)
-                if batch_dims == (0, 2):
-                    covars = [ToeplitzLazyTensor(covar_columns)]
-                else:
-                    covars = [ToeplitzLazyTensor(covar_columns[i : i + 1]) for i in range(n_dim)]
+            if n_dim > 1 and batch_dims != (0, 2) and not self.base_kernel.is_separable:
+                # The kernel doesn't factorize over the dimensions, so there is no Kronecker structure
+                covar = self._nonseparable_covar(**params)
             else:
-                full_covar = self.base_kernel(grid, grid, batch_dims=(0, 2), **params)
-                if batch_dims == (0, 2):
-                    covars = [full_covar]
+                if settings.use_toeplitz.on():
+                    first_item = grid[:, 0:1]
+                    covar_columns = self.base_kernel(first_item, grid, diag=False, batch_dims=(0, 2), **params)
+                    covar_columns = delazify(covar_columns).squeeze(-2)
+                    if batch_dims == (0, 2):
+                        covars = [ToeplitzLazyTensor(covar_columns)]
+                    else:
+                        covars = [ToeplitzLazyTensor(covar_columns[i : i + 1]) for i in range(n_dim)]
                 else:
-                    covars = [full_covar[i : i + 1] for i in range(n_dim)]
-
-            if len(covars) > 1:
-                covar = KroneckerProductLazyTensor(*covars[::-1])
-            else:
-                covar = covars[0]
+                    full_covar = self.base_kernel(grid, grid, batch_dims=(0, 2), **params)
+                    if batch_dims == (0, 2):
+                        covars = [full_covar]
+                    else:
+                        covars = [full_covar[i : i + 1] for i in range(n_dim)]
+
+                if len(covars) > 1:
+                    covar = KroneckerProductLazyTensor(*covars[::-1])
+                else:
+                    covar = covars[0]
 
             if not self.training:
                 self._cached_kernel_mat = covar
@@ -4,9 +4,17 @@ import math
 import torch
 from .kernel import Kernel
 from ..functions import add_jitter
-from ..lazy import delazify, DiagLazyTensor, MatmulLazyTensor, RootLazyTensor, PsdSumLazyTensor
+from ..lazy import (
+    delazify,
+    DiagLazyTensor,
+    LazyEvaluatedKernelTensor,
+    LowRankRootAddedDiagLazyTensor,
+    MatmulLazyTensor,
+    RootLazyTensor,
+)
 from ..distributions import MultivariateNormal
 from ..mlls import InducingPointKernelAddedLossTerm
+from ..utils.cholesky import triangular_solve
 
 
 class InducingPointKernel(Kernel):
@@ -43,10 +51,8 @@ class InducingPointKernel(Kernel):
             return self._cached_kernel_inv_root
         else:
             chols = torch.cholesky(add_jitter(self._inducing_mat), upper=True)
-            eye = torch.eye(chols[0].size(-1), device=chols[0].device)
-            inv_root_list = [torch.trtrs(eye, chol)[0].unsqueeze(0) for chol in chols]
-
-            res = torch.cat(inv_root_list, 0)
+            eye = torch.eye(chols.size(-1), dtype=chols.dtype, device=chols.device)
+            res = triangular_solve(eye.expand_as(chols), chols)
             if not self.training:
                 self._cached_kernel_inv_root = res
             return res
@@ -58,7 +64,7 @@ class InducingPointKernel(Kernel):
 
             # Diagonal correction for predictive posterior
             correction = (self.base_kernel(x1, x2, diag=True) - covar.diag()).clamp(0, math.inf)
-            covar = PsdSumLazyTensor(covar, DiagLazyTensor(correction))
+            covar = LowRankRootAddedDiagLazyTensor(covar, DiagLazyTensor(correction))
         else:
             k_ux2 = delazify(self.base_kernel(x2, self.inducing_points))
             covar = MatmulLazyTensor(
@@ -96,5 +102,17 @@ class InducingPointKernel(Kernel):
 
         return covar
 
+    def __call__(self, x1, x2=None, diag=False, batch_dims=None, **params):
+        """
+        The kernel matrix is not evaluated lazily, so that adding the likelihood's noise to it gives another
+        :obj:`~gpytorch.lazy.LowRankRootAddedDiagLazyTensor`. Solves and log determinants with the (`n x n`) noisy
+        kernel matrix are then computed exactly in :math:`O(nm^2)` time with the Woodbury identity and the matrix
+        determinant lemma, rather than with CG and stochastic Lanczos quadrature.
+        """
+        res = super(InducingPointKernel, self).__call__(x1, x2, diag=diag, batch_dims=batch_dims, **params)
+        if isinstance(res, LazyEvaluatedKernelTensor):
+            res = res.evaluate_kernel()
+        return res
+
     def size(self, x1, x2):
         return self.base_kernel.size(x1, x2)
@@ -182,6 +182,15 @@ class Kernel(Module):
     def has_lengthscale(self):
         return self.__has_lengthscale
 
+    @property
+    def is_separable(self):
+        r"""
+        Whether the kernel factorizes over input dimensions, i.e. :math:`k(x, x') = \prod_i k_i(x_i, x'_i)`
+        where the factors are computed with `batch_dims=(0, 2)`. :class:`~gpytorch.kernels.GridKernel` uses
+        Kronecker structure for these kernels (and block Toeplitz structure otherwise).
+        """
+        return False
+
     @property
     def lengthscale(self):
         if self.has_lengthscale:
@@ -497,6 +506,10 @@ class ProductKernel(Kernel):
         super(ProductKernel, self).__init__()
         self.kernels = ModuleList(kernels)
 
+    @property
+    def is_separable(self):
+        return all(kernel.is_separable for kernel in self.kernels)
+
     def forward(self, x1, x2, **params):
         x1_eq_x2 = torch.equal(x1, x2)
 
@@ -74,6 +74,10 @@ class RBFKernel(Kernel):
     def __init__(self, **kwargs):
         super(RBFKernel, self).__init__(has_lengthscale=True, **kwargs)
 
+    @property
+    def is_separable(self):
+        return True
+
     def forward(self, x1, x2, diag=False, **params):
         if (
             x1.requires_grad
@@ -5,6 +5,7 @@ from .added_diag_lazy_tensor import AddedDiagLazyTensor
 from .batch_repeat_lazy_tensor import BatchRepeatLazyTensor
 from .block_lazy_tensor import BlockLazyTensor
 from .block_diag_lazy_tensor import BlockDiagLazyTensor
+from .bttb_lazy_tensor import BTTBLazyTensor
 from .cached_cg_lazy_tensor import CachedCGLazyTensor
 from .cat_lazy_tensor import CatLazyTensor
 from .chol_lazy_tensor import CholLazyTensor
@@ -13,6 +14,7 @@ from .diag_lazy_tensor import DiagLazyTensor
 from .interpolated_lazy_tensor import InterpolatedLazyTensor
 from .kronecker_product_lazy_tensor import KroneckerProductLazyTensor
 from .lazy_evaluated_kernel_tensor import LazyEvaluatedKernelTensor
+from .low_rank_root_added_diag_lazy_tensor import LowRankRootAddedDiagLazyTensor
 from .matmul_lazy_tensor import MatmulLazyTensor
 from .mul_lazy_tensor import MulLazyTensor
 from .non_lazy_tensor import lazify, NonLazyTensor
@@ -33,6 +35,7 @@ __all__ = [
     "BatchRepeatLazyTensor",
     "BlockLazyTensor",
     "BlockDiagLazyTensor",
+    "BTTBLazyTensor",
     "CachedCGLazyTensor",
     "CatLazyTensor",
     "CholLazyTensor",
@@ -40,6 +43,7 @@ __all__ = [
     "DiagLazyTensor",
     "InterpolatedLazyTensor",
     "KroneckerProductLazyTensor",
+    "LowRankRootAddedDiagLazyTensor",
     "MatmulLazyTensor",
     "MulLazyTensor",
     "NonLazyTensor",
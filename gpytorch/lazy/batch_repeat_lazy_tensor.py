@@ -81,10 +81,12 @@ class BatchRepeatLazyTensor(LazyTensor):
 
     def _matmul(self, rhs):
         output_shape = _matmul_broadcast_shape(self.shape, rhs.shape)
-        if rhs.shape != output_shape:
-            rhs = rhs.expand(*output_shape)
+        # Only the batch dimensions of rhs are broadcasted (self need not be square)
+        rhs_shape = output_shape[:-2] + rhs.shape[-2:]
+        if rhs.shape != rhs_shape:
+            rhs = rhs.expand(*rhs_shape)
 
-        rhs = self._move_repeat_batches_to_columns(rhs, output_shape)
+        rhs = self._move_repeat_batches_to_columns(rhs, rhs_shape)
         res = self.base_lazy_tensor._matmul(rhs)
         res = self._move_repeat_batches_back(res, output_shape)
         return res
@@ -159,10 +161,12 @@ class BatchRepeatLazyTensor(LazyTensor):
         return res
 
     def _quad_form_derivative(self, left_vectors, right_vectors):
-        left_output_shape = _matmul_broadcast_shape(self.shape, left_vectors.shape)
+        # Only the batch dimensions of the vectors are broadcasted (self need not be square)
+        output_batch_shape = _matmul_broadcast_shape(self.shape, right_vectors.shape)[:-2]
+        left_output_shape = output_batch_shape + left_vectors.shape[-2:]
         if left_output_shape != left_vectors.shape:
             left_vectors = left_vectors.expand(left_output_shape)
-        right_output_shape = _matmul_broadcast_shape(self.shape, right_vectors.shape)
+        right_output_shape = output_batch_shape + right_vectors.shape[-2:]
         if right_output_shape != right_vectors.shape:
             right_vectors = right_vectors.expand(right_output_shape)
         left_vectors = self._move_repeat_batches_to_columns(left_vectors, left_output_shape)
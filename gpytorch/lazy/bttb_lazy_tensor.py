@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import torch
+from .lazy_tensor import LazyTensor
+from ..utils.memoize import cached
+from ..utils.toeplitz import bttb_circulant_fft, bttb_matmul
+
+
+class BTTBLazyTensor(LazyTensor):
+    r"""
+    A (multi-level) block Toeplitz with Toeplitz blocks (BTTB) matrix. This is the structure of a stationary kernel
+    evaluated on a regular `d`-dimensional grid. Matrix multiplies are performed with `d`-dimensional FFTs of a
+    circulant embedding, so only the `(2 n_1 - 1) x ... x (2 n_d - 1)` entries of the stencil are stored.
+
+    If the kernel factorizes over dimensions, a :obj:`~gpytorch.lazy.KroneckerProductLazyTensor` of
+    :obj:`~gpytorch.lazy.ToeplitzLazyTensor` is cheaper.
+
+    Args:
+        :attr:`stencil` (Tensor `... x (2 n_1 - 1) x ... x (2 n_d - 1)`):
+            The entries of the matrix. Entry :math:`(i, j)` is the entry :math:`(n_1 - 1 + i_1 - j_1, \ldots,
+            n_d - 1 + i_d - j_d)` of the stencil, where :math:`(i_1, \ldots, i_d)` are the indices of :math:`i`
+            in an `n_1 x ... x n_d` array (in C order). For a stationary kernel on a grid, this is the kernel
+            evaluated at all possible offsets between grid points.
+        :attr:`num_dims` (int):
+            The number of levels `d` of Toeplitz structure (at most 3).
+    """
+
+    def __init__(self, stencil, num_dims):
+        super(BTTBLazyTensor, self).__init__(stencil, num_dims=num_dims)
+        self.stencil = stencil
+        self.num_dims = num_dims
+
+    def _check_args(self, stencil, num_dims):
+        if not 1 <= num_dims <= 3:
+            return "BTTBLazyTensor supports between 1 and 3 levels of Toeplitz structure. Got {}.".format(num_dims)
+        if stencil.dim() < num_dims or any(size % 2 == 0 for size in stencil.shape[-num_dims:]):
+            return "The last {} dimensions of the stencil should have odd sizes. Got {}.".format(
+                num_dims, stencil.shape
+            )
+
+    @property
+    def _level_sizes(self):
+        return [(size + 1) // 2 for size in self.stencil.shape[-self.num_dims:]]
+
+    def _expand_batch(self, batch_shape):
+        return self.__class__(self.stencil.expand(*batch_shape, *self.stencil.shape[-self.num_dims:]), self.num_dims)
+
+    def _get_indices(self, row_index, col_index, *batch_indices):
+        stencil_indices = []
+        stride = 1
+        for size in self._level_sizes[::-1]:
+            level_row_index = (row_index // stride).fmod(size)
+            level_col_index = (col_index // stride).fmod(size)
+            stencil_indices.insert(0, level_row_index - level_col_index + size - 1)
+            stride = stride * size
+        return self.stencil[(*batch_indices, *stencil_indices)]
+
+    @cached(name="circulant_fft")
+    def _circulant_fft(self):
+        with torch.no_grad():
+            return bttb_circulant_fft(self.stencil, self.num_dims)
+
+    def _matmul(self, rhs):
+        # The FFT of the stencil is reused for all MVMs (e.g. every CG iteration),
+        # unless we need to backpropagate through it
+        if torch.is_grad_enabled() and self.stencil.requires_grad:
+            return bttb_matmul(self.stencil, self.num_dims, rhs)
+        return bttb_matmul(self.stencil, self.num_dims, rhs, circulant_fft=self._circulant_fft())
+
+    def _t_matmul(self, rhs):
+        return self._transpose_nonbatch()._matmul(rhs)
+
+    def _size(self):
+        num_points = 1
+        for size in self._level_sizes:
+            num_points = num_points * size
+        return torch.Size((*self.stencil.shape[:-self.num_dims], num_points, num_points))
+
+    def _transpose_nonbatch(self):
+        return self.__class__(self.stencil.flip(dims=tuple(range(-self.num_dims, 0))), self.num_dims)
+
+    def diag(self):
+        """
+        Gets the diagonal of the BTTB matrix wrapped by this object.
+        """
+        batch_dim = self.stencil.dim() - self.num_dims
+        diag_term = self.stencil
+        for size in self._level_sizes:
+            diag_term = diag_term.select(batch_dim, size - 1)
+        return diag_term.unsqueeze(-1).expand(self.shape[:-1])
@@ -5,6 +5,7 @@ import torch
 from .lazy_tensor import LazyTensor
 from .root_lazy_tensor import RootLazyTensor
 from .. import settings
+from ..functions._triangular_solve import TriangularSolve
 
 
 class CholLazyTensor(RootLazyTensor):
@@ -33,14 +34,40 @@ class CholLazyTensor(RootLazyTensor):
             self._chol_diag_memo = self._chol.diagonal(dim1=-2, dim2=-1).clone()
         return self._chol_diag_memo
 
+    def _chol_solve(self, rhs, transpose=False):
+        # L^{-1} rhs (or L^{-T} rhs)
+        if rhs.dim() < self._chol.dim():
+            rhs = rhs.expand(*self.batch_shape, *rhs.shape[-2:])
+        return TriangularSolve(transpose=transpose)(rhs, self._chol)
+
+    def inv_matmul(self, right_tensor, left_tensor=None):
+        # A^{-1} R = L^{-T} L^{-1} R, and B A^{-1} R = (L^{-1} B^T)^T (L^{-1} R), with two triangular solves
+        is_vector = right_tensor.dim() == 1
+        if is_vector:
+            right_tensor = right_tensor.unsqueeze(-1)
+
+        right_solve = self._chol_solve(right_tensor)
+        if left_tensor is None:
+            res = self._chol_solve(right_solve, transpose=True)
+        else:
+            res = self._chol_solve(left_tensor.transpose(-1, -2)).transpose(-1, -2).matmul(right_solve)
+
+        if is_vector:
+            res = res.squeeze(-1)
+        return res
+
     def inv_quad_logdet(self, inv_quad_rhs=None, logdet=False, reduce_inv_quad=True):
         inv_quad_term = None
         logdet_term = None
 
         if inv_quad_rhs is not None:
-            inv_quad_term, _ = super(CholLazyTensor, self).inv_quad_logdet(
-                inv_quad_rhs, logdet=False, reduce_inv_quad=reduce_inv_quad
-            )
+            is_vector = inv_quad_rhs.dim() == 1
+            if is_vector:
+                inv_quad_rhs = inv_quad_rhs.unsqueeze(-1)
+            # tr(R^T A^{-1} R) = ||L^{-1} R||^2
+            inv_quad_term = self._chol_solve(inv_quad_rhs).pow(2).sum(-2)
+            if reduce_inv_quad or is_vector:
+                inv_quad_term = inv_quad_term.sum(-1)
 
         if logdet:
             logdet_term = self._chol_diag.pow(2).log().sum(-1)
@@ -119,7 +119,7 @@ class ConstantMulLazyTensor(LazyTensor):
         left_vecs = left_vecs * self.expanded_constant
         res = self.base_lazy_tensor._quad_form_derivative(left_vecs, right_vecs)
 
-        return res + (constant_deriv,)
+        return tuple(res) + (constant_deriv,)
 
     def _size(self):
         return self.base_lazy_tensor.size()
@@ -154,3 +154,18 @@ class ConstantMulLazyTensor(LazyTensor):
     def evaluate(self):
         res = self.base_lazy_tensor.evaluate()
         return res * self.expanded_constant
+
+    @cached(name="root_decomposition")
+    def root_decomposition(self):
+        # For a non-negative constant c, a root of c K is sqrt(c) R, where R is a root of K
+        # This avoids recomputing a root (e.g. with Lanczos) when the base root is available
+        from .root_lazy_tensor import RootLazyTensor
+
+        if not self.is_square or (self._constant < 0).any():
+            return super(ConstantMulLazyTensor, self).root_decomposition()
+
+        base_root = self.base_lazy_tensor.root_decomposition().root.evaluate()
+        return RootLazyTensor(base_root * self.expanded_constant.sqrt())
+
+    def root_decomposition_size(self):
+        return self.base_lazy_tensor.root_decomposition_size()
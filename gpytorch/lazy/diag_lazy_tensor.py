@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import torch
+from ..utils.getitem import _equal_indices
 from ..utils.memoize import cached
 from .lazy_tensor import LazyTensor
 from .root_lazy_tensor import RootLazyTensor
@@ -36,6 +37,12 @@ class DiagLazyTensor(LazyTensor):
         res = res * torch.eq(row_index, col_index).to(device=res.device, dtype=res.dtype)
         return res
 
+    def _getitem(self, row_index, col_index, *batch_indices):
+        # Taking the same slice of the rows and columns gives another diagonal matrix
+        if isinstance(row_index, slice) and _equal_indices(row_index, col_index):
+            return self.__class__(self._diag[(*batch_indices, row_index)])
+        return super(DiagLazyTensor, self)._getitem(row_index, col_index, *batch_indices)
+
     def _matmul(self, rhs):
         # to perform matrix multiplication with diagonal matrices we can just
         # multiply element-wise with the diagonal (using proper broadcasting)
@@ -9,11 +9,19 @@ from ..utils import sparse
 from ..utils.broadcasting import _pad_with_singletons
 from ..utils.getitem import _noop_index
 from ..utils.interpolation import left_interp, left_t_interp
+from ..utils.memoize import cached
 
 
 class InterpolatedLazyTensor(LazyTensor):
     def _check_args(
-        self, base_lazy_tensor, left_interp_indices, left_interp_values, right_interp_indices, right_interp_values
+        self,
+        base_lazy_tensor,
+        left_interp_indices,
+        left_interp_values,
+        right_interp_indices,
+        right_interp_values,
+        sparse_left_interp_t=None,
+        sparse_right_interp_t=None,
     ):
         if left_interp_indices.size() != left_interp_values.size():
             return "Expected left_interp_indices ({}) to have the same size as left_interp_values ({})".format(
@@ -33,6 +41,16 @@ class InterpolatedLazyTensor(LazyTensor):
                 "left interp size ({}) is incompatible with base lazy tensor size ({}). Make sure the two have the "
                 "same number of batch dimensions".format(left_interp_indices.size(), base_lazy_tensor.size())
             )
+        for interp_indices, sparse_interp_t in (
+            (left_interp_indices, sparse_left_interp_t),
+            (right_interp_indices, sparse_right_interp_t),
+        ):
+            if sparse_interp_t is not None:
+                expected_size = interp_indices.shape[:-2] + (base_lazy_tensor.size(-1), interp_indices.size(-2))
+                if sparse_interp_t.shape != expected_size:
+                    return "Expected the sparse interpolation matrix ({}) to have size {}".format(
+                        sparse_interp_t.size(), expected_size
+                    )
 
     def __init__(
         self,
@@ -41,7 +59,14 @@ class InterpolatedLazyTensor(LazyTensor):
         left_interp_values=None,
         right_interp_indices=None,
         right_interp_values=None,
+        sparse_left_interp_t=None,
+        sparse_right_interp_t=None,
     ):
+        """
+        Optionally, `sparse_left_interp_t` and `sparse_right_interp_t` are the sparse transposed interpolation
+        matrices (:func:`gpytorch.utils.sparse.make_sparse_from_indices_and_values`) of the interpolation indices
+        and values. Otherwise they are built when they are first needed.
+        """
         base_lazy_tensor = lazify(base_lazy_tensor)
 
         if left_interp_indices is None:
@@ -76,8 +101,16 @@ class InterpolatedLazyTensor(LazyTensor):
                     )
                 )
 
+        # The sparse interpolation matrices are passed on when this LazyTensor is reconstructed (e.g. in autograd
+        # Functions), so that they are only built once
+        kwargs = {}
+        if sparse_left_interp_t is not None:
+            kwargs["sparse_left_interp_t"] = sparse_left_interp_t
+        if sparse_right_interp_t is not None:
+            kwargs["sparse_right_interp_t"] = sparse_right_interp_t
         super(InterpolatedLazyTensor, self).__init__(
-            base_lazy_tensor, left_interp_indices, left_interp_values, right_interp_indices, right_interp_values
+            base_lazy_tensor, left_interp_indices, left_interp_values, right_interp_indices, right_interp_values,
+            **kwargs
         )
         self.base_lazy_tensor = base_lazy_tensor
         self.left_interp_indices = left_interp_indices
@@ -137,7 +170,7 @@ class InterpolatedLazyTensor(LazyTensor):
 
             return self.__class__(
                 base_lazy_tensor, left_interp_indices, left_interp_values,
-                right_interp_indices, right_interp_values, **self._kwargs
+                right_interp_indices, right_interp_values
             )
 
         # Normal case: we have to do some processing on either the rows or columns
@@ -150,14 +183,14 @@ class InterpolatedLazyTensor(LazyTensor):
         # Construct interpolated LazyTensor
         res = self.__class__(
             base_lazy_tensor, left_interp_indices, left_interp_values,
-            right_interp_indices, right_interp_values, **self._kwargs
+            right_interp_indices, right_interp_values
         )
         return res
 
     def _matmul(self, rhs):
         # Get sparse tensor representations of left/right interp matrices
-        left_interp_t = self._sparse_left_interp_t(self.left_interp_indices, self.left_interp_values)
-        right_interp_t = self._sparse_right_interp_t(self.right_interp_indices, self.right_interp_values)
+        left_interp_mat = self._sparse_left_interp()[1]
+        right_interp_t = self._sparse_right_interp()[0]
 
         if rhs.ndimension() == 1:
             is_vector = True
@@ -172,7 +205,6 @@ class InterpolatedLazyTensor(LazyTensor):
         base_res = self.base_lazy_tensor._matmul(right_interp_res)
 
         # left_interp * base_lazy_tensor * right_interp^T * rhs
-        left_interp_mat = left_interp_t.transpose(-1, -2)
         res = sparse.bdsmm(left_interp_mat, base_res)
 
         # Squeeze if necessary
@@ -189,12 +221,19 @@ class InterpolatedLazyTensor(LazyTensor):
             self.left_interp_values,
             self.right_interp_indices,
             self.right_interp_values,
+            **self._kwargs
         )
 
+    def _permute_batch(self, *dims):
+        if self._kwargs:
+            # The sparse interpolation matrices don't match the permuted interpolation tensors
+            return self._without_sparse_interp()._permute_batch(*dims)
+        return super(InterpolatedLazyTensor, self)._permute_batch(*dims)
+
     def _t_matmul(self, rhs):
         # Get sparse tensor representations of left/right interp matrices
-        left_interp_t = self._sparse_left_interp_t(self.left_interp_indices, self.left_interp_values)
-        right_interp_t = self._sparse_right_interp_t(self.right_interp_indices, self.right_interp_values)
+        left_interp_t = self._sparse_left_interp()[0]
+        right_interp_mat = self._sparse_right_interp()[1]
 
         if rhs.ndimension() == 1:
             is_vector = True
@@ -209,7 +248,6 @@ class InterpolatedLazyTensor(LazyTensor):
         base_res = self.base_lazy_tensor._t_matmul(left_interp_res)
 
         # left_interp * base_lazy_tensor * right_interp^T * rhs
-        right_interp_mat = right_interp_t.transpose(-1, -2)
         res = sparse.bdsmm(right_interp_mat, base_res)
 
         # Squeeze if necessary
@@ -219,8 +257,8 @@ class InterpolatedLazyTensor(LazyTensor):
 
     def _quad_form_derivative(self, left_vecs, right_vecs):
         # Get sparse tensor representations of left/right interp matrices
-        left_interp_t = self._sparse_left_interp_t(self.left_interp_indices, self.left_interp_values)
-        right_interp_t = self._sparse_right_interp_t(self.right_interp_indices, self.right_interp_values)
+        left_interp_t = self._sparse_left_interp()[0]
+        right_interp_t = self._sparse_right_interp()[0]
 
         if left_vecs.ndimension() == 1:
             left_vecs = left_vecs.unsqueeze(1)
@@ -284,6 +322,17 @@ class InterpolatedLazyTensor(LazyTensor):
         )
         return res
 
+    def _has_symmetric_interp(self):
+        left_interp = (self.left_interp_indices, self.left_interp_values)
+        right_interp = (self.right_interp_indices, self.right_interp_values)
+        if all(left is right for left, right in zip(left_interp, right_interp)):
+            return True
+        return (
+            self.left_interp_indices.shape == self.right_interp_indices.shape
+            and torch.equal(self.left_interp_indices, self.right_interp_indices)
+            and torch.equal(self.left_interp_values, self.right_interp_values)
+        )
+
     def _size(self):
         return torch.Size(
             self.base_lazy_tensor.batch_shape + (self.left_interp_indices.size(-2), self.right_interp_indices.size(-2))
@@ -296,39 +345,46 @@ class InterpolatedLazyTensor(LazyTensor):
             self.right_interp_values,
             self.left_interp_indices,
             self.left_interp_values,
-            **self._kwargs
+            sparse_left_interp_t=self._kwargs.get("sparse_right_interp_t"),
+            sparse_right_interp_t=self._kwargs.get("sparse_left_interp_t"),
         )
         return res
 
-    def _sparse_left_interp_t(self, left_interp_indices_tensor, left_interp_values_tensor):
-        if hasattr(self, "_sparse_left_interp_t_memo"):
-            if torch.equal(self._left_interp_indices_memo, left_interp_indices_tensor) and torch.equal(
-                self._left_interp_values_memo, left_interp_values_tensor
-            ):
-                return self._sparse_left_interp_t_memo
+    def _unsqueeze_batch(self, dim):
+        if self._kwargs:
+            # The sparse interpolation matrices don't match the unsqueezed interpolation tensors
+            return self._without_sparse_interp()._unsqueeze_batch(dim)
+        return super(InterpolatedLazyTensor, self)._unsqueeze_batch(dim)
 
-        left_interp_t = sparse.make_sparse_from_indices_and_values(
-            left_interp_indices_tensor, left_interp_values_tensor, self.base_lazy_tensor.size()[-1]
+    def _without_sparse_interp(self):
+        return self.__class__(
+            self.base_lazy_tensor,
+            self.left_interp_indices,
+            self.left_interp_values,
+            self.right_interp_indices,
+            self.right_interp_values,
         )
-        self._left_interp_indices_memo = left_interp_indices_tensor
-        self._left_interp_values_memo = left_interp_values_tensor
-        self._sparse_left_interp_t_memo = left_interp_t
-        return self._sparse_left_interp_t_memo
-
-    def _sparse_right_interp_t(self, right_interp_indices_tensor, right_interp_values_tensor):
-        if hasattr(self, "_sparse_right_interp_t_memo"):
-            if torch.equal(self._right_interp_indices_memo, right_interp_indices_tensor) and torch.equal(
-                self._right_interp_values_memo, right_interp_values_tensor
-            ):
-                return self._sparse_right_interp_t_memo
-
-        right_interp_t = sparse.make_sparse_from_indices_and_values(
-            right_interp_indices_tensor, right_interp_values_tensor, self.base_lazy_tensor.size()[-1]
+
+    def _sparse_interp(self, interp_indices, interp_values, sparse_interp_t):
+        # Returns the sparse transposed interpolation matrix W^T and the interpolation matrix W
+        if sparse_interp_t is None:
+            # The sparse matrices are only used inside of autograd Functions, so we don't need to track gradients
+            sparse_interp_t = sparse.make_sparse_from_indices_and_values(
+                interp_indices, interp_values.detach(), self.base_lazy_tensor.size(-1)
+            )
+        return sparse_interp_t, sparse_interp_t.transpose(-1, -2)
+
+    @cached(name="sparse_left_interp")
+    def _sparse_left_interp(self):
+        return self._sparse_interp(
+            self.left_interp_indices, self.left_interp_values, self._kwargs.get("sparse_left_interp_t")
+        )
+
+    @cached(name="sparse_right_interp")
+    def _sparse_right_interp(self):
+        return self._sparse_interp(
+            self.right_interp_indices, self.right_interp_values, self._kwargs.get("sparse_right_interp_t")
         )
-        self._right_interp_indices_memo = right_interp_indices_tensor
-        self._right_interp_values_memo = right_interp_values_tensor
-        self._sparse_right_interp_t_memo = right_interp_t
-        return self._sparse_right_interp_t_memo
 
     def _sum_batch(self, dim):
         left_interp_indices = self.left_interp_indices
@@ -403,6 +459,21 @@ class InterpolatedLazyTensor(LazyTensor):
             res = res.squeeze(-1)
         return res
 
+    @cached(name="root_decomposition")
+    def root_decomposition(self):
+        # If the left and right interpolation matrices are identical, then W K W^T = (W R)(W R)^T,
+        # where R is a root of the (usually much smaller) base LazyTensor.
+        # This gives an exact root without running Lanczos on the full matrix
+        if self._has_symmetric_interp() and self.base_lazy_tensor.size(-1) < self.size(-1):
+            base_root = self.base_lazy_tensor.root_decomposition().root.evaluate()
+            return RootLazyTensor(left_interp(self.left_interp_indices, self.left_interp_values, base_root))
+        return super(InterpolatedLazyTensor, self).root_decomposition()
+
+    def root_decomposition_size(self):
+        if self._has_symmetric_interp() and self.base_lazy_tensor.size(-1) < self.size(-1):
+            return min(self.base_lazy_tensor.size(-1), self.base_lazy_tensor.root_decomposition_size())
+        return super(InterpolatedLazyTensor, self).root_decomposition_size()
+
     def zero_mean_mvn_samples(self, num_samples):
         base_samples = self.base_lazy_tensor.zero_mean_mvn_samples(num_samples)
         batch_iter = tuple(range(1, base_samples.dim()))
@@ -201,18 +201,28 @@ class LazyEvaluatedKernelTensor(LazyTensor):
         NB: This is a meta LazyTensor, in the sense that evaluate can return
         a LazyTensor if the kernel being evaluated does so.
         """
+        with settings.lazily_evaluate_kernels(False):
+            res = self._kernel_forward()
+        return lazify(res)
+
+    def _kernel_forward(self):
+        """
+        Calls the kernel's forward method on x1 and x2. (Their active dimensions were already selected when
+        this LazyTensor was created, so we bypass :meth:`~gpytorch.kernels.Kernel.__call__`.)
+        This doesn't modify the kernel, so the kernel can be evaluated in several threads at once.
+        """
+        from ..kernels import Kernel
+
         x1 = self.x1
         x2 = self.x2
 
-        with settings.lazily_evaluate_kernels(False):
-            temp_active_dims = self.kernel.active_dims
-            self.kernel.active_dims = None
-            res = self.kernel(
-                x1, x2, diag=False, batch_dims=self.batch_dims, **self.params
+        # TODO: until kernels support multi-batch mode, we have to ensure that the kernel has a batch dimension
+        if x1.dim() == 2:
+            res = super(Kernel, self.kernel).__call__(
+                x1.unsqueeze(0), x2.unsqueeze(0), diag=False, batch_dims=self.batch_dims, **self.params
             )
-            self.kernel.active_dims = temp_active_dims
-
-        return lazify(res)
+            return res.squeeze(0)
+        return super(Kernel, self.kernel).__call__(x1, x2, diag=False, batch_dims=self.batch_dims, **self.params)
 
     @cached
     def evaluate(self):
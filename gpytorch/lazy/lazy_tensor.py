@@ -495,7 +495,7 @@ class LazyTensor(ABC):
                 shape = list(roots.shape)
                 shape[dim] = 1
                 extra_root = torch.full(
-                    shape, dtype=self.dtype, device=self.device, fill_value=(1.0 / math.sqrt(self.size(-2)))
+                    shape, dtype=self.dtype, device=self.device, fill_value=(1.0 / math.sqrt(roots.size(-1)))
                 )
                 roots = torch.cat([roots, extra_root], dim)
                 num_batch += 1
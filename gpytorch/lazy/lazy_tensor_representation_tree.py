@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+from .. import settings
+
 
 class LazyTensorRepresentationTree(object):
     def __init__(self, lazy_tsr):
@@ -18,6 +20,14 @@ class LazyTensorRepresentationTree(object):
                 counter += 1
 
     def __call__(self, *flattened_representation):
+        # The arguments were already checked when the original LazyTensor was constructed,
+        # so there's no need to rerun the (potentially expensive) debug checks when reconstructing it
+        if settings.debug.on():
+            with settings.debug(False):
+                return self._reconstruct(flattened_representation)
+        return self._reconstruct(flattened_representation)
+
+    def _reconstruct(self, flattened_representation):
         unflattened_representation = []
 
         for index, subtree in self.children:
@@ -25,6 +35,6 @@ class LazyTensorRepresentationTree(object):
                 unflattened_representation.append(flattened_representation[index])
             else:
                 sub_representation = flattened_representation[index]
-                unflattened_representation.append(subtree(*sub_representation))
+                unflattened_representation.append(subtree._reconstruct(sub_representation))
 
         return self._cls(*unflattened_representation, **self._kwargs)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import torch
+from .added_diag_lazy_tensor import AddedDiagLazyTensor
+from .diag_lazy_tensor import DiagLazyTensor
+from .root_lazy_tensor import RootLazyTensor
+from ..utils.cholesky import psd_safe_cholesky, triangular_solve
+from ..utils.getitem import _equal_indices
+from ..utils.memoize import cached
+
+
+class LowRankRootAddedDiagLazyTensor(AddedDiagLazyTensor):
+    """
+    An AddedDiagLazyTensor :math:`D + FF^\\top`, where the first lazy tensor is a RootLazyTensor with a low-rank
+    (`n x k`) root :math:`F`.
+
+    Solves and log determinants are computed exactly, in :math:`O(nk^2)` time, with the Woodbury identity and the
+    matrix determinant lemma.
+    """
+
+    def __init__(self, *lazy_tensors):
+        super(LowRankRootAddedDiagLazyTensor, self).__init__(*lazy_tensors)
+        if not isinstance(self._lazy_tensor, RootLazyTensor):
+            raise RuntimeError("LowRankRootAddedDiagLazyTensor requires a RootLazyTensor and a DiagLazyTensor.")
+
+    @cached(name="woodbury_cache")
+    def _woodbury_terms(self):
+        # D^{-1} F, and the Cholesky factor of the capacitance matrix I + F^T D^{-1} F
+        root = self._lazy_tensor.root.evaluate()
+        scaled_root = root.div(self._diag_tensor.diag().unsqueeze(-1))
+        eye = torch.eye(root.size(-1), dtype=root.dtype, device=root.device)
+        capacitance_chol = psd_safe_cholesky(root.transpose(-1, -2).matmul(scaled_root) + eye)
+        return scaled_root, capacitance_chol
+
+    def _capacitance_solve_root(self, rhs):
+        # L_C^{-1} F^T D^{-1} rhs
+        scaled_root, capacitance_chol = self._woodbury_terms()
+        projected_rhs = scaled_root.transpose(-1, -2).matmul(rhs)
+        return triangular_solve(projected_rhs, capacitance_chol, upper=False)
+
+    def _woodbury_solve(self, rhs):
+        # (D + F F^T)^{-1} rhs = D^{-1} rhs - D^{-1} F C^{-1} F^T D^{-1} rhs
+        scaled_root, capacitance_chol = self._woodbury_terms()
+        inner_solve = triangular_solve(self._capacitance_solve_root(rhs), capacitance_chol, upper=False, transpose=True)
+        return rhs.div(self._diag_tensor.diag().unsqueeze(-1)) - scaled_root.matmul(inner_solve)
+
+    def _refined_woodbury_solve(self, rhs):
+        # When D is small compared to F F^T (e.g. a small observation noise), the Woodbury identity subtracts two
+        # nearly equal terms. One step of iterative refinement recovers most of the precision that this loses.
+        res = self._woodbury_solve(rhs)
+        return res + self._woodbury_solve(rhs - self._matmul(res))
+
+    def _getitem(self, row_index, col_index, *batch_indices):
+        # Taking the same slice of the rows and columns preserves the low-rank plus diagonal structure
+        if isinstance(row_index, slice) and _equal_indices(row_index, col_index):
+            return self.__class__(
+                self._lazy_tensor._getitem(row_index, col_index, *batch_indices),
+                self._diag_tensor._getitem(row_index, col_index, *batch_indices),
+            )
+        return super(LowRankRootAddedDiagLazyTensor, self)._getitem(row_index, col_index, *batch_indices)
+
+    def _sum_batch(self, dim):
+        return AddedDiagLazyTensor(self._lazy_tensor._sum_batch(dim), self._diag_tensor._sum_batch(dim))
+
+    def add_diag(self, added_diag):
+        return LowRankRootAddedDiagLazyTensor(self._lazy_tensor, self._diag_tensor.add_diag(added_diag))
+
+    def __add__(self, other):
+        if isinstance(other, DiagLazyTensor):
+            return LowRankRootAddedDiagLazyTensor(self._lazy_tensor, self._diag_tensor + other)
+        return super(LowRankRootAddedDiagLazyTensor, self).__add__(other)
+
+    def inv_matmul(self, right_tensor, left_tensor=None):
+        is_vector = right_tensor.dim() == 1
+        if is_vector:
+            right_tensor = right_tensor.unsqueeze(-1)
+
+        res = self._refined_woodbury_solve(right_tensor)
+        if left_tensor is not None:
+            res = left_tensor.matmul(res)
+
+        if is_vector:
+            res = res.squeeze(-1)
+        return res
+
+    def inv_quad_logdet(self, inv_quad_rhs=None, logdet=False, reduce_inv_quad=True):
+        inv_quad_term = None
+        logdet_term = None
+
+        if inv_quad_rhs is not None:
+            is_vector = inv_quad_rhs.dim() == 1
+            if is_vector:
+                inv_quad_rhs = inv_quad_rhs.unsqueeze(-1)
+            inv_quad_term = inv_quad_rhs.mul(self._refined_woodbury_solve(inv_quad_rhs)).sum(-2)
+            if reduce_inv_quad or is_vector:
+                inv_quad_term = inv_quad_term.sum(-1)
+
+        if logdet:
+            # log |D + F F^T| = log |D| + log |I + F^T D^{-1} F|
+            _, capacitance_chol = self._woodbury_terms()
+            capacitance_logdet = capacitance_chol.diagonal(dim1=-2, dim2=-1).pow(2).log().sum(-1)
+            logdet_term = self._diag_tensor.diag().log().sum(-1) + capacitance_logdet
+
+        return inv_quad_term, logdet_term
+
+    def root_decomposition(self):
+        root = self._lazy_tensor.root.evaluate()
+        diag_root = torch.diag_embed(self._diag_tensor.diag().sqrt(), dim1=-2, dim2=-1)
+        return RootLazyTensor(torch.cat([root, diag_root], -1))
+
+    def zero_mean_mvn_samples(self, num_samples):
+        root = self._lazy_tensor.root.evaluate()
+        root_samples = torch.randn(
+            num_samples, *root.shape[:-2], root.size(-1), 1, dtype=root.dtype, device=root.device
+        )
+        diag_samples = self._diag_tensor.zero_mean_mvn_samples(num_samples)
+        return root.matmul(root_samples).squeeze(-1) + diag_samples
@@ -21,6 +21,11 @@ class MulLazyTensor(LazyTensor):
         """
         Args:
             - lazy_tensors (A list of LazyTensor) - A list of LazyTensor to multiplicate with.
+
+        Both LazyTensors are replaced by their root decompositions. These are cached on the LazyTensors
+        themselves, and structured LazyTensors (e.g. RootLazyTensors, scaled roots, or interpolated
+        LazyTensors over a small base matrix) supply exact low-rank roots without running Lanczos.
+        The rank of any Lanczos root is controlled by :class:`gpytorch.settings.max_root_decomposition_size`.
         """
         left_lazy_tensor = left_lazy_tensor.root_decomposition()
         right_lazy_tensor = right_lazy_tensor.root_decomposition()
@@ -2,7 +2,8 @@
 
 import torch
 from .lazy_tensor import LazyTensor
-from ..utils.toeplitz import sym_toeplitz_matmul, sym_toeplitz_derivative_quadratic_form
+from ..utils.memoize import cached
+from ..utils.toeplitz import sym_toeplitz_circulant_fft, sym_toeplitz_matmul, sym_toeplitz_derivative_quadratic_form
 
 
 class ToeplitzLazyTensor(LazyTensor):
@@ -17,8 +18,17 @@ class ToeplitzLazyTensor(LazyTensor):
         toeplitz_indices = (row_index - col_index).fmod(self.size(-1)).abs().long()
         return self.column[(*batch_indices, toeplitz_indices)]
 
+    @cached(name="circulant_fft")
+    def _circulant_fft(self):
+        with torch.no_grad():
+            return sym_toeplitz_circulant_fft(self.column)
+
     def _matmul(self, rhs):
-        return sym_toeplitz_matmul(self.column, rhs)
+        # The FFT of the column is reused for all MVMs (e.g. every CG iteration),
+        # unless we need to backpropagate through it
+        if torch.is_grad_enabled() and self.column.requires_grad:
+            return sym_toeplitz_matmul(self.column, rhs)
+        return sym_toeplitz_matmul(self.column, rhs, circulant_fft=self._circulant_fft())
 
     def _t_matmul(self, rhs):
         # Matrix is symmetric
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import math
 import torch
 from torch.nn.functional import softplus
 
@@ -107,8 +108,22 @@ class _MultitaskGaussianLikelihoodBase(_GaussianLikelihoodBase):
             task_covar = BlockDiagLazyTensor(task_covar_blocks)
         return input.__class__(mean, covar + task_covar)
 
+    def _variational_noise(self, shape):
+        # The (independent) noise variances of the tasks, for a `... x n x t` mean
+        return self.noise_covar(shape=shape[:-1]).diag().view(shape)
+
     def variational_log_probability(self, input, target):
-        raise NotImplementedError("Variational inference with Multitask Gaussian likelihood is not yet supported")
+        if self.rank != 0:
+            raise NotImplementedError(
+                "Variational inference with Multitask Gaussian likelihood is only supported with rank=0 "
+                "(independent task noises)"
+            )
+        mean, variance = input.mean, input.variance
+        noise = self._variational_noise(mean.shape)
+
+        res = -0.5 * ((target - mean) ** 2 + variance) / noise
+        res += -0.5 * noise.log() - 0.5 * math.log(2 * math.pi)
+        return res.sum([-1, -2])
 
 
 class MultitaskGaussianLikelihood(_MultitaskGaussianLikelihoodBase):
@@ -188,6 +203,12 @@ class MultitaskGaussianLikelihood(_MultitaskGaussianLikelihoodBase):
         covar = add_diag(covar, noise)
         return input.__class__(mean, covar)
 
+    def _variational_noise(self, shape):
+        noise = self.noise
+        if len(shape) == 2:
+            noise = noise.squeeze(0)
+        return super()._variational_noise(shape) + noise
+
 
 class MultitaskGaussianLikelihoodKronecker(_MultitaskGaussianLikelihoodBase):
     """
@@ -327,3 +348,9 @@ class MultitaskGaussianLikelihoodKronecker(_MultitaskGaussianLikelihoodBase):
 
         covar = add_diag(covar, noise)
         return input.__class__(mean, covar)
+
+    def _variational_noise(self, shape):
+        task_noises = self._param_transform(self.raw_task_noises) + self.noise
+        if len(shape) == 2:
+            task_noises = task_noises.squeeze(0)
+        return task_noises.unsqueeze(-2).expand(shape)
@@ -20,7 +20,7 @@ class VariationalELBO(MarginalLogLikelihood):
         self.num_data = num_data
 
     def forward(self, variational_dist_f, target, **kwargs):
-        num_batch = variational_dist_f.event_shape.numel()
+        num_batch = variational_dist_f.event_shape[0]
         variational_dist_u = self.model.variational_strategy.variational_distribution.variational_distribution
         prior_dist = self.model.variational_strategy.prior_distribution
 
@@ -4,8 +4,10 @@ from .gp import GP
 from .abstract_variational_gp import AbstractVariationalGP
 from .additive_grid_inducing_variational_gp import AdditiveGridInducingVariationalGP
 from .exact_gp import ExactGP
+from .exact_gp_predictor import ExactGPPredictor
 from .grid_inducing_variational_gp import GridInducingVariationalGP
 from .model_list import AbstractModelList, IndependentModelList
+from .prediction_batcher import PredictionBatcher
 from .variational_gp import VariationalGP
 
 
@@ -23,9 +25,11 @@ __all__ = [
     "AbstractVariationalGP",
     "AdditiveGridInducingVariationalGP",
     "ExactGP",
+    "ExactGPPredictor",
     "GP",
     "GridInducingVariationalGP",
     "IndependentModelList",
+    "PredictionBatcher",
     "PyroVariationalGP",
     "VariationalGP",
 ]
@@ -1,13 +1,64 @@
 #!/usr/bin/env python3
 
+import hashlib
 import warnings
 import torch
 from copy import deepcopy
 from ..distributions import MultivariateNormal, MultitaskMultivariateNormal
+from ..lazy import LazyEvaluatedKernelTensor
 from ..likelihoods import _GaussianLikelihoodBase
 from .. import settings
 from .gp import GP
-from .exact_prediction_strategies import prediction_strategy
+from .exact_prediction_strategies import DefaultPredictionStrategy, prediction_strategy
+
+
+def _can_decouple_test_terms(train_train_covar):
+    """
+    Returns whether the test terms could be computed without evaluating the prior on the concatenated train and
+    test points (see :func:`_decoupled_test_terms`), given the train covariance stored by the prediction strategy.
+    This is checked before evaluating the prior on the test points, so that it is never evaluated in vain.
+    """
+    return (
+        isinstance(train_train_covar, LazyEvaluatedKernelTensor)
+        and train_train_covar.batch_dims is None
+        and not train_train_covar.params
+    )
+
+
+def _decoupled_test_terms(test_output, train_train_covar):
+    """
+    Given the prior at the test points and the (lazily evaluated) train covariance stored by the prediction
+    strategy, returns the test x test and test x train covariances without evaluating the prior on the
+    concatenated train and test points. Returns None if the prior covariance is not a lazily evaluated kernel
+    that can be paired with the training inputs.
+    """
+    if not _can_decouple_test_terms(train_train_covar):
+        return None
+    test_test_covar = test_output.lazy_covariance_matrix
+    if not isinstance(test_test_covar, LazyEvaluatedKernelTensor):
+        return None
+    if test_test_covar.kernel is not train_train_covar.kernel:
+        return None
+    if test_test_covar.batch_dims is not None or test_test_covar.params:
+        return None
+
+    test_x, train_x = test_test_covar.x1, train_train_covar.x2
+    if test_x.shape[:-2] != train_x.shape[:-2] or test_x.size(-1) != train_x.size(-1):
+        return None
+    if test_test_covar.x2 is not test_x and not torch.equal(test_test_covar.x2, test_x):
+        return None
+
+    test_train_covar = LazyEvaluatedKernelTensor(test_x, train_x, kernel=test_test_covar.kernel)
+    return test_test_covar, test_train_covar
+
+
+def _map_cache(fn, cache):
+    # Prediction caches are tensors, or (possibly nested) tuples of tensors and Nones
+    if isinstance(cache, tuple):
+        return tuple(_map_cache(fn, sub_cache) for sub_cache in cache)
+    elif torch.is_tensor(cache):
+        return fn(cache)
+    return cache
 
 
 class ExactGP(GP):
@@ -29,6 +80,7 @@ class ExactGP(GP):
         self.likelihood = likelihood
 
         self.prediction_strategy = None
+        self._prediction_cache_state = None
 
     @property
     def train_targets(self):
@@ -80,6 +132,53 @@ class ExactGP(GP):
                         raise RuntimeError(msg)
             self.train_targets = targets
         self.prediction_strategy = None
+        self._prediction_cache_state = None
+
+    def append_train_data(self, inputs, targets, max_num_train=None, **kwargs):
+        """
+        Appends observations to the training data, and drops the oldest training observations so that there are at
+        most `max_num_train` of them (a sliding window). This is meant for streaming data.
+
+        Unlike :meth:`set_train_data`, this keeps the test-time caches: they are updated in O(n^2 (m + r)) time for
+        `m` new and `r` dropped observations, rather than being recomputed from scratch on the next prediction.
+        The caches are built from an exact inverse root of the training covariance, which takes O(n^2) memory.
+        If no predictions have been made yet, the training data is simply replaced.
+
+        Args:
+            - :attr:`inputs` (Tensor `m x d`): Locations of the new observations.
+            - :attr:`targets` (Tensor `m`): Labels of the new observations.
+            - :attr:`max_num_train` (int, optional): Maximum number of training observations to keep.
+        """
+        if self.train_inputs[0].dim() > 2 or self.train_targets.dim() > 1:
+            raise RuntimeError("append_train_data is only supported for non-batch, single-output models.")
+
+        if torch.is_tensor(inputs):
+            inputs = (inputs,)
+        inputs = tuple(i.unsqueeze(-1) if i.ndimension() == 1 else i for i in inputs)
+
+        num_train = self.train_targets.size(-1) + targets.size(-1)
+        num_removed = max(num_train - max_num_train, 0) if max_num_train is not None else 0
+        if num_removed > self.train_targets.size(-1):
+            raise RuntimeError(
+                "Cannot add {} observations to a window of size {}.".format(targets.size(-1), max_num_train)
+            )
+
+        full_inputs = tuple(
+            torch.cat([train_input[num_removed:], input], dim=-2)
+            for train_input, input in zip(self.train_inputs, inputs)
+        )
+        full_targets = torch.cat([self.train_targets[num_removed:], targets], dim=-1)
+
+        if self.prediction_strategy is None or self.training:
+            self.set_train_data(full_inputs, full_targets, strict=False)
+            return
+
+        full_output = super(ExactGP, self).__call__(*full_inputs, **kwargs)
+        new_prediction_strategy = self.prediction_strategy.get_updated_strategy(
+            num_removed, inputs, full_inputs, full_targets, full_output
+        )
+        self.set_train_data(full_inputs, full_targets, strict=False)
+        self.prediction_strategy = new_prediction_strategy
 
     def get_fantasy_model(self, inputs, targets, **kwargs):
         """
@@ -90,6 +189,8 @@ class ExactGP(GP):
 
         .. note::
             If `targets` is a batch (e.g. `b x m`), then the GP returned from this method will be a batch mode GP.
+            Each of the `b` fantasy sets may have its own inputs (`b x m x d`). All of them are added in a single
+            batched update, and the batch GP shares the test-time caches of this model rather than copying them.
 
         Args:
             - :attr:`inputs` (Tensor `m x d` or `b x m x d`): Locations of fantasy observations.
@@ -158,14 +259,182 @@ class ExactGP(GP):
 
         return new_model
 
+    def predict_stream(self, inputs, chunk_size=1024, out=None):
+        """
+        Computes predictive means and variances over a (possibly very large) set of test points, at most
+        `chunk_size` points at a time. The test-time caches are computed once and reused for every chunk, so memory
+        usage only depends on `chunk_size` and the number of training points.
+
+        This is a generator: results are produced as the chunks are evaluated. Predictions are made without
+        tracking gradients, and the model must be in eval mode.
+
+        Args:
+            - :attr:`inputs` (Tensor `t x d` or `b x t x d`, or an iterable of such Tensors):
+                Test points. Iterables (e.g. a DataLoader) may yield tuples of Tensors for models with multiple
+                inputs, and each element is split into chunks as well.
+            - :attr:`chunk_size` (int): Maximum number of test points evaluated at once.
+            - :attr:`out` (tuple of two Tensors or numpy arrays, optional):
+                Preallocated outputs (e.g. `numpy.memmap` arrays) for the predictive means and variances of all test
+                points. Results are written in order as the chunks are evaluated.
+        Yields:
+            - (Tensor, Tensor) the predictive means and variances of each chunk. If `out` is supplied, these are
+              views of `out`.
+        """
+        if self.training:
+            raise RuntimeError("predict_stream can only be used in eval mode. Call model.eval() first.")
+
+        if torch.is_tensor(inputs):
+            inputs = [inputs]
+        if out is not None:
+            out = tuple(res if torch.is_tensor(res) else torch.from_numpy(res) for res in out)
+
+        offset = 0
+        for batch_inputs in inputs:
+            if torch.is_tensor(batch_inputs):
+                batch_inputs = (batch_inputs,)
+            batch_inputs = tuple(i.unsqueeze(-1) if i.ndimension() == 1 else i for i in batch_inputs)
+            data_dim = batch_inputs[0].dim() - 2
+
+            for chunk in zip(*(i.split(chunk_size, dim=-2) for i in batch_inputs)):
+                with torch.no_grad():
+                    output = self(*chunk)
+                    res = output.mean, output.variance
+
+                if out is not None:
+                    num_points = chunk[0].size(-2)
+                    res = tuple(
+                        res_out.narrow(data_dim, offset, num_points).copy_(chunk_res)
+                        for res_out, chunk_res in zip(out, res)
+                    )
+                    offset += num_points
+
+                yield res
+
+    def compile_predictor(self):
+        """
+        Returns a read-only :class:`~gpytorch.models.ExactGPPredictor` for this model, whose
+        :meth:`~gpytorch.models.ExactGPPredictor.predict` method can be called concurrently from multiple threads.
+        Unlike calling the model, it never modifies the model or its prediction strategy.
+
+        The predictor holds a frozen copy of the hyperparameters and the test-time caches, which are computed here
+        if necessary. The current settings of :obj:`gpytorch.settings.fast_pred_var` and
+        :obj:`gpytorch.settings.skip_posterior_variances` are captured as well.
+
+        Returns:
+            - :class:`~gpytorch.models.ExactGPPredictor`
+        """
+        from .exact_gp_predictor import ExactGPPredictor
+
+        if self.training:
+            raise RuntimeError("compile_predictor can only be used in eval mode. Call model.eval() first.")
+        if self.train_inputs is None or self.train_targets is None:
+            raise RuntimeError("compile_predictor requires training data. Call .set_train_data() first.")
+
+        with torch.no_grad():
+            if self.prediction_strategy is None:
+                self(*(train_input[..., :1, :] for train_input in self.train_inputs))
+            if type(self.prediction_strategy) is not DefaultPredictionStrategy:
+                raise NotImplementedError(
+                    "compile_predictor is not supported for {}".format(type(self.prediction_strategy).__name__)
+                )
+
+            mean_cache = self.prediction_strategy.mean_cache.detach()
+            if settings.skip_posterior_variances.on():
+                covar_root = None
+            elif settings.fast_pred_var.on():
+                covar_root = self.prediction_strategy.covar_cache.detach()
+            else:
+                covar_root = self.prediction_strategy.cholesky_inv_root.detach()
+
+        # Copy model without copying training data or prediction strategy
+        old_pred_strat = self.prediction_strategy
+        old_train_inputs = self.train_inputs
+        old_train_targets = self.train_targets
+        self.prediction_strategy = None
+        self.train_inputs = None
+        self.train_targets = None
+        frozen_model = deepcopy(self)
+        self.prediction_strategy = old_pred_strat
+        self.train_inputs = old_train_inputs
+        self.train_targets = old_train_targets
+        for param in frozen_model.parameters():
+            param.requires_grad_(False)
+
+        train_inputs = tuple(train_input.detach() for train_input in self.train_inputs)
+        predictor = ExactGPPredictor(frozen_model, train_inputs, mean_cache, covar_root)
+        # Make a first prediction, so that any lazily created state of the model exists before concurrent use
+        predictor.predict(*(train_input[..., :1, :] for train_input in train_inputs))
+        return predictor
+
     def train(self, mode=True):
         if mode:
             self.prediction_strategy = None
+            self._prediction_cache_state = None
         return super(ExactGP, self).train(mode)
 
+    def _prediction_cache_fingerprint(self):
+        """
+        Hashes the model's hyperparameters, buffers and training data. Test-time caches are only valid for the
+        exact model they were computed with.
+        """
+        hasher = hashlib.sha256()
+        tensors = list(self.state_dict().items())
+        if self.train_inputs is not None:
+            tensors += [("train_inputs.{}".format(i), tri) for i, tri in enumerate(self.train_inputs)]
+        if self.train_targets is not None:
+            tensors.append(("train_targets", self.train_targets))
+        for name, tensor in tensors:
+            tensor = tensor.detach().cpu().contiguous()
+            hasher.update("{}:{}:{}".format(name, tensor.dtype, tuple(tensor.shape)).encode())
+            hasher.update(tensor.numpy().tobytes())
+        return hasher.hexdigest()
+
+    def prediction_cache_state_dict(self):
+        """
+        Returns the test-time caches of the model (the mean cache, and the predictive covariance cache if
+        variances have been computed with :obj:`gpytorch.settings.fast_pred_var`) together with a fingerprint of
+        the hyperparameters and training data they were computed from.
+
+        The result can be saved with :func:`torch.save` and restored in another process with
+        :meth:`load_prediction_cache_state_dict`, so that the first prediction does not have to recompute them.
+
+        Returns:
+            - :obj:`dict`
+        """
+        if self.prediction_strategy is None:
+            raise RuntimeError("Prediction caches only exist after making predictions with a model. "
+                               "Call the model on some data first!")
+
+        caches = getattr(self.prediction_strategy, "_memoize_cache", {})
+        caches = {
+            name: _map_cache(torch.Tensor.detach, caches[name])
+            for name in ("mean_cache", "covar_cache") if name in caches
+        }
+        return {"fingerprint": self._prediction_cache_fingerprint(), "caches": caches}
+
+    def load_prediction_cache_state_dict(self, cache_state):
+        """
+        Loads test-time caches produced by :meth:`prediction_cache_state_dict`. The caches are used as soon as
+        the model builds its prediction strategy (i.e. on the next call in eval mode), and are discarded if the
+        model is put back in training mode or given new training data.
+
+        Args:
+            - :attr:`cache_state` (dict): the output of :meth:`prediction_cache_state_dict`
+
+        Raises:
+            RuntimeError: if the caches were computed with different hyperparameters or training data.
+        """
+        if cache_state["fingerprint"] != self._prediction_cache_fingerprint():
+            raise RuntimeError("The prediction caches were computed with different hyperparameters or training data "
+                               "than the current model, and cannot be loaded.")
+
+        self.prediction_strategy = None
+        self._prediction_cache_state = cache_state
+
     def _load_from_state_dict(self, state_dict, prefix, local_metadata, strict,
                               missing_keys, unexpected_keys, error_msgs):
         self.prediction_strategy = None
+        self._prediction_cache_state = None
         super()._load_from_state_dict(
             state_dict,
             prefix,
@@ -226,71 +495,98 @@ class ExactGP(GP):
                 else:
                     batch_shape = train_inputs[0].shape[:-2]
 
-            full_inputs = tuple(
-                torch.cat([train_input, input], dim=-2) for train_input, input in zip(train_inputs, inputs)
-            )
-
-            full_output = super(ExactGP, self).__call__(*full_inputs, **kwargs)
-            if settings.debug().on():
-                if not isinstance(full_output, MultivariateNormal):
-                    raise RuntimeError("ExactGP.forward must return a MultivariateNormal")
-            full_mean, full_covar = full_output.mean, full_output.lazy_covariance_matrix
-
             train_targets = self.train_targets
             if any(
                 orig_train_input.dim() < train_input.dim()
                 for orig_train_input, train_input in zip(self.train_inputs, train_inputs)
             ):
                 train_targets = train_targets.unsqueeze(0).expand(*batch_shape, *train_targets.size())
-
-            num_tasks = 1
-            if isinstance(full_output, MultitaskMultivariateNormal):
-                num_tasks = full_output.num_tasks
-
-            full_mean = full_mean.view(*batch_shape, -1)
             num_train = train_targets.size(len(batch_shape))
             train_targets = train_targets.view(*batch_shape, -1)
 
-            train_mean = full_mean.narrow(-1, 0, train_targets.size(-1))
-
-            if self.prediction_strategy is None:
-                train_train_covar = full_covar[..., :num_train, :num_train]
-                self.prediction_strategy = prediction_strategy(
-                    num_train,
-                    train_inputs,
-                    train_mean,
-                    train_train_covar,
-                    train_targets,
-                    self.likelihood,
-                    non_batch_train,
+            # Once the test-independent caches exist, try to evaluate the prior on the test points only
+            test_terms = None
+            if (
+                self.prediction_strategy is not None
+                and self.prediction_strategy._decouple_test_terms
+                and _can_decouple_test_terms(self.prediction_strategy.train_train_covar)
+                and train_inputs[0].shape == self.prediction_strategy.train_inputs[0].shape
+            ):
+                test_output = super(ExactGP, self).__call__(*inputs, **kwargs)
+                if settings.debug().on():
+                    if not isinstance(test_output, MultivariateNormal):
+                        raise RuntimeError("ExactGP.forward must return a MultivariateNormal")
+                test_terms = _decoupled_test_terms(test_output, self.prediction_strategy.train_train_covar)
+                if test_terms is None:
+                    # The prior at the test points can't be paired with the training inputs (e.g. forward
+                    # creates a new kernel on every call): only evaluate the concatenated points from now on
+                    self.prediction_strategy._decouple_test_terms = False
+                else:
+                    output_cls = test_output.__class__
+                    test_mean = test_output.mean.view(*batch_shape, -1)
+                    test_test_covar, test_train_covar = test_terms
+                    num_tasks = test_output.num_tasks if isinstance(test_output, MultitaskMultivariateNormal) else 1
+
+            if test_terms is None:
+                full_inputs = tuple(
+                    torch.cat([train_input, input], dim=-2) for train_input, input in zip(train_inputs, inputs)
                 )
 
-            if train_inputs[0].shape != self.prediction_strategy.train_inputs[0].shape:
-                # The test batch shape has changed, update prediction strategy with expanded objects
-                batch_shape = train_inputs[0].shape[:-2]
-                train_train_covar = self.prediction_strategy.train_train_covar
-                if len(batch_shape) > len(train_train_covar.batch_shape):
-                    # Expanding to add more batches
-                    expanded_covar = train_train_covar.expand(*batch_shape, *train_train_covar.matrix_shape)
-                elif (
-                    len(batch_shape) == len(train_train_covar.batch_shape)
-                    and batch_shape.numel() != train_train_covar.batch_shape.numel()
-                ):
-                    # The test batch size has changed, we need to repeat it to a new batch size.
-                    expanded_covar = train_train_covar[0].expand(*batch_shape, *train_train_covar.matrix_shape)
-                else:
-                    # We are leaving batch mode, not entering it.
-                    expanded_covar = train_train_covar[0]
-                self.prediction_strategy.train_train_covar = expanded_covar
-                self.prediction_strategy.num_train = num_train
-                self.prediction_strategy.train_targets = train_targets
-                self.prediction_strategy.train_inputs = train_inputs
-                self.prediction_strategy.train_mean = train_mean
-                self.prediction_strategy.non_batch_train = non_batch_train
-
-            test_mean = full_mean.narrow(-1, train_targets.size(-1), full_mean.size(-1) - train_targets.size(-1))
-            test_test_covar = full_covar[..., num_train:, num_train:]
-            test_train_covar = full_covar[..., num_train:, :num_train]
+                full_output = super(ExactGP, self).__call__(*full_inputs, **kwargs)
+                if settings.debug().on():
+                    if not isinstance(full_output, MultivariateNormal):
+                        raise RuntimeError("ExactGP.forward must return a MultivariateNormal")
+                full_mean, full_covar = full_output.mean, full_output.lazy_covariance_matrix
+                output_cls = full_output.__class__
+
+                num_tasks = 1
+                if isinstance(full_output, MultitaskMultivariateNormal):
+                    num_tasks = full_output.num_tasks
+
+                full_mean = full_mean.view(*batch_shape, -1)
+                train_mean = full_mean.narrow(-1, 0, train_targets.size(-1))
+
+                if self.prediction_strategy is None:
+                    train_train_covar = full_covar[..., :num_train, :num_train]
+                    self.prediction_strategy = prediction_strategy(
+                        num_train,
+                        train_inputs,
+                        train_mean,
+                        train_train_covar,
+                        train_targets,
+                        self.likelihood,
+                        non_batch_train,
+                    )
+                    if self._prediction_cache_state is not None:
+                        self.prediction_strategy._memoize_cache = dict(self._prediction_cache_state["caches"])
+                        self._prediction_cache_state = None
+
+                if train_inputs[0].shape != self.prediction_strategy.train_inputs[0].shape:
+                    # The test batch shape has changed, update prediction strategy with expanded objects
+                    batch_shape = train_inputs[0].shape[:-2]
+                    train_train_covar = self.prediction_strategy.train_train_covar
+                    if len(batch_shape) > len(train_train_covar.batch_shape):
+                        # Expanding to add more batches
+                        expanded_covar = train_train_covar.expand(*batch_shape, *train_train_covar.matrix_shape)
+                    elif (
+                        len(batch_shape) == len(train_train_covar.batch_shape)
+                        and batch_shape.numel() != train_train_covar.batch_shape.numel()
+                    ):
+                        # The test batch size has changed, we need to repeat it to a new batch size.
+                        expanded_covar = train_train_covar[0].expand(*batch_shape, *train_train_covar.matrix_shape)
+                    else:
+                        # We are leaving batch mode, not entering it.
+                        expanded_covar = train_train_covar[0]
+                    self.prediction_strategy.train_train_covar = expanded_covar
+                    self.prediction_strategy.num_train = num_train
+                    self.prediction_strategy.train_targets = train_targets
+                    self.prediction_strategy.train_inputs = train_inputs
+                    self.prediction_strategy.train_mean = train_mean
+                    self.prediction_strategy.non_batch_train = non_batch_train
+
+                test_mean = full_mean.narrow(-1, train_targets.size(-1), full_mean.size(-1) - train_targets.size(-1))
+                test_test_covar = full_covar[..., num_train:, num_train:]
+                test_train_covar = full_covar[..., num_train:, :num_train]
 
             with settings._use_eval_tolerance():
                 predictive_mean = self.prediction_strategy.exact_predictive_mean(test_mean, test_train_covar)
@@ -304,4 +600,4 @@ class ExactGP(GP):
                     # Standard multitask
                     predictive_mean = predictive_mean.view(-1, num_tasks).contiguous()
 
-            return full_output.__class__(predictive_mean, predictive_covar)
+            return output_cls(predictive_mean, predictive_covar)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import torch
+from ..distributions import MultitaskMultivariateNormal
+from ..lazy import LazyEvaluatedKernelTensor, delazify
+from .exact_gp import _can_decouple_test_terms, _decoupled_test_terms
+
+
+def _evaluate_kernel(kernel_tensor):
+    """
+    Evaluates a :obj:`~gpytorch.lazy.LazyEvaluatedKernelTensor` without
+    :meth:`~gpytorch.lazy.LazyEvaluatedKernelTensor.evaluate_kernel`, which temporarily changes the
+    (global) :obj:`gpytorch.settings.lazily_evaluate_kernels` setting.
+    """
+    return delazify(kernel_tensor._kernel_forward())
+
+
+class ExactGPPredictor(object):
+    """
+    A read-only predictor for a trained :class:`~gpytorch.models.ExactGP`, created with
+    :meth:`~gpytorch.models.ExactGP.compile_predictor`.
+
+    The predictor holds a frozen copy of the model's hyperparameters, the training inputs and the test-time caches,
+    and never modifies any of them, so :meth:`predict` can be called concurrently (e.g. from a thread pool).
+    Training or otherwise modifying the original model does not affect the predictor.
+
+    The prediction settings (:obj:`gpytorch.settings.fast_pred_var` and
+    :obj:`gpytorch.settings.skip_posterior_variances`) are captured when the predictor is compiled:
+
+    * With `fast_pred_var`, variances are computed from the LOVE cache of the model.
+    * Otherwise, variances are computed from an exact inverse Cholesky factor of the train covariance.
+
+    Args:
+        - :attr:`model` (:class:`~gpytorch.models.ExactGP`): a frozen copy of the model (without training data)
+        - :attr:`train_inputs` (tuple of Tensors): the training inputs of the model
+        - :attr:`mean_cache` (Tensor `n` or `b x n`): :math:`(K_{XX} + \\sigma^2 I)^{-1} (y - \\mu)`
+        - :attr:`covar_root` (Tensor `n x k` or `b x n x k`, optional): a root :math:`R` such that
+          :math:`RR^\\top \\approx (K_{XX} + \\sigma^2 I)^{-1}`. If None, no posterior variances are computed.
+    """
+
+    def __init__(self, model, train_inputs, mean_cache, covar_root=None):
+        self.model = model
+        self.train_inputs = train_inputs
+        self.mean_cache = mean_cache
+        self.covar_root = covar_root
+        self.num_train = train_inputs[0].size(-2)
+
+        with torch.no_grad():
+            train_output = model.forward(*train_inputs)
+        if isinstance(train_output, MultitaskMultivariateNormal):
+            raise NotImplementedError("ExactGPPredictor does not support multitask models.")
+        train_covar = train_output.lazy_covariance_matrix
+        self._train_train_covar = train_covar if _can_decouple_test_terms(train_covar) else None
+
+    def _test_terms(self, inputs):
+        # Evaluate the prior on the test points only, if the kernel can be paired with the training inputs
+        test_terms = None
+        train_train_covar = self._train_train_covar
+        if train_train_covar is not None:
+            test_output = self.model.forward(*inputs)
+            batch_shape = inputs[0].shape[:-2]
+            if train_train_covar.x2.shape[:-2] != batch_shape:
+                train_x = train_train_covar.x2.expand(*batch_shape, *train_train_covar.x2.shape[-2:])
+                train_train_covar = LazyEvaluatedKernelTensor(train_x, train_x, kernel=train_train_covar.kernel)
+            test_terms = _decoupled_test_terms(test_output, train_train_covar)
+            if test_terms is None:
+                # Only evaluate the concatenated points from now on
+                self._train_train_covar = None
+        if test_terms is not None:
+            return (test_output.mean,) + test_terms
+
+        full_inputs = []
+        for train_input, input in zip(self.train_inputs, inputs):
+            batch_shape = torch.broadcast_tensors(train_input[..., :1, :1], input[..., :1, :1])[0].shape[:-2]
+            full_inputs.append(torch.cat([
+                train_input.expand(*batch_shape, *train_input.shape[-2:]),
+                input.expand(*batch_shape, *input.shape[-2:]),
+            ], dim=-2))
+        full_output = self.model.forward(*full_inputs)
+        full_covar = full_output.lazy_covariance_matrix
+        return (
+            full_output.mean[..., self.num_train:],
+            full_covar[..., self.num_train:, self.num_train:],
+            full_covar[..., self.num_train:, :self.num_train],
+        )
+
+    def predict(self, *inputs):
+        """
+        Computes the posterior predictive means and variances of the latent function at the test points.
+        Predictions are made without tracking gradients.
+
+        Args:
+            - :attr:`inputs` (Tensor `t x d` or `b x t x d`): Test points.
+        Returns:
+            - (Tensor `t` or `b x t`, Tensor `t` or `b x t`) the predictive means and variances.
+        """
+        inputs = tuple(i.unsqueeze(-1) if i.ndimension() == 1 else i for i in inputs)
+
+        with torch.no_grad():
+            test_mean, test_test_covar, test_train_covar = self._test_terms(inputs)
+            if isinstance(test_train_covar, LazyEvaluatedKernelTensor):
+                test_train_covar = _evaluate_kernel(test_train_covar)
+            else:
+                test_train_covar = delazify(test_train_covar)
+
+            mean = test_mean + test_train_covar.matmul(self.mean_cache.unsqueeze(-1)).squeeze(-1)
+            if self.covar_root is None:
+                variance = torch.zeros_like(mean)
+            else:
+                covar_inv_quad_form_root = test_train_covar.matmul(self.covar_root)
+                variance = test_test_covar.diag() - covar_inv_quad_form_root.pow(2).sum(-1)
+        return mean, variance
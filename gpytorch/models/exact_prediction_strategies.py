@@ -5,11 +5,11 @@ import torch
 from .. import settings
 from ..distributions import MultivariateNormal
 from ..lazy import (
-    InterpolatedLazyTensor, LazyTensor, MatmulLazyTensor, RootLazyTensor, SumLazyTensor, ZeroLazyTensor
+    InterpolatedLazyTensor, LazyTensor, MatmulLazyTensor, RootLazyTensor, SumLazyTensor, ZeroLazyTensor, delazify
 )
 from ..utils.interpolation import left_interp, left_t_interp
-from ..utils.memoize import cached
-from ..utils.cholesky import cholesky_solve
+from ..utils.memoize import cached, is_cached
+from ..utils.cholesky import psd_safe_cholesky, triangular_solve
 
 
 _PREDICTION_STRATEGY_REGISTRY = {}
@@ -45,6 +45,8 @@ class DefaultPredictionStrategy(object):
         self.likelihood = likelihood
         self.non_batch_train = non_batch_train
         self._last_test_train_covar = None
+        # Whether ExactGP tries to evaluate the prior on the test points only (see ExactGP.__call__)
+        self._decouple_test_terms = True
         mvn = self.likelihood(MultivariateNormal(train_mean, train_train_covar), train_inputs)
         self.lik_train_train_covar = mvn.lazy_covariance_matrix
 
@@ -88,6 +90,66 @@ class DefaultPredictionStrategy(object):
         # where S S^T = (K_XX + sigma^2 I)^-1
         return test_train_covar.matmul(precomputed_cache)
 
+    def _fantasy_inv_root_blocks(self, inv_root, fant_train_covar, fant_fant_covar):
+        """
+        Given an inverse root R of the train covariance K, computes the blocks of the inverse root
+        [R  -QB^{-T}; 0  B^{-T}] of the covariance [K U; U' S] with m additional points (see
+        :meth:`get_fantasy_strategy`). If U' and S are batches, R is shared between all of the batches.
+
+        Args:
+            - :attr:`inv_root` (Tensor `n x k`): R, where RR' = K^{-1}
+            - :attr:`fant_train_covar` (Tensor `m x n` or `b x m x n`): U'
+            - :attr:`fant_fant_covar` (Tensor `m x m` or `b x m x m`): S, including observation noise
+
+        Returns:
+            - (Tensor `n x m`, Tensor `m x m`, Tensor `n x m`) the blocks -QB^{-T} and B^{-T}, and Q = K^{-1}U
+        """
+        fant_root = fant_train_covar.matmul(inv_root)  # U'R
+        # Q = K^{-1}U = R(U'R)' -- computed as ((U'R)R')' so that a shared R is not expanded to the batch size
+        fant_solve = fant_root.matmul(inv_root.transpose(-2, -1)).transpose(-2, -1)
+        schur_root = psd_safe_cholesky(fant_fant_covar - fant_root.matmul(fant_root.transpose(-2, -1)))
+        eye = torch.eye(schur_root.size(-1), dtype=schur_root.dtype, device=schur_root.device)
+        schur_inv_root = triangular_solve(eye.expand_as(schur_root), schur_root, upper=False).transpose(-2, -1)
+        return fant_solve.matmul(schur_inv_root).mul(-1), schur_inv_root, fant_solve
+
+    def _cat_inv_root_blocks(self, inv_root, fant_inv_root_upper, fant_inv_root_lower):
+        """
+        Assembles the inverse root [R  -QB^{-T}; 0  B^{-T}] from the blocks computed by
+        :meth:`_fantasy_inv_root_blocks`.
+        """
+        batch_shape = fant_inv_root_upper.shape[:-2]
+        num_train, root_size = inv_root.shape[-2:]
+        num_fant = fant_inv_root_lower.size(-1)
+
+        new_inv_root = inv_root.new_empty(*batch_shape, num_train + num_fant, root_size + num_fant)
+        new_inv_root[..., :num_train, :root_size] = inv_root
+        new_inv_root[..., :num_train, root_size:] = fant_inv_root_upper
+        new_inv_root[..., num_train:, :root_size] = 0
+        new_inv_root[..., num_train:, root_size:] = fant_inv_root_lower
+        return new_inv_root
+
+    def _remove_from_inv_root(self, inv_root, num_removed):
+        """
+        Given a square inverse root R of the train covariance K, computes a square inverse root of the covariance
+        of all but the first `num_removed` training points.
+
+        Let R = [R_1; R_2], where R_1 has `num_removed` rows, and let Q be an orthogonal matrix (a product of
+        Householder reflections) such that R_1 Q = [T 0]. RQ = [T 0; X Y] is also an inverse root of K, and
+        the inverse of the lower right block of K is the Schur complement of TT' in (RQ)(RQ)', which is YY'. This
+        takes O(n^2 r) time for r removed points.
+        """
+        reflectors, tau = torch.geqrf(inv_root[:num_removed].transpose(-2, -1))
+
+        # Apply the Householder reflections (I - tau_i v_i v_i') one at a time: this is cheaper than ormqr for the
+        # small number of reflections we need
+        rotated_inv_root = inv_root[num_removed:]
+        for i in range(num_removed):
+            reflector = torch.cat([torch.ones_like(tau[i:i + 1]), reflectors[i + 1:, i]])
+            rotated_tail = rotated_inv_root[:, i:]
+            update = rotated_tail.matmul(reflector).mul(tau[i]).unsqueeze(-1).mul(reflector)
+            rotated_inv_root = torch.cat([rotated_inv_root[:, :i], rotated_tail - update], dim=-1)
+        return rotated_inv_root[:, num_removed:]
+
     def get_fantasy_strategy(self, inputs, targets, full_inputs, full_targets, full_output):
         """
         Returns a new PredictionStrategy that incorporates the specified inputs and targets as new training data.
@@ -125,85 +187,47 @@ class DefaultPredictionStrategy(object):
         self.fantasy_targets = targets
 
         """
-        Compute a new mean cache given the old mean cache.
-
-        We have \\alpha = K^{-1}y, and we want to solve [K U; U' S][a; b] = [y; y_f], where U' is fant_train_covar,
-        S is fant_fant_covar, and y_f is (targets - fant_mean)
-
-        To do this, we solve the bordered linear system of equations for [a; b]:
-            AQ = U  # Q = fant_solve
-            [S - U'Q]b = y_f - U'\\alpha   ==> b = [S - U'Q]^{-1}(y_f - U'\\alpha)
+        Compute new mean and covariance caches with a block update.
+
+        Let R be an inverse root of the (noisy) train covariance K (i.e. RR' = K^{-1}), U' be fant_train_covar, S be
+        fant_fant_covar, and y_f be (targets - fant_mean). With Q = K^{-1}U = R(U'R)', and the Cholesky factor B of
+        the Schur complement S - U'Q, the inverse of the new covariance [K U; U' S] has the root
+            [R  -QB^{-T}; 0  B^{-T}]
+        and the new mean cache [a; b] solves the bordered system [K U; U' S][a; b] = [y; y_f]:
+            b = B^{-T}B^{-1}(y_f - U'\\alpha)
             a = \\alpha - Qb
-        """
-        # Get cached K inverse decomp. (or compute if we somehow don't already have the covariance cache)
-        K_inverse = self.lik_train_train_covar.root_inv_decomposition()
-        fant_solve = K_inverse.matmul(fant_train_covar.transpose(-2, -1))
-
-        # Solve for "b", the lower portion of the *new* \\alpha corresponding to the fantasy points.
-        schur_complement = fant_fant_covar - fant_train_covar.matmul(fant_solve)
-        small_system_rhs = targets - fant_mean - fant_train_covar.matmul(self.mean_cache)
-        # Schur complement of a spd matrix is guaranteed to be positive definite
-        if small_system_rhs.requires_grad or schur_complement.requires_grad:
-            # TODO: Delete this part of the if statement when PyTorch implements cholesky_solve derivative.
-            fant_cache_lower = torch.gesv(small_system_rhs.unsqueeze(-1), schur_complement)[0]
-        else:
-            fant_cache_lower = cholesky_solve(small_system_rhs, torch.cholesky(schur_complement))
+        This only requires products with R and the factorization of an m x m matrix, i.e. O(n^2 m) time.
 
-        # Get "a", the new upper portion of the cache corresponding to the old training points.
-        fant_cache_upper = self.mean_cache.unsqueeze(-1) - fant_solve.matmul(fant_cache_lower)
-
-        fant_cache_upper = fant_cache_upper.squeeze(-1)
-        fant_cache_lower = fant_cache_lower.squeeze(-1)
-
-        # New mean cache.
-        fant_mean_cache = torch.cat((fant_cache_upper, fant_cache_lower), dim=-1)
-
-        """
-        Compute a new covariance cache given the old covariance cache.
-
-        We have access to K \\approx LL' and K^{-1} \\approx R^{-1}R^{-T}, where L and R are low rank matrices
-        resulting from Lanczos (see the LOVE paper).
-
-        To update R^{-1}, we first update L:
-            [K U; U' S] = [L 0; A B][L' A'; 0 B']
-        Solving this matrix equation, we get:
-            K = LL' ==>       L = L
-            U = LA' ==>       A = UR^{-1}
-            S = AA' + BB' ==> B = cholesky(S - AA')
-
-        Once we've computed Z = [L 0; A B], we have that the new kernel matrix [K U; U' S] \approx ZZ'. Therefore,
-        we can form a pseudo-inverse of Z directly to approximate [K U; U' S]^{-1/2}.
+        If the model is small enough (see :class:`gpytorch.settings.max_cholesky_fantasy_size`), R = L^{-T} is the
+        exact inverse Cholesky factor of K, and the new root is the exact inverse Cholesky factor of the new
+        covariance. Otherwise R is the low-rank LOVE root of K^{-1}.
         """
-        # [K U; U' S] = [L 0; lower_left schur_root]
         batch_shape = fant_train_covar.shape[:-2]
+        use_cholesky = self.num_train + targets.size(-1) <= settings.max_cholesky_fantasy_size.value()
+        inv_root = self.cholesky_inv_root if use_cholesky else self.covar_cache
 
-        L_inverse = self.covar_cache
-        L = self.lik_train_train_covar.root_decomposition().root.evaluate()
-        m, n = L.shape[-2:]
-
-        lower_left = fant_train_covar.matmul(L_inverse)
-        schur_root = torch.cholesky(fant_fant_covar - lower_left.matmul(lower_left.transpose(-2, -1)))
-        upper_right = torch.zeros(m, schur_root.size(-1), device=L.device, dtype=L.dtype)
-
-        # Form new root Z = [L 0; lower_left schur_root]
-        num_fant = schur_root.size(-2)
-        m, n = L.shape[-2:]
-        new_root = torch.zeros(*batch_shape, m + num_fant, n + num_fant, device=L.device, dtype=L.dtype)
-        new_root[..., :m, :n] = L
-        new_root[..., :m, n:] = upper_right
-        new_root[..., m:, :n] = lower_left
-        new_root[..., m:, n:] = schur_root
-
-        # Use pseudo-inverse of Z as new inv root
-        # TODO: Replace pseudo-inverse calculation with something more stable than normal equations once
-        # one of torch.svd, torch.qr, or torch.pinverse works in batch mode.
-        cap_mat = new_root.transpose(-2, -1).matmul(new_root)
-        if cap_mat.requires_grad or new_root.requires_grad:
-            # TODO: Delete this part of the if statement when PyTorch implements cholesky_solve derivative.
-            new_covar_cache = torch.gesv(new_root.transpose(-2, -1), cap_mat)[0].transpose(-2, -1)
+        fant_inv_root_upper, schur_inv_root, fant_solve = self._fantasy_inv_root_blocks(
+            inv_root, fant_train_covar, fant_fant_covar
+        )
+
+        # New mean cache
+        small_system_rhs = (targets - fant_mean - fant_train_covar.matmul(self.mean_cache)).unsqueeze(-1)
+        fant_cache_lower = schur_inv_root.matmul(schur_inv_root.transpose(-2, -1).matmul(small_system_rhs))
+        fant_cache_upper = self.mean_cache.unsqueeze(-1) - fant_solve.matmul(fant_cache_lower)
+        fant_mean_cache = torch.cat((fant_cache_upper, fant_cache_lower), dim=-2).squeeze(-1)
+
+        new_memoize_cache = {"mean_cache": fant_mean_cache}
+        inv_root_blocks = (inv_root, fant_inv_root_upper, schur_inv_root)
+        if inv_root.dim() < fant_train_covar.dim():
+            # A batch of fantasies for a non-batch model: rather than copying R into each of the b new roots, all
+            # of the fantasy models share it (see :meth:`exact_predictive_covar`). This takes O(bnm) instead of
+            # O(bn^2) memory.
+            new_memoize_cache["covar_cache_blocks"] = inv_root_blocks
         else:
-            new_covar_cache = cholesky_solve(new_root.transpose(-2, -1), torch.cholesky(cap_mat))
-            new_covar_cache = new_covar_cache.transpose(-2, -1)
+            new_covar_cache = self._cat_inv_root_blocks(*inv_root_blocks)
+            new_memoize_cache["covar_cache"] = new_covar_cache
+            if use_cholesky:
+                new_memoize_cache["cholesky_inv_root"] = new_covar_cache
 
         # Create new DefaultPredictionStrategy object
         new_num_train = full_inputs[0].size(len(batch_shape))
@@ -216,10 +240,88 @@ class DefaultPredictionStrategy(object):
             likelihood=self.likelihood,
             non_batch_train=(len(batch_shape) == 0),
         )
-        setattr(fant_strat, "_memoize_cache", {"mean_cache": fant_mean_cache, "covar_cache": new_covar_cache})
+        setattr(fant_strat, "_memoize_cache", new_memoize_cache)
 
         return fant_strat
 
+    def get_updated_strategy(self, num_removed, inputs, full_inputs, full_targets, full_output):
+        """
+        Returns a new PredictionStrategy for training data that drops the first `num_removed` training examples and
+        appends `inputs`, updating the test-time caches in O(n^2 (m + r)) time rather than recomputing them.
+
+        The new strategy keeps an exact inverse root of the train covariance (see :attr:`cholesky_inv_root`). The
+        removed points are rotated out of the root (see :meth:`_remove_from_inv_root`) and the new points are added
+        with a block update (see :meth:`get_fantasy_strategy`). To update a GP model this way, use the
+        :meth:`~gpytorch.models.ExactGP.append_train_data` method.
+
+        Args:
+            - :attr:`num_removed` (int): Number of training examples (from the start) to drop.
+            - :attr:`inputs` (Tensor `m x d`): Locations of the new observations.
+            - :attr:`full_inputs` (Tensor `n-r+m x d`): The new training data.
+            - :attr:`full_targets` (Tensor `n-r+m`): The new training labels.
+            - :attr:`full_output` (:class:`gpytorch.distributions.MultivariateNormal`): Prior called on full_inputs
+        Returns:
+            - :class:`DefaultPredictionStrategy`
+        """
+        full_mean, full_covar = full_output.mean, full_output.lazy_covariance_matrix
+        num_kept = self.num_train - num_removed
+
+        inv_root = self.cholesky_inv_root
+        if num_removed:
+            inv_root = self._remove_from_inv_root(inv_root, num_removed)
+        if full_targets.size(-1) > num_kept:
+            fant_fant_covar = full_covar[..., num_kept:, num_kept:]
+            mvn = self.likelihood(MultivariateNormal(full_mean[..., num_kept:], fant_fant_covar), inputs)
+            fant_train_covar = full_covar[..., num_kept:, :num_kept].evaluate()
+            fant_inv_root_upper, fant_inv_root_lower, _ = self._fantasy_inv_root_blocks(
+                inv_root, fant_train_covar, mvn.covariance_matrix
+            )
+            inv_root = self._cat_inv_root_blocks(inv_root, fant_inv_root_upper, fant_inv_root_lower)
+
+        # Recomputing the mean cache from the exact inverse root is only O(n^2)
+        mean_cache = inv_root.matmul(inv_root.transpose(-2, -1).matmul((full_targets - full_mean).unsqueeze(-1)))
+        mean_cache = mean_cache.squeeze(-1)
+        if settings.detach_test_caches.on():
+            inv_root = inv_root.detach()
+            mean_cache = mean_cache.detach()
+
+        new_strat = self.__class__(
+            num_train=full_targets.size(-1),
+            train_inputs=full_inputs,
+            train_mean=full_mean,
+            train_train_covar=full_covar,
+            train_labels=full_targets,
+            likelihood=self.likelihood,
+            non_batch_train=True,
+        )
+        setattr(
+            new_strat,
+            "_memoize_cache",
+            {"mean_cache": mean_cache, "covar_cache": inv_root, "cholesky_inv_root": inv_root},
+        )
+        return new_strat
+
+    @property
+    @cached(name="cholesky_inv_root")
+    def cholesky_inv_root(self):
+        """
+        A square matrix R such that RR' is the exact inverse of the (noisy) train covariance. This is used for
+        fantasy and online updates. It is computed as R = L^{-T}, where LL' is the Cholesky decomposition of the
+        train covariance (updated strategies may hold a root that is not triangular).
+        """
+        train_train_covar = self.lik_train_train_covar
+        if self.non_batch_train and train_train_covar.dim() == 3:
+            train_train_covar = train_train_covar[0]
+
+        chol = psd_safe_cholesky(train_train_covar.evaluate())
+        eye = torch.eye(chol.size(-1), dtype=chol.dtype, device=chol.device)
+        inv_root = triangular_solve(eye.expand_as(chol), chol, upper=False).transpose(-2, -1)
+
+        if settings.detach_test_caches.on():
+            return inv_root.detach()
+        else:
+            return inv_root
+
     @property
     @cached(name="mean_cache")
     def mean_cache(self):
@@ -259,6 +361,9 @@ class DefaultPredictionStrategy(object):
     @property
     @cached(name="covar_cache")
     def covar_cache(self):
+        if is_cached(self, "covar_cache_blocks"):
+            return self._cat_inv_root_blocks(*self._memoize_cache["covar_cache_blocks"])
+
         train_train_covar = self.lik_train_train_covar
 
         if self.non_batch_train and train_train_covar.dim() == 3:
@@ -329,6 +434,18 @@ class DefaultPredictionStrategy(object):
             covar_correction_rhs = train_train_covar.inv_matmul(train_test_covar).mul(-1)
             return test_test_covar + MatmulLazyTensor(test_train_covar, covar_correction_rhs)
 
+        if is_cached(self, "covar_cache_blocks"):
+            # The root is [R  -QB^{-T}; 0  B^{-T}], where R is shared between a batch of fantasies
+            inv_root, fant_inv_root_upper, fant_inv_root_lower = self._memoize_cache["covar_cache_blocks"]
+            test_train_covar = delazify(test_train_covar)
+            test_base_covar = test_train_covar[..., :inv_root.size(-2)]
+            test_fant_covar = test_train_covar[..., inv_root.size(-2):]
+            covar_inv_quad_form_root = torch.cat([
+                test_base_covar.matmul(inv_root),
+                test_base_covar.matmul(fant_inv_root_upper) + test_fant_covar.matmul(fant_inv_root_lower),
+            ], dim=-1)
+            return test_test_covar + RootLazyTensor(covar_inv_quad_form_root).mul(-1)
+
         precomputed_cache = self.covar_cache
         covar_inv_quad_form_root = self._exact_predictive_covar_inv_quad_form_root(precomputed_cache,
                                                                                    test_train_covar)
@@ -360,6 +477,9 @@ class InterpolatedPredictionStrategy(DefaultPredictionStrategy):
             "Fantasy observation updates not yet supported for models using InterpolatedLazyTensors"
         )
 
+    def get_updated_strategy(self, num_removed, inputs, full_inputs, full_targets, full_output):
+        raise NotImplementedError("Online updates not yet supported for models using InterpolatedLazyTensors")
+
     @property
     @cached(name="mean_cache")
     def mean_cache(self):
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+import asyncio
+import time
+import torch
+
+
+class PredictionBatcher(object):
+    """
+    Coalesces many small prediction requests into batches, for serving predictions with asyncio.
+
+    Each call to :meth:`predict` queues its test points. Queued points are evaluated together in a single call to
+    `predict_fn` as soon as `max_batch_size` points are queued, or `max_latency` seconds after the first of them
+    was queued, and each request receives its slice of the results.
+
+    Example:
+        >>> predictor = model.compile_predictor()
+        >>> batcher = gpytorch.models.PredictionBatcher(predictor.predict, max_batch_size=512, max_latency=0.002)
+        >>> # In a coroutine:
+        >>> mean, variance = await batcher.predict(test_x)
+
+    Args:
+        - :attr:`predict_fn` (callable):
+            Maps test points (Tensors `t x d`) to a Tensor or a tuple of Tensors whose last dimension has size `t`,
+            e.g. :meth:`gpytorch.models.ExactGPPredictor.predict`.
+        - :attr:`max_batch_size` (int): Maximum number of test points evaluated at once.
+        - :attr:`max_latency` (float): Maximum time (in seconds) that a request waits for other requests.
+        - :attr:`executor` (:class:`concurrent.futures.Executor`, optional):
+            If supplied, batches are evaluated in this executor rather than in the event loop, so that the event loop
+            is not blocked. `predict_fn` must then be thread-safe (as :class:`~gpytorch.models.ExactGPPredictor` is).
+    """
+
+    def __init__(self, predict_fn, max_batch_size=1024, max_latency=0.005, executor=None):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.executor = executor
+
+        self._pending = []
+        self._num_pending_points = 0
+        self._flush_handle = None
+        self._in_flight = set()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Resets the counters reported by :meth:`stats`.
+        """
+        self._start_time = time.perf_counter()
+        self._num_requests = 0
+        self._num_points = 0
+        self._num_batches = 0
+        self._total_latency = 0.
+        self._max_latency = 0.
+        self._total_eval_time = 0.
+
+    def stats(self):
+        """
+        Returns throughput and latency counters (since the batcher was created or :meth:`reset_stats` was called).
+
+        Returns:
+            - :obj:`dict` with the number of completed `requests`, `points` and `batches`, the `mean_batch_size`
+              (in points), the `throughput` (points per second), the `mean_latency` and `max_latency` of requests
+              (in seconds, from :meth:`predict` being called to its result being available), and the
+              `mean_eval_time` of a batch (in seconds).
+        """
+        elapsed = time.perf_counter() - self._start_time
+        num_batches = max(self._num_batches, 1)
+        return {
+            "requests": self._num_requests,
+            "points": self._num_points,
+            "batches": self._num_batches,
+            "mean_batch_size": self._num_points / num_batches,
+            "throughput": self._num_points / elapsed if elapsed > 0 else 0.,
+            "mean_latency": self._total_latency / max(self._num_requests, 1),
+            "max_latency": self._max_latency,
+            "mean_eval_time": self._total_eval_time / num_batches,
+        }
+
+    async def predict(self, *inputs):
+        """
+        Queues test points for prediction, and waits for the results.
+
+        Args:
+            - :attr:`inputs` (Tensors `t x d`): Test points.
+        Returns:
+            - The result of `predict_fn` for these test points.
+        """
+        inputs = tuple(i.unsqueeze(-1) if i.ndimension() == 1 else i for i in inputs)
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self._pending.append((inputs, future, time.perf_counter()))
+        self._num_pending_points += inputs[0].size(-2)
+
+        if self._num_pending_points >= self.max_batch_size:
+            self._flush(full_batches_only=True)
+        if self._pending and self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_latency, self._flush)
+        return await future
+
+    async def close(self):
+        """
+        Evaluates all queued requests, and waits for all batches to complete.
+        """
+        self._flush()
+        if self._in_flight:
+            await asyncio.wait(self._in_flight)
+
+    def _flush(self, full_batches_only=False):
+        if not full_batches_only and self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._pending and (self._num_pending_points >= self.max_batch_size or not full_batches_only):
+            # Take at most max_batch_size points (but at least one request)
+            num_requests, num_points = 0, 0
+            for inputs, _, _ in self._pending:
+                if num_requests and num_points + inputs[0].size(-2) > self.max_batch_size:
+                    break
+                num_requests += 1
+                num_points += inputs[0].size(-2)
+            requests = self._pending[:num_requests]
+            self._pending = self._pending[num_requests:]
+            self._num_pending_points -= num_points
+            if not self._pending and self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+
+            task = asyncio.ensure_future(self._evaluate(requests))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    def _predict_batch(self, batch_inputs):
+        with torch.no_grad():
+            return self.predict_fn(*batch_inputs)
+
+    async def _evaluate(self, requests):
+        sizes = [inputs[0].size(-2) for inputs, _, _ in requests]
+        batch_inputs = tuple(torch.cat(inputs, dim=-2) for inputs in zip(*(inputs for inputs, _, _ in requests)))
+
+        start_time = time.perf_counter()
+        try:
+            if self.executor is not None:
+                loop = asyncio.get_event_loop()
+                results = await loop.run_in_executor(self.executor, self._predict_batch, batch_inputs)
+            else:
+                results = self._predict_batch(batch_inputs)
+        except Exception as e:
+            for _, future, _ in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        end_time = time.perf_counter()
+
+        if torch.is_tensor(results):
+            request_results = results.split(sizes, dim=-1)
+        else:
+            request_results = zip(*(result.split(sizes, dim=-1) for result in results))
+
+        for (_, future, enqueue_time), request_result in zip(requests, request_results):
+            if not future.done():
+                future.set_result(request_result)
+            latency = end_time - enqueue_time
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+        self._num_requests += len(requests)
+        self._num_points += sum(sizes)
+        self._num_batches += 1
+        self._total_eval_time += end_time - start_time
@@ -11,6 +11,11 @@ from .utils.deprecation import DeprecationError
 
 
 class Module(nn.Module):
+    #: The number of parameters that have been set with :meth:`initialize` (by any Module). Parameters are set
+    #: through `.data`, which doesn't change their version counters, so caches that depend on the values of
+    #: parameters can check this count as well.
+    _num_initializations = 0
+
     def __init__(self):
         super().__init__()
         self._added_loss_terms = OrderedDict()
@@ -80,6 +85,7 @@ class Module(nn.Module):
                 self.__getattr__(name).data.fill_(val)
             else:
                 raise AttributeError("Type {t} not valid for initializing parameter {p}".format(t=type(val), p=name))
+            Module._num_initializations += 1
 
             # Ensure value is contained in support of prior (if present)
             prior_name = "_".join([name, "prior"])
@@ -0,0 +1,5 @@
+#!/usr/bin/env python3
+
+from .ngd import NGD
+
+__all__ = ["NGD"]
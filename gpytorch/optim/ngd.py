@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+import torch
+from torch.optim.optimizer import Optimizer, required
+
+
+class NGD(Optimizer):
+    """
+    Natural gradient descent, for the parameters of a
+    :class:`~gpytorch.variational.NaturalVariationalDistribution`.
+
+    The gradients of these parameters are already natural gradients, so each step is a plain gradient step.
+    Because :class:`~gpytorch.mlls.VariationalELBO` is normalized by the number of data points, the step is rescaled
+    by `num_data`: with a Gaussian likelihood and the full dataset, a step with `lr=1` gives the optimal variational
+    distribution (for the current hyperparameters). With minibatches, smaller learning rates (e.g. 0.1) are
+    recommended.
+
+    Args:
+        - :attr:`params` (iterable): the parameters of the natural variational distribution
+        - :attr:`num_data` (int): the total number of training data points (as passed to the ELBO)
+        - :attr:`lr` (float): the learning rate
+    """
+
+    def __init__(self, params, num_data, lr=required):
+        if lr is not required and lr <= 0.0:
+            raise ValueError("Invalid learning rate: {}".format(lr))
+        self.num_data = num_data
+        super(NGD, self).__init__(params, dict(lr=lr))
+
+    @torch.no_grad()
+    def step(self, closure=None):
+        """
+        Performs a single optimization step.
+
+        Args:
+            - :attr:`closure` (callable, optional): A closure that reevaluates the model and returns the loss.
+        """
+        loss = None
+        if closure is not None:
+            with torch.enable_grad():
+                loss = closure()
+
+        for group in self.param_groups:
+            for p in group["params"]:
+                if p.grad is None:
+                    continue
+                p.add_(-group["lr"] * self.num_data, p.grad)
+        return loss
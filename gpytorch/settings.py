@@ -1,53 +1,137 @@
 #!/usr/bin/env python3
+"""
+Settings are context managers, e.g. ``with gpytorch.settings.fast_pred_var(): ...``.
+
+Settings are context-local: a setting only applies to the thread (and asyncio task) that entered it. New threads
+start with the default settings, and asyncio tasks start with the settings of the code that created them.
+(On Python 3.6, where :mod:`contextvars` is not available, settings are thread-local.)
+"""
+
+import threading
+
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
+
+class _ThreadLocalVar(threading.local):
+    """
+    A stand-in for :class:`contextvars.ContextVar` (Python 3.7+) that stores a thread-local value.
+    """
+
+    _unset = object()
+
+    def __init__(self, name):
+        self.name = name
+
+    def get(self, default):
+        return getattr(self, "_value", default)
+
+    def set(self, value):
+        token = getattr(self, "_value", self._unset)
+        self._value = value
+        return token
+
+    def reset(self, token):
+        if token is self._unset:
+            del self._value
+        else:
+            self._value = token
+
+
+_context_var = ContextVar if ContextVar is not None else _ThreadLocalVar
+_context_vars = []
+
+
+def _new_context_var(name):
+    var = _context_var("gpytorch.settings.{}".format(name))
+    _context_vars.append(var)
+    return var
+
+
+class _captured_settings(object):
+    """
+    Captures the settings of the current context, so that they can be restored in another thread.
+
+    PyTorch runs the backward passes of autograd functions in its own threads, which do not see the settings of
+    the thread that called `backward`. Functions that depend on settings in their backward pass capture them
+    when they are created, and restore them in the backward pass.
+    """
+
+    _unset = object()
+
+    def __init__(self):
+        values = ((var, var.get(self._unset)) for var in _context_vars)
+        self._values = [(var, value) for var, value in values if value is not self._unset]
+
+    def __enter__(self):
+        self._tokens = [var.set(value) for var, value in self._values]
+
+    def __exit__(self, *args):
+        for (var, _), token in zip(reversed(self._values), reversed(self._tokens)):
+            var.reset(token)
+        return False
 
 
 class _feature_flag(object):
     _state = False
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The class attribute `_state` is the default, the current context's state is stored in a context variable
+        cls._context_state = _new_context_var(cls.__name__)
+
     @classmethod
     def on(cls):
-        return cls._state
+        return cls._context_state.get(cls._state)
 
     @classmethod
     def off(cls):
-        return (not cls._state)
+        return (not cls.on())
 
     @classmethod
     def _set_state(cls, state):
-        cls._state = state
+        cls._context_state.set(state)
 
     def __init__(self, state=True):
-        self.prev = self.__class__.on()
         self.state = state
+        self._tokens = []
 
     def __enter__(self):
-        self.__class__._set_state(self.state)
+        self._tokens.append(self.__class__._context_state.set(self.state))
 
     def __exit__(self, *args):
-        self.__class__._set_state(self.prev)
+        self.__class__._context_state.reset(self._tokens.pop())
         return False
 
 
 class _value_context(object):
     _global_value = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # The class attribute `_global_value` is the default, the current context's value is stored in a context
+        # variable
+        cls._context_value = _new_context_var(cls.__name__)
+
     @classmethod
     def value(cls):
-        return cls._global_value
+        return cls._context_value.get(cls._global_value)
 
     @classmethod
     def _set_value(cls, value):
-        cls._global_value = value
+        cls._context_value.set(value)
 
     def __init__(self, value):
-        self._orig_value = self.__class__.value()
         self._instance_value = value
+        self._tokens = []
 
     def __enter__(self,):
-        self.__class__._set_value(self._instance_value)
+        self._tokens.append(self.__class__._context_value.set(self._instance_value))
 
     def __exit__(self, *args):
-        self.__class__._set_value(self._orig_value)
+        self.__class__._context_value.reset(self._tokens.pop())
         return False
 
 
@@ -162,27 +246,29 @@ class fast_pred_var(_feature_flag):
     """
 
     _num_probe_vectors = 1
+    _context_num_probe_vectors = _new_context_var("fast_pred_var.num_probe_vectors")
 
     @classmethod
     def num_probe_vectors(cls):
-        return cls._num_probe_vectors
+        return cls._context_num_probe_vectors.get(cls._num_probe_vectors)
 
     @classmethod
     def _set_num_probe_vectors(cls, value):
-        cls._num_probe_vectors = value
+        cls._context_num_probe_vectors.set(value)
 
     def __init__(self, state=True, num_probe_vectors=1):
-        self.orig_value = self.__class__.num_probe_vectors()
         self.value = num_probe_vectors
+        self._num_probe_vectors_tokens = []
         super(fast_pred_var, self).__init__(state)
 
     def __enter__(self):
-        self.__class__._set_num_probe_vectors(self.value)
+        self._num_probe_vectors_tokens.append(self.__class__._context_num_probe_vectors.set(self.value))
         super(fast_pred_var, self).__enter__()
 
     def __exit__(self, *args):
-        self.__class__._set_num_probe_vectors(self.orig_value)
-        return super(fast_pred_var, self).__exit__()
+        super(fast_pred_var, self).__exit__()
+        self.__class__._context_num_probe_vectors.reset(self._num_probe_vectors_tokens.pop())
+        return False
 
 
 class fast_pred_samples(_feature_flag):
@@ -265,9 +351,26 @@ class fast_computations(object):
 
     def __exit__(self, *args):
         self.log_prob.__exit__()
+        self.covar_root_decomposition.__exit__()
         return False
 
 
+class kronecker_prior_jitter(_value_context):
+    """
+    The (relative) amount of jitter that :obj:`~gpytorch.variational.GridInterpolationVariationalStrategy` adds to
+    each Kronecker factor of the prior covariance matrix, when the prior covariance and the variational covariance
+    are both Kronecker products. Each factor :math:`K_i` becomes :math:`K_i + \\epsilon \\bar{k}_i I`, where
+    :math:`\\bar{k}_i` is the mean diagonal entry of :math:`K_i`.
+
+    Note that the jitter changes the prior (and therefore the KL divergence), and its effect compounds over the
+    Kronecker factors. Larger values can make training better conditioned (e.g. with long lengthscales on fine
+    grids, in single precision).
+    Default: 1e-3
+    """
+
+    _global_value = 1e-3
+
+
 class lazily_evaluate_kernels(_feature_flag):
     """
     Lazily compute the entries of covariance matrices (set to True by default).
@@ -335,6 +438,30 @@ class max_cholesky_numel(_value_context):
     _global_value = 256
 
 
+class max_cholesky_fantasy_size(_value_context):
+    """
+    If the number of training points (including fantasy points) is at most `max_cholesky_fantasy_size`,
+    then :meth:`~gpytorch.models.ExactGP.get_fantasy_model` maintains an exact Cholesky-based inverse root of the
+    training covariance, and updates it with m fantasy points in O(n^2 m) time. Larger models update the (low-rank)
+    Lanczos root used by LOVE instead. Note that the exact root takes O(n^2) memory per set of fantasy points.
+    Default: 1000
+    """
+
+    _global_value = 1000
+
+
+class max_cholesky_inducing_size(_value_context):
+    """
+    If the number of inducing points is at most `max_cholesky_inducing_size`, then the variational strategies
+    factorize the inducing point covariance :math:`K_{UU}` with a Cholesky decomposition (once per forward pass), and
+    use triangular solves for the predictive distribution and the KL divergence. Otherwise, they use (cached) CG and
+    stochastic log determinant estimates.
+    Default: 2000
+    """
+
+    _global_value = 2000
+
+
 class max_root_decomposition_size(_value_context):
     """
     The maximum number of Lanczos iterations to perform
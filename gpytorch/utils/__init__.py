@@ -8,8 +8,10 @@ from . import cholesky
 from . import eig
 from . import fft
 from . import grid
+from . import inducing_points
 from . import interpolation
 from . import lanczos
+from . import minibatch
 from . import pivoted_cholesky
 from . import sparse
 from . import quadrature
@@ -36,8 +38,10 @@ __all__ = [
     "eig",
     "fft",
     "grid",
+    "inducing_points",
     "interpolation",
     "lanczos",
+    "minibatch",
     "pivoted_cholesky",
     "quadrature",
     "sparse",
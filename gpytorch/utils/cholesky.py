@@ -48,3 +48,25 @@ def cholesky_solve(b, u, upper=False):
         return torch.cholesky_solve(b, u, upper=False)
     else:
         return torch.potrs(b, u, upper=False)
+
+
+def triangular_solve(b, A, upper=True, transpose=False):
+    """
+    Solves :math:`Ax = b` (or :math:`A^\\top x = b` if `transpose`) for a (batch of) triangular matrices `A`.
+    Batches of matrices require :func:`torch.triangular_solve` (PyTorch >= 1.1). With older versions of PyTorch,
+    the batches are solved one at a time.
+    """
+    if hasattr(torch, "triangular_solve"):
+        return torch.triangular_solve(b, A, upper=upper, transpose=transpose)[0]
+    elif A.dim() == 2 and b.dim() == 2:
+        return torch.trtrs(b, A, upper=upper, transpose=transpose)[0]
+    else:
+        return _batch_trtrs(b, A, upper=upper, transpose=transpose)
+
+
+def _batch_trtrs(b, A, upper=True, transpose=False):
+    batch_shape = torch.broadcast_tensors(b[..., :1, :1], A[..., :1, :1])[0].shape[:-2]
+    b = b.expand(*batch_shape, *b.shape[-2:]).reshape(-1, *b.shape[-2:])
+    A = A.expand(*batch_shape, *A.shape[-2:]).reshape(-1, *A.shape[-2:])
+    res = torch.stack([torch.trtrs(b_, A_, upper=upper, transpose=transpose)[0] for b_, A_ in zip(b, A)])
+    return res.view(*batch_shape, *res.shape[-2:])
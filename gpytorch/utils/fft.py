@@ -12,3 +12,45 @@ def ifft1(input):
     complex_output = input.ifft(1)
     real_ind = torch.tensor(0, dtype=torch.long, device=input.device)
     return complex_output.index_select(-1, real_ind).squeeze(-1)
+
+
+def next_fast_len(size):
+    """
+    Returns the smallest integer >= size whose only prime factors are 2, 3 and 5.
+    FFTs are much faster on (zero-padded) inputs of these sizes.
+    """
+    res = size
+    while True:
+        remainder = res
+        for factor in (2, 3, 5):
+            while remainder % factor == 0:
+                remainder //= factor
+        if remainder <= 1:
+            return res
+        res += 1
+
+
+def rfft1(input, fft_size):
+    """
+    FFT of a real input along its last dimension, zero-padded to fft_size.
+    Only the fft_size // 2 + 1 non-redundant coefficients are returned (as a ... x (fft_size // 2 + 1) x 2 tensor).
+    """
+    padding = input.new_zeros(*input.shape[:-1], fft_size - input.size(-1))
+    return torch.rfft(torch.cat([input, padding], -1), 1)
+
+
+def irfft1(input, fft_size):
+    """
+    Inverse of rfft1. Returns the (real) signal of size fft_size.
+    """
+    return torch.irfft(input, 1, signal_sizes=(fft_size,))
+
+
+def complex_mul(input, other):
+    """
+    Elementwise (broadcasted) product of two complex tensors, where the last dimension holds the
+    real and imaginary parts.
+    """
+    real = input[..., 0] * other[..., 0] - input[..., 1] * other[..., 1]
+    imag = input[..., 0] * other[..., 1] + input[..., 1] * other[..., 0]
+    return torch.stack([real, imag], -1)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+import torch
+from .pivoted_cholesky import pivoted_cholesky
+
+
+def _iter_chunks(data, chunk_size=None):
+    """
+    Iterates over the data in `chunk_size x d` chunks. The data is either a `n x d` tensor (or a `n` tensor for
+    one-dimensional inputs), or an iterable of such tensors (e.g. a :obj:`torch.utils.data.DataLoader`, in which case
+    the inputs are the first element of each batch).
+    """
+    if torch.is_tensor(data):
+        chunks = data.split(chunk_size) if chunk_size is not None else [data]
+    else:
+        chunks = data
+
+    for chunk in chunks:
+        if isinstance(chunk, (tuple, list)):
+            chunk = chunk[0]
+        if chunk.dim() == 1:
+            chunk = chunk.unsqueeze(-1)
+        yield chunk
+
+
+def _sq_dist(x1, x2):
+    res = x1.pow(2).sum(-1, keepdim=True) - 2 * x1.matmul(x2.transpose(-1, -2)) + x2.pow(2).sum(-1).unsqueeze(-2)
+    return res.clamp_min_(0)
+
+
+def _reservoir_sample(data, num_samples, chunk_size=None):
+    # Uniform sample (without replacement) of the data, in a single streaming pass:
+    # each point gets a random key, and we keep the points with the largest keys
+    sample = None
+    keys = None
+    for chunk in _iter_chunks(data, chunk_size):
+        chunk_keys = torch.rand(chunk.size(0), dtype=chunk.dtype, device=chunk.device)
+        if sample is None:
+            sample, keys = chunk, chunk_keys
+        else:
+            sample, keys = torch.cat([sample, chunk]), torch.cat([keys, chunk_keys])
+        if sample.size(0) > num_samples:
+            keys, indices = keys.topk(num_samples)
+            sample = sample[indices]
+    if sample is None:
+        raise RuntimeError("Expected at least one data point to select inducing points from.")
+    return sample
+
+
+def _kmeans_plusplus(x, num_inducing):
+    # Each new center is sampled with probability proportional to the squared distance to the closest center
+    centers = x[torch.randint(x.size(0), (1,), device=x.device)]
+    min_sq_dist = _sq_dist(x, centers).squeeze(-1)
+    for _ in range(1, num_inducing):
+        if min_sq_dist.sum().item() > 0:
+            index = torch.multinomial(min_sq_dist, 1)
+        else:
+            index = torch.randint(x.size(0), (1,), device=x.device)
+        centers = torch.cat([centers, x[index]])
+        min_sq_dist = torch.min(min_sq_dist, _sq_dist(x, x[index]).squeeze(-1))
+    return centers
+
+
+def kmeans_inducing_points(data, num_inducing, chunk_size=None, num_iter=10, num_seed_points=None):
+    """
+    Selects inducing point locations with mini-batch k-means, seeded with k-means++.
+
+    The data is streamed in chunks, so the memory cost is :math:`O((c + s) d + cm)` (for chunks of size :math:`c`
+    and :math:`s` seed points) regardless of the size of the dataset:
+
+    1. A uniform sample of `num_seed_points` points is drawn in a single pass over the data, and the initial
+       centers are chosen from this sample with k-means++.
+    2. Each of the `num_iter` epochs makes a pass over the data, moving the centers towards the mean of the points
+       that are assigned to them in each chunk (with a per-center learning rate of 1 / (number of points assigned so
+       far), as in Sculley (2010)).
+
+    Args:
+        :attr:`data` (Tensor or iterable):
+            Either a `n x d` tensor of inputs (or `n` for 1D inputs), or an iterable of input chunks (such as a
+            :obj:`torch.utils.data.DataLoader`) which can be iterated over several times.
+        :attr:`num_inducing` (int):
+            The number of inducing points (`m`) to return.
+        :attr:`chunk_size` (int, optional):
+            If `data` is a tensor, the size of the chunks to stream it in. (Default: all of the data at once)
+        :attr:`num_iter` (int):
+            The number of epochs of mini-batch k-means. (Default: 10)
+        :attr:`num_seed_points` (int, optional):
+            The number of points to sample for the k-means++ seeding. (Default: `10 * num_inducing`)
+
+    Returns:
+        Tensor (`m x d`): the inducing point locations.
+    """
+    if num_seed_points is None:
+        num_seed_points = 10 * num_inducing
+
+    with torch.no_grad():
+        seed_points = _reservoir_sample(data, max(num_seed_points, num_inducing), chunk_size)
+        if seed_points.size(0) < num_inducing:
+            raise RuntimeError(
+                "Cannot select {} inducing points from {} data points.".format(num_inducing, seed_points.size(0))
+            )
+        centers = _kmeans_plusplus(seed_points, num_inducing)
+        counts = torch.zeros(num_inducing, dtype=centers.dtype, device=centers.device)
+
+        for _ in range(num_iter):
+            for chunk in _iter_chunks(data, chunk_size):
+                assignments = _sq_dist(chunk, centers).argmin(-1)
+                chunk_counts = torch.zeros_like(counts).index_add_(0, assignments, torch.ones_like(chunk[:, 0]))
+                chunk_sums = torch.zeros_like(centers).index_add_(0, assignments, chunk)
+
+                counts.add_(chunk_counts)
+                step = (chunk_counts / counts.clamp_min(1)).unsqueeze(-1)
+                chunk_means = chunk_sums / chunk_counts.clamp_min(1).unsqueeze(-1)
+                centers.add_(step * (chunk_means - centers))
+
+    return centers
+
+
+def pivoted_cholesky_inducing_points(data, num_inducing, kernel, chunk_size=None, error_tol=1e-6):
+    """
+    Selects inducing point locations from the data with greedy pivoted Cholesky on the kernel matrix: each new
+    inducing point is the data point with the largest posterior variance given the points selected so far.
+
+    The data is streamed in chunks. The currently selected points are concatenated to each chunk, and the selection
+    is rerun on this set of candidates, so the memory cost is :math:`O((c + m) m)` for chunks of size :math:`c`.
+    Only the diagonal and `m` rows of each candidate kernel matrix are ever computed.
+
+    Args:
+        :attr:`data` (Tensor or iterable):
+            Either a `n x d` tensor of inputs (or `n` for 1D inputs), or an iterable of input chunks (such as a
+            :obj:`torch.utils.data.DataLoader`).
+        :attr:`num_inducing` (int):
+            The (maximum) number of inducing points (`m`) to return. Fewer points are returned if the kernel matrix
+            of the data has a (numerically) lower rank.
+        :attr:`kernel` (:obj:`gpytorch.kernels.Kernel`):
+            The kernel that defines the greedy selection criterion (usually the kernel of the model, with
+            initial or pre-trained hyperparameters).
+        :attr:`chunk_size` (int, optional):
+            If `data` is a tensor, the size of the chunks to stream it in. (Default: all of the data at once)
+        :attr:`error_tol` (float):
+            Points are no longer selected once the largest posterior variance drops below `error_tol` times the
+            posterior variance of the first selected point. This avoids selecting (near) duplicate points, which
+            would make :math:`K_{UU}` singular. (Default: 1e-6)
+
+    Returns:
+        Tensor (`m x d`): the inducing point locations.
+    """
+    selected = None
+    with torch.no_grad():
+        for chunk in _iter_chunks(data, chunk_size):
+            candidates = chunk if selected is None else torch.cat([selected, chunk])
+            piv_chol, pivots = pivoted_cholesky(kernel(candidates), num_inducing, error_tol=0, return_pivots=True)
+            # The posterior variance of each point when it was selected
+            pivot_vars = piv_chol[pivots, torch.arange(pivots.size(0), device=pivots.device)].pow(2)
+            num_selected = (pivot_vars > error_tol * pivot_vars[0]).sum().item()
+            selected = candidates[pivots[:num_selected]]
+
+    if selected is None:
+        raise RuntimeError("Expected at least one data point to select inducing points from.")
+    return selected
@@ -18,12 +18,10 @@ class Interpolation(object):
         function as in the rest of the package. For more details, see the
         original paper Keys et al., 1989, equation (4).
 
-        scaled_grid_dist should be an n-by-g matrix of distances, where the
-        (ij)th element is the distance between the ith data point in X and the
-        jth element in the grid.
-
-        Note that, although this method ultimately expects a scaled distance matrix,
-        it is only intended to be used on single dimensional data.
+        The kernel is applied elementwise, so scaled_grid_dist can be any tensor of
+        (single dimensional) scaled distances. Interpolation.interpolate passes an
+        n-by-d-by-num_coefficients tensor, containing the distances between each data
+        point and the neighboring grid points in each dimension.
         """
         U = scaled_grid_dist.abs()
         res = torch.zeros(U.size(), dtype=U.dtype, device=U.device)
@@ -82,74 +80,59 @@ class Interpolation(object):
         num_dim = x_target.size(-1)
         num_coefficients = len(interp_points)
 
-        interp_values = torch.ones(
-            num_target_points, num_coefficients ** num_dim, dtype=x_grid.dtype, device=x_grid.device
-        )
-        interp_indices = torch.zeros(
-            num_target_points, num_coefficients ** num_dim, dtype=torch.long, device=x_grid.device
-        )
-
-        for i in range(num_dim):
-            grid_delta = x_grid[1, i] - x_grid[0, i]
-            lower_grid_pt_idxs = torch.floor((x_target[:, i] - x_grid[0, i]) / grid_delta).squeeze()
-            lower_pt_rel_dists = (x_target[:, i] - x_grid[0, i]) / grid_delta - lower_grid_pt_idxs
-            lower_grid_pt_idxs = lower_grid_pt_idxs - interp_points.max()
-            lower_grid_pt_idxs.detach_()
-
-            if len(lower_grid_pt_idxs.shape) == 0:
-                lower_grid_pt_idxs = lower_grid_pt_idxs.unsqueeze(0)
-
-            scaled_dist = lower_pt_rel_dists.unsqueeze(-1) + interp_points_flip.unsqueeze(-2)
-            dim_interp_values = self._cubic_interpolation_kernel(scaled_dist)
-
-            # Find points who's closest lower grid point is the first grid point
-            # This corresponds to a boundary condition that we must fix manually.
-            left_boundary_pts = torch.nonzero(lower_grid_pt_idxs < 1)
-            num_left = len(left_boundary_pts)
-
-            if num_left > 0:
-                left_boundary_pts.squeeze_(1)
-                x_grid_first = x_grid[:num_coefficients, i].unsqueeze(1).t().expand(num_left, num_coefficients)
-
-                grid_targets = x_target.select(1, i)[left_boundary_pts].unsqueeze(1).expand(num_left, num_coefficients)
-                dists = torch.abs(x_grid_first - grid_targets)
-                closest_from_first = torch.min(dists, 1)[1]
-
-                for j in range(num_left):
-                    dim_interp_values[left_boundary_pts[j], :] = 0
-                    dim_interp_values[left_boundary_pts[j], closest_from_first[j]] = 1
-                    lower_grid_pt_idxs[left_boundary_pts[j]] = 0
-
-            right_boundary_pts = torch.nonzero(lower_grid_pt_idxs > num_grid_points - num_coefficients)
-            num_right = len(right_boundary_pts)
-
-            if num_right > 0:
-                right_boundary_pts.squeeze_(1)
-                x_grid_last = x_grid[-num_coefficients:, i].unsqueeze(1).t().expand(num_right, num_coefficients)
-
-                grid_targets = x_target.select(1, i)[right_boundary_pts].unsqueeze(1)
-                grid_targets = grid_targets.expand(num_right, num_coefficients)
-                dists = torch.abs(x_grid_last - grid_targets)
-                closest_from_last = torch.min(dists, 1)[1]
-
-                for j in range(num_right):
-                    dim_interp_values[right_boundary_pts[j], :] = 0
-                    dim_interp_values[right_boundary_pts[j], closest_from_last[j]] = 1
-                    lower_grid_pt_idxs[right_boundary_pts[j]] = num_grid_points - num_coefficients
-
-            offset = (interp_points - interp_points.min()).long().unsqueeze(-2)
-            dim_interp_indices = lower_grid_pt_idxs.long().unsqueeze(-1) + offset
-
-            n_inner_repeat = num_coefficients ** i
-            n_outer_repeat = num_coefficients ** (num_dim - i - 1)
-            index_coeff = num_grid_points ** (num_dim - i - 1)
-            dim_interp_indices = dim_interp_indices.unsqueeze(-1).repeat(1, n_inner_repeat, n_outer_repeat)
-            dim_interp_values = dim_interp_values.unsqueeze(-1).repeat(1, n_inner_repeat, n_outer_repeat)
-            interp_indices = interp_indices.add(dim_interp_indices.view(num_target_points, -1).mul(index_coeff))
-            interp_values = interp_values.mul(dim_interp_values.view(num_target_points, -1))
+        # All dimensions are handled at once: everything below is num_target_points x num_dim (x num_coefficients)
+        grid_delta = x_grid[1] - x_grid[0]
+        scaled_target = (x_target - x_grid[0]) / grid_delta
+        lower_grid_pt_idxs = torch.floor(scaled_target)
+        lower_pt_rel_dists = scaled_target - lower_grid_pt_idxs
+        lower_grid_pt_idxs = lower_grid_pt_idxs.detach().long() - int(interp_points.max().item())
+
+        scaled_dist = lower_pt_rel_dists.unsqueeze(-1) + interp_points_flip
+        dim_interp_values = self._cubic_interpolation_kernel(scaled_dist)
+
+        # Find points who's closest lower grid point is the first grid point
+        # This corresponds to a boundary condition that we must fix manually:
+        # these points are assigned entirely to their closest of the first grid points
+        left_boundary_mask = lower_grid_pt_idxs < 1
+        if left_boundary_mask.any():
+            dim_interp_values = self._fix_boundary(
+                dim_interp_values, left_boundary_mask, x_target, x_grid[:num_coefficients]
+            )
+            lower_grid_pt_idxs = lower_grid_pt_idxs.masked_fill(left_boundary_mask, 0)
+
+        # Same thing for points whose interpolation would run past the last grid point
+        right_boundary_mask = lower_grid_pt_idxs > num_grid_points - num_coefficients
+        if right_boundary_mask.any():
+            dim_interp_values = self._fix_boundary(
+                dim_interp_values, right_boundary_mask, x_target, x_grid[-num_coefficients:]
+            )
+            lower_grid_pt_idxs = lower_grid_pt_idxs.masked_fill(right_boundary_mask, num_grid_points - num_coefficients)
+
+        offset = (interp_points - interp_points.min()).long()
+        dim_interp_indices = lower_grid_pt_idxs.unsqueeze(-1) + offset
+
+        # Combine the per-dimension coefficients into the num_coefficients ** num_dim products.
+        # The first dimension varies the slowest, matching the ordering of the grid points
+        interp_indices = dim_interp_indices[:, 0]
+        interp_values = dim_interp_values[:, 0]
+        for i in range(1, num_dim):
+            interp_indices = interp_indices.unsqueeze(-1).mul(num_grid_points) + dim_interp_indices[:, i].unsqueeze(-2)
+            interp_indices = interp_indices.view(num_target_points, -1)
+            interp_values = interp_values.unsqueeze(-1).mul(dim_interp_values[:, i].unsqueeze(-2))
+            interp_values = interp_values.view(num_target_points, -1)
 
         return interp_indices, interp_values
 
+    def _fix_boundary(self, dim_interp_values, boundary_mask, x_target, x_grid_boundary):
+        """
+        Puts all of the interpolation weight of the points in :attr:`boundary_mask` (num_target_points x num_dim)
+        onto the closest of the grid points in :attr:`x_grid_boundary` (num_coefficients x num_dim).
+        """
+        dists = (x_target.detach().unsqueeze(-1) - x_grid_boundary.t()).abs()
+        closest = dists.min(-1)[1]
+        boundary_values = torch.zeros_like(dim_interp_values).scatter_(-1, closest.unsqueeze(-1), 1)
+        return torch.where(boundary_mask.unsqueeze(-1), boundary_values, dim_interp_values)
+
 
 def left_interp(interp_indices, interp_values, rhs):
     """
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+
+import collections
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+
+
+def _num_rows(data):
+    return data.shape[0]
+
+
+def _empty_buffer(data, batch_size, pin_memory):
+    if torch.is_tensor(data):
+        buffer = torch.empty(batch_size, *data.shape[1:], dtype=data.dtype, device=data.device)
+    else:
+        buffer = torch.from_numpy(np.empty((batch_size, *data.shape[1:]), dtype=data.dtype))
+    if pin_memory and buffer.device.type == "cpu":
+        buffer = buffer.pin_memory()
+    return buffer
+
+
+def _gather(data, indices, out):
+    # Copies the rows `indices` of `data` into `out` (a buffer with at least len(indices) rows), without allocating
+    # a new batch. Both torch and numpy release the GIL while gathering, so workers gather in parallel.
+    out = out[: indices.size(0)]
+    if torch.is_tensor(data):
+        torch.index_select(data, 0, indices.to(data.device), out=out)
+    else:
+        # (The indices are always valid, and np.take only writes directly into `out` with mode="clip")
+        np.take(data, indices.numpy(), axis=0, out=out.numpy(), mode="clip")
+    return out
+
+
+class MinibatchLoader(object):
+    """
+    Iterates over minibatches of (in-memory or memory-mapped) training data for variational training, gathering the
+    next minibatches in a background thread pool while the model computes on the current one.
+
+    Each minibatch is gathered into one of a fixed set of (optionally pinned) buffers, which are reused throughout
+    training, so no memory is allocated per step. If a CUDA `device` is given, minibatches are copied to it
+    asynchronously from pinned memory.
+
+    .. note::
+        The minibatches are views of the reusable buffers: they are only valid until the next minibatch is requested.
+        Clone them to keep them around for longer.
+
+    For KISS-GP models (e.g. with a :obj:`~gpytorch.variational.GridInterpolationVariationalStrategy`), the data can
+    be sorted along one input dimension (`sort_dim`). Each minibatch is then sampled from a bucket of `bucket_size`
+    neighboring points, so that its interpolation indices touch fewer grid points. Each point still appears in
+    exactly one minibatch per epoch, so the ELBO estimate over an epoch is unchanged.
+
+    Example:
+        >>> loader = gpytorch.utils.minibatch.MinibatchLoader(train_x, train_y, batch_size=1024, num_workers=2)
+        >>> for x_batch, y_batch in loader:
+        >>>     optimizer.zero_grad()
+        >>>     loss = -mll(model(x_batch), y_batch)
+        >>>     loss.backward()
+        >>>     optimizer.step()
+
+    Args:
+        - :attr:`inputs` (Tensor or :obj:`numpy.ndarray` `n x ...`):
+            The training inputs. Numpy arrays can be memory-mapped (:obj:`numpy.memmap` or :func:`numpy.load` with
+            `mmap_mode="r"`), in which case only the rows of each minibatch are read.
+        - :attr:`targets` (Tensor or :obj:`numpy.ndarray` `n x ...`): The training targets.
+        - :attr:`batch_size` (int): The number of points per minibatch.
+        - :attr:`shuffle` (bool): Whether to draw new random minibatches every epoch. (Default: True)
+        - :attr:`drop_last` (bool): Whether to drop the last minibatch of an epoch if it is smaller than
+            `batch_size`. (Default: False)
+        - :attr:`num_workers` (int): The number of threads that gather minibatches. (Default: 2)
+        - :attr:`prefetch` (int): The number of minibatches that are gathered ahead of time. (Default: 2)
+        - :attr:`sort_dim` (int, optional): If supplied, minibatches are made of points that are close to each other
+            along this input dimension.
+        - :attr:`bucket_size` (int, optional): If `sort_dim` is supplied, the number of (sorted) points that each
+            minibatch is sampled from. (Default: `batch_size`)
+        - :attr:`device` (:obj:`torch.device`, optional): The device to move the minibatches to.
+        - :attr:`pin_memory` (bool, optional): Whether to gather minibatches in pinned memory.
+            (Default: True if `device` is a CUDA device and the data is on the CPU)
+    """
+
+    def __init__(
+        self,
+        inputs,
+        targets,
+        batch_size,
+        shuffle=True,
+        drop_last=False,
+        num_workers=2,
+        prefetch=2,
+        sort_dim=None,
+        bucket_size=None,
+        device=None,
+        pin_memory=None,
+    ):
+        if _num_rows(inputs) != _num_rows(targets):
+            raise RuntimeError(
+                "Expected inputs and targets with the same number of rows. Got {} and {}.".format(
+                    _num_rows(inputs), _num_rows(targets)
+                )
+            )
+        if prefetch < 1:
+            raise RuntimeError("Expected prefetch to be at least 1. Got {}.".format(prefetch))
+
+        self.inputs = inputs
+        self.targets = targets
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.num_workers = num_workers
+        self.prefetch = prefetch
+        self.bucket_size = max(bucket_size or batch_size, batch_size)
+        self.device = torch.device(device) if device is not None else None
+        if pin_memory is None:
+            pin_memory = self.device is not None and self.device.type == "cuda"
+        self.pin_memory = pin_memory
+
+        self._sorted_order = None
+        if sort_dim is not None:
+            sort_keys = inputs[:, sort_dim] if len(inputs.shape) > 1 else inputs[:]
+            sort_keys = sort_keys if torch.is_tensor(sort_keys) else torch.from_numpy(np.asarray(sort_keys))
+            self._sorted_order = sort_keys.cpu().argsort()
+
+        # One buffer for the minibatch that is being used, and one for each minibatch that is being prefetched
+        self._buffers = [
+            (_empty_buffer(inputs, batch_size, pin_memory), _empty_buffer(targets, batch_size, pin_memory))
+            for _ in range(prefetch + 1)
+        ]
+        self._copy_events = [None] * len(self._buffers)
+
+    @property
+    def num_data(self):
+        """
+        The number of training points (e.g. for the `num_data` argument of :obj:`~gpytorch.mlls.VariationalELBO`).
+        """
+        return _num_rows(self.inputs)
+
+    def __len__(self):
+        if self.drop_last:
+            return self.num_data // self.batch_size
+        return (self.num_data + self.batch_size - 1) // self.batch_size
+
+    def _batch_indices(self):
+        num_data = self.num_data
+        if self._sorted_order is None:
+            order = torch.randperm(num_data) if self.shuffle else torch.arange(num_data)
+            batches = list(order.split(self.batch_size))
+        else:
+            order = self._sorted_order
+            if self.shuffle:
+                # Shift the bucket boundaries, and shuffle the points within each bucket
+                order = order.roll(int(torch.randint(num_data, (1,)).item()))
+            batches, leftovers = [], []
+            for bucket in order.split(self.bucket_size):
+                if self.shuffle:
+                    bucket = bucket[torch.randperm(bucket.size(0))]
+                for batch in bucket.split(self.batch_size):
+                    (batches if batch.size(0) == self.batch_size else leftovers).append(batch)
+            # Merge the minibatches that were cut short by the end of a bucket
+            if leftovers:
+                batches.extend(torch.cat(leftovers).split(self.batch_size))
+
+        if self.drop_last and batches and batches[-1].size(0) < self.batch_size:
+            batches = batches[:-1]
+
+        if self.shuffle and self._sorted_order is not None:
+            batches = [batches[i] for i in torch.randperm(len(batches)).tolist()]
+        # Reading the rows in order is faster (in particular for memory-mapped data)
+        return [batch.sort()[0] for batch in batches]
+
+    def _fill(self, buffer_index, indices):
+        copy_event = self._copy_events[buffer_index]
+        if copy_event is not None:
+            # Don't overwrite the buffer while it is being copied to the device
+            copy_event.synchronize()
+        input_buffer, target_buffer = self._buffers[buffer_index]
+        return _gather(self.inputs, indices, input_buffer), _gather(self.targets, indices, target_buffer)
+
+    def _to_device(self, buffer_index, batch):
+        if self.device is None or self.device == batch[0].device:
+            return batch
+        non_blocking = self.pin_memory and self.device.type == "cuda"
+        batch = tuple(tensor.to(self.device, non_blocking=non_blocking) for tensor in batch)
+        if non_blocking:
+            self._copy_events[buffer_index] = torch.cuda.Event()
+            self._copy_events[buffer_index].record()
+        return batch
+
+    def __iter__(self):
+        batch_indices = collections.deque(self._batch_indices())
+        free_buffers = collections.deque(range(len(self._buffers)))
+        pending = collections.deque()
+
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+
+            def prefetch():
+                while batch_indices and len(pending) < self.prefetch:
+                    buffer_index = free_buffers.popleft()
+                    pending.append((buffer_index, executor.submit(self._fill, buffer_index, batch_indices.popleft())))
+
+            prefetch()
+            while pending:
+                buffer_index, future = pending.popleft()
+                # Keep `prefetch` minibatches in flight while this one is being used
+                prefetch()
+                yield self._to_device(buffer_index, future.result())
+                # The previous minibatch is no longer in use
+                free_buffers.append(buffer_index)
+
+
+def train_variational(model, likelihood, loader, optimizer, num_epochs=1, mll=None, callback=None):
+    """
+    Trains a variational model with minibatches from a :obj:`MinibatchLoader`, by maximizing the
+    :obj:`~gpytorch.mlls.VariationalELBO` (or another marginal log likelihood).
+
+    Args:
+        - :attr:`model` (:obj:`~gpytorch.models.AbstractVariationalGP`): The model to train.
+        - :attr:`likelihood` (:obj:`~gpytorch.likelihoods.Likelihood`): The likelihood of the model.
+        - :attr:`loader` (:obj:`MinibatchLoader`): The training data.
+        - :attr:`optimizer` (:obj:`torch.optim.Optimizer` or list of optimizers): Optimizer(s) that take a step
+            after each minibatch (e.g. a :obj:`~gpytorch.optim.NGD` optimizer for the variational parameters and an
+            Adam optimizer for the hyperparameters).
+        - :attr:`num_epochs` (int): The number of passes over the training data. (Default: 1)
+        - :attr:`mll` (:obj:`~gpytorch.mlls.MarginalLogLikelihood`, optional): The objective to maximize.
+            (Default: a :obj:`~gpytorch.mlls.VariationalELBO` with `num_data=loader.num_data`)
+        - :attr:`callback` (callable, optional): Called with the statistics of each epoch, when the epoch ends.
+
+    Returns:
+        - list of :obj:`dict`, with the statistics of each epoch: the `epoch`, the mean `loss` (the negative
+          objective, averaged over the minibatches), the number of `samples` (training points), the `time` that the
+          epoch took (in seconds), and the throughput (`samples_per_sec`).
+    """
+    from ..mlls import VariationalELBO
+
+    if mll is None:
+        mll = VariationalELBO(likelihood, model, num_data=loader.num_data)
+    optimizers = optimizer if isinstance(optimizer, (list, tuple)) else [optimizer]
+
+    model.train()
+    likelihood.train()
+    history = []
+    for epoch in range(num_epochs):
+        start_time = time.perf_counter()
+        total_loss = 0.
+        num_batches = 0
+        num_samples = 0
+        for x_batch, y_batch in loader:
+            for opt in optimizers:
+                opt.zero_grad()
+            loss = -mll(model(x_batch), y_batch)
+            loss.backward()
+            for opt in optimizers:
+                opt.step()
+
+            # Accumulate the loss on the device, to avoid synchronizing after each step
+            total_loss = total_loss + loss.detach()
+            num_batches += 1
+            num_samples += x_batch.size(0)
+
+        mean_loss = float(total_loss) / max(num_batches, 1)
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            "epoch": epoch,
+            "loss": mean_loss,
+            "samples": num_samples,
+            "time": elapsed,
+            "samples_per_sec": num_samples / elapsed if elapsed > 0 else 0.,
+        }
+        history.append(stats)
+        if callback is not None:
+            callback(stats)
+
+    return history
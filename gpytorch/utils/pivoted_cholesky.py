@@ -4,7 +4,13 @@ import torch
 from .. import settings
 
 
-def pivoted_cholesky(matrix, max_iter, error_tol=None):
+def pivoted_cholesky(matrix, max_iter, error_tol=None, return_pivots=False):
+    """
+    Computes a (partial) pivoted Cholesky factor :math:`L` (`n x k`) of a PSD matrix, such that :math:`LL^\\top`
+    approximates the matrix. At each iteration, the row with the largest remaining diagonal error is selected.
+
+    If `return_pivots` is True, also returns the indices of the selected rows (`k`), in the order they were selected.
+    """
     from ..lazy import lazify, LazyTensor
 
     batch_shape = matrix.shape[:-2]
@@ -80,4 +86,7 @@ def pivoted_cholesky(matrix, max_iter, error_tol=None):
             errors = torch.norm(matrix_diag.gather(-1, pi_i), 1, dim=-1) / orig_error
         m = m + 1
 
-    return L[..., :m, :].transpose(-1, -2).contiguous()
+    L = L[..., :m, :].transpose(-1, -2).contiguous()
+    if return_pivots:
+        return L, permutation[..., :m].contiguous()
+    return L
@@ -42,11 +42,11 @@ def make_sparse_from_indices_and_values(interp_indices, interp_values, num_rows)
 
     # Value tensor
     value_tensor = interp_values.contiguous().view(-1)
-    nonzero_indices = value_tensor.nonzero()
-    if nonzero_indices.storage():
-        nonzero_indices.squeeze_()
-        index_tensor = index_tensor.index_select(1, nonzero_indices)
-        value_tensor = value_tensor.index_select(0, nonzero_indices)
+    # Masking is much faster than index_select along the (non-contiguous) second dimension of index_tensor
+    nonzero_mask = value_tensor.ne(0)
+    if nonzero_mask.any():
+        index_tensor = index_tensor[:, nonzero_mask]
+        value_tensor = value_tensor[nonzero_mask]
     else:
         index_tensor = index_tensor.resize_(interp_indices.dim(), 1).zero_()
         value_tensor = value_tensor.resize_(1).zero_()
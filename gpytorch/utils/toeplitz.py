@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 import torch
-from ..utils import fft, broadcasting
+from ..utils import fft
 
 
 def toeplitz(toeplitz_column, toeplitz_row):
@@ -89,77 +89,172 @@ def sym_toeplitz_getitem(toeplitz_column, i, j):
     return toeplitz_getitem(toeplitz_column, toeplitz_column, i, j)
 
 
-def toeplitz_matmul(toeplitz_column, toeplitz_row, tensor):
+def toeplitz_circulant_fft(toeplitz_column, toeplitz_row):
+    """
+    Computes the FFT of the circulant embedding of a Toeplitz matrix T, which is all that toeplitz_matmul
+    needs to know about T. It can be computed once and reused for any number of multiplications with T.
+    Args:
+        - toeplitz_column (vector n or b x n) - First column of the Toeplitz matrix T.
+        - toeplitz_row (vector n or b x n) - First row of the Toeplitz matrix T.
+    Returns:
+        - tensor (k x 2 or b x k x 2) - The non-redundant FFT coefficients of the circulant embedding,
+          which is zero-padded to an FFT-friendly size (see toeplitz_fft_size).
+    """
+    orig_size = toeplitz_column.size(-1)
+    fft_size = toeplitz_fft_size(orig_size)
+
+    r_reverse = toeplitz_row[..., 1:].flip(dims=(-1,))
+    padding = toeplitz_column.new_zeros(*toeplitz_column.shape[:-1], fft_size - 2 * orig_size + 1)
+    c_r_rev = torch.cat([toeplitz_column, padding, r_reverse], -1)
+    return torch.rfft(c_r_rev, 1)
+
+
+def toeplitz_fft_size(size):
+    """
+    The size of the FFTs used to multiply with a size x size Toeplitz matrix.
+    """
+    return fft.next_fast_len(2 * size - 1)
+
+
+def toeplitz_matmul(toeplitz_column, toeplitz_row, tensor, circulant_fft=None):
     """
     Performs multiplication T * M where the matrix T is Toeplitz.
     Args:
         - toeplitz_column (vector n or b x n) - First column of the Toeplitz matrix T.
         - toeplitz_row (vector n or b x n) - First row of the Toeplitz matrix T.
         - tensor (matrix n x p or b x n x p) - Matrix or vector to multiply the Toeplitz matrix with.
+        - circulant_fft (optional) - The result of toeplitz_circulant_fft(toeplitz_column, toeplitz_row),
+          if it has already been computed.
     Returns:
         - tensor (n x p or b x n x p) - The result of the matrix multiply T * M.
     """
     if toeplitz_column.size() != toeplitz_row.size():
         raise RuntimeError("c and r should have the same length (Toeplitz matrices are necessarily square).")
 
-    toeplitz_shape = torch.Size((*toeplitz_column.shape, toeplitz_row.size(-1)))
-    output_shape = broadcasting._matmul_broadcast_shape(toeplitz_shape, tensor.shape)
-    broadcasted_t_shape = output_shape[:-1] if tensor.dim() > 1 else output_shape
-
-    if tensor.ndimension() == 1:
-        tensor = tensor.unsqueeze(-1)
-    toeplitz_column = toeplitz_column.expand(*broadcasted_t_shape).contiguous().view(-1, toeplitz_column.size(-1))
-    toeplitz_row = toeplitz_row.expand(*broadcasted_t_shape).contiguous().view(-1, toeplitz_row.size(-1))
-    tensor = tensor.expand(*output_shape).contiguous().view(-1, *tensor.shape[-2:])
-
-    if not torch.equal(toeplitz_column[:, 0], toeplitz_row[:, 0]):
+    if not torch.equal(toeplitz_column[..., 0], toeplitz_row[..., 0]):
         raise RuntimeError(
             "The first column and first row of the Toeplitz matrix should have "
             "the same first element, otherwise the value of T[0,0] is ambiguous. "
-            "Got: c[0]={} and r[0]={}".format(toeplitz_column[0], toeplitz_row[0])
+            "Got: c[0]={} and r[0]={}".format(toeplitz_column[..., 0], toeplitz_row[..., 0])
         )
 
     if type(toeplitz_column) != type(toeplitz_row) or type(toeplitz_column) != type(tensor):
         raise RuntimeError("The types of all inputs to ToeplitzMV must match.")
 
-    batch_size, orig_size, num_rhs = tensor.size()
-    r_reverse = toeplitz_row[:, 1:].flip(dims=(1,))
+    is_vector = tensor.ndimension() == 1
+    if is_vector:
+        tensor = tensor.unsqueeze(-1)
 
-    c_r_rev = torch.zeros(batch_size, orig_size + r_reverse.size(1), dtype=tensor.dtype, device=tensor.device)
-    c_r_rev[:, :orig_size] = toeplitz_column
-    c_r_rev[:, orig_size:] = r_reverse
+    if circulant_fft is None:
+        circulant_fft = toeplitz_circulant_fft(toeplitz_column, toeplitz_row)
+    orig_size = toeplitz_column.size(-1)
+    fft_size = toeplitz_fft_size(orig_size)
 
-    temp_tensor = torch.zeros(
-        batch_size, 2 * orig_size - 1, num_rhs, dtype=toeplitz_column.dtype, device=toeplitz_column.device
-    )
-    temp_tensor[:, :orig_size, :] = tensor
+    # All of the columns of tensor are transformed at once
+    fft_M = fft.rfft1(tensor.transpose(-1, -2), fft_size)
+    fft_product = fft.complex_mul(circulant_fft.unsqueeze(-3), fft_M)
 
-    fft_M = fft.fft1(temp_tensor.transpose(1, 2).contiguous())
-    fft_c = fft.fft1(c_r_rev).unsqueeze(1).expand_as(fft_M)
-    fft_product = torch.zeros_like(fft_M)
+    output = fft.irfft1(fft_product, fft_size)
+    output = output[..., :orig_size].transpose(-1, -2)
 
-    fft_product[:, :, :, 0].addcmul_(fft_c[:, :, :, 0], fft_M[:, :, :, 0])
-    fft_product[:, :, :, 0].addcmul_(-1, fft_c[:, :, :, 1], fft_M[:, :, :, 1])
-    fft_product[:, :, :, 1].addcmul_(fft_c[:, :, :, 1], fft_M[:, :, :, 0])
-    fft_product[:, :, :, 1].addcmul_(fft_c[:, :, :, 0], fft_M[:, :, :, 1])
+    if is_vector:
+        output = output.squeeze(-1)
+    return output
 
-    output = fft.ifft1(fft_product).transpose(1, 2)
-    output = output[:, :orig_size, :]
 
-    output = output.view(*output_shape)
-    return output
+def sym_toeplitz_circulant_fft(toeplitz_column):
+    """
+    Computes the FFT of the circulant embedding of a symmetric Toeplitz matrix T.
+    Args:
+        - toeplitz_column (vector n or b x n) - First column of the symmetric Toeplitz matrix T.
+    Returns:
+        - tensor - see toeplitz_circulant_fft
+    """
+    return toeplitz_circulant_fft(toeplitz_column, toeplitz_column)
 
 
-def sym_toeplitz_matmul(toeplitz_column, tensor):
+def sym_toeplitz_matmul(toeplitz_column, tensor, circulant_fft=None):
     """
     Performs a matrix-matrix multiplication TM where the matrix T is symmetric Toeplitz.
     Args:
         - toeplitz_column (vector n) - First column of the symmetric Toeplitz matrix T.
         - matrix (matrix n x p) - Matrix or vector to multiply the Toeplitz matrix with.
+        - circulant_fft (optional) - The result of sym_toeplitz_circulant_fft(toeplitz_column),
+          if it has already been computed.
     Returns:
         - tensor
     """
-    return toeplitz_matmul(toeplitz_column, toeplitz_column, tensor)
+    return toeplitz_matmul(toeplitz_column, toeplitz_column, tensor, circulant_fft=circulant_fft)
+
+
+def bttb_circulant_fft(stencil, num_dims):
+    """
+    Computes the FFT of the (multi-dimensional) circulant embedding of a block Toeplitz with Toeplitz blocks
+    (BTTB) matrix T, which is all that bttb_matmul needs to know about T.
+    Args:
+        - stencil (tensor ... x (2 n_1 - 1) x ... x (2 n_d - 1)) - The entries of T. T[i, j] is given by the entry
+          (n_1 - 1 + i_1 - j_1, ..., n_d - 1 + i_d - j_d) of the stencil, where (i_1, ..., i_d) are the indices of
+          i in an n_1 x ... x n_d array (in C order).
+        - num_dims (int) - The number of levels d (at most 3).
+    Returns:
+        - tensor - The non-redundant FFT coefficients of the circulant embedding, which is zero-padded to
+          FFT-friendly sizes (see toeplitz_fft_size).
+    """
+    if num_dims > 3:
+        raise RuntimeError("BTTB matmuls support at most 3 levels of Toeplitz structure. Got {}.".format(num_dims))
+
+    embedding = stencil
+    for dim in range(-num_dims, 0):
+        size = (stencil.size(dim) + 1) // 2
+        fft_size = toeplitz_fft_size(size)
+        padding_shape = list(embedding.shape)
+        padding_shape[dim] = fft_size - 2 * size + 1
+
+        # Nonnegative offsets come first, then the negative ones (wrapped around)
+        nonneg_offsets = embedding.narrow(dim, size - 1, size)
+        neg_offsets = embedding.narrow(dim, 0, size - 1)
+        embedding = torch.cat([nonneg_offsets, embedding.new_zeros(padding_shape), neg_offsets], dim)
+    return torch.rfft(embedding, num_dims)
+
+
+def bttb_matmul(stencil, num_dims, tensor, circulant_fft=None):
+    """
+    Performs multiplication T * M where the matrix T is block Toeplitz with Toeplitz blocks.
+    Args:
+        - stencil (tensor ... x (2 n_1 - 1) x ... x (2 n_d - 1)) - The entries of T (see bttb_circulant_fft).
+        - num_dims (int) - The number of levels d (at most 3).
+        - tensor (matrix N x p or ... x N x p, where N = n_1 * ... * n_d) - Matrix or vector to multiply T with.
+        - circulant_fft (optional) - The result of bttb_circulant_fft(stencil, num_dims),
+          if it has already been computed.
+    Returns:
+        - tensor (N x p or ... x N x p) - The result of the matrix multiply T * M.
+    """
+    is_vector = tensor.ndimension() == 1
+    if is_vector:
+        tensor = tensor.unsqueeze(-1)
+
+    if circulant_fft is None:
+        circulant_fft = bttb_circulant_fft(stencil, num_dims)
+    sizes = [(size + 1) // 2 for size in stencil.shape[-num_dims:]]
+    fft_sizes = [toeplitz_fft_size(size) for size in sizes]
+
+    # Reshape the columns of tensor into n_1 x ... x n_d arrays, and transform them all at once
+    rhs = tensor.transpose(-1, -2).contiguous()
+    rhs = rhs.view(*rhs.shape[:-1], *sizes)
+    padding = []
+    for size, fft_size in zip(sizes[::-1], fft_sizes[::-1]):
+        padding += [0, fft_size - size]
+    fft_M = torch.rfft(torch.nn.functional.pad(rhs, padding), num_dims)
+    fft_product = fft.complex_mul(circulant_fft.unsqueeze(-num_dims - 2), fft_M)
+
+    output = torch.irfft(fft_product, num_dims, signal_sizes=fft_sizes)
+    for dim, size in zip(range(-num_dims, 0), sizes):
+        output = output.narrow(dim, 0, size)
+    output = output.contiguous().view(*output.shape[:-num_dims], -1).transpose(-1, -2)
+
+    if is_vector:
+        output = output.squeeze(-1)
+    return output
 
 
 def sym_toeplitz_derivative_quadratic_form(left_vectors, right_vectors):
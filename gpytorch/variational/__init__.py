@@ -2,17 +2,27 @@
 
 from .variational_strategy import VariationalStrategy
 from .whitened_variational_strategy import WhitenedVariationalStrategy
+from .independent_multitask_variational_strategy import IndependentMultitaskVariationalStrategy
 from .additive_grid_interpolation_variational_strategy import AdditiveGridInterpolationVariationalStrategy
 from .grid_interpolation_variational_strategy import GridInterpolationVariationalStrategy
 from .variational_distribution import VariationalDistribution
 from .cholesky_variational_distribution import CholeskyVariationalDistribution
+from .kronecker_variational_distribution import KroneckerVariationalDistribution
+from .natural_variational_distribution import NaturalVariationalDistribution
+from .mean_field_variational_distribution import MeanFieldVariationalDistribution
+from .low_rank_plus_diag_variational_distribution import LowRankPlusDiagVariationalDistribution
 
 __all__ = [
     "VariationalStrategy",
     "WhitenedVariationalStrategy",
+    "IndependentMultitaskVariationalStrategy",
     "AdditiveGridInterpolationVariationalStrategy",
     "GridInterpolationVariationalStrategy",
     "NewVariationalStrategy",
     "VariationalDistribution",
     "CholeskyVariationalDistribution",
+    "KroneckerVariationalDistribution",
+    "NaturalVariationalDistribution",
+    "MeanFieldVariationalDistribution",
+    "LowRankPlusDiagVariationalDistribution",
 ]
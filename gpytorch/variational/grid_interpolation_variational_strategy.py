@@ -1,12 +1,54 @@
 #!/usr/bin/env python3
 
 import torch
+from .. import settings
+from ..utils.cholesky import psd_safe_cholesky, triangular_solve
 from ..utils.interpolation import Interpolation, left_interp
-from ..lazy import InterpolatedLazyTensor
+from ..utils.memoize import cached
+from ..lazy import (
+    CholLazyTensor,
+    ConstantMulLazyTensor,
+    InterpolatedLazyTensor,
+    KroneckerProductLazyTensor,
+    LazyEvaluatedKernelTensor,
+)
 from ..distributions import MultivariateNormal
+from .kronecker_variational_distribution import KroneckerVariationalDistribution
 from .variational_strategy import VariationalStrategy
 
 
+def _kronecker_factors(covar):
+    # The (evaluated) Kronecker factors of a prior covariance matrix on the grid (e.g. from a GridKernel, possibly
+    # scaled by a ScaleKernel), or None if it does not have Kronecker structure
+    if isinstance(covar, LazyEvaluatedKernelTensor):
+        covar = covar.evaluate_kernel()
+
+    constant = None
+    if isinstance(covar, ConstantMulLazyTensor):
+        constant = covar._constant
+        covar = covar.base_lazy_tensor
+    if not isinstance(covar, KroneckerProductLazyTensor):
+        return None
+
+    factors = [factor.evaluate() for factor in covar.lazy_tensors]
+    if constant is not None:
+        factors[0] = factors[0] * constant.view(*factors[0].shape[:-2], 1, 1)
+    return factors
+
+
+def _is_kronecker_chol(covar, num_factors=None):
+    return (
+        isinstance(covar, KroneckerProductLazyTensor)
+        and all(isinstance(factor, CholLazyTensor) for factor in covar.lazy_tensors)
+        and (num_factors is None or len(covar.lazy_tensors) == num_factors)
+    )
+
+
+def _chol_logdet(chol, num_induc):
+    # The log determinant of a Kronecker factor chol chol^T, repeated (num_induc / factor size) times
+    return chol.diagonal(dim1=-2, dim2=-1).pow(2).log().sum(-1).mul(num_induc // chol.size(-1))
+
+
 class GridInterpolationVariationalStrategy(VariationalStrategy):
     def __init__(self, model, grid_size, grid_bounds, variational_distribution):
         grid = torch.zeros(grid_size, len(grid_bounds))
@@ -30,6 +72,78 @@ class GridInterpolationVariationalStrategy(VariationalStrategy):
 
         self.register_buffer("grid", grid)
 
+    @property
+    @cached(name="prior_distribution_memo")
+    def prior_distribution(self):
+        """
+        If the variational distribution is a :obj:`~gpytorch.variational.KroneckerVariationalDistribution` and the
+        prior covariance matrix on the grid is a Kronecker product (e.g. if the model uses a
+        :obj:`~gpytorch.kernels.GridKernel`), the prior covariance is represented by the Cholesky factors of each
+        Kronecker factor, and is never formed explicitly. A jitter of :obj:`gpytorch.settings.kronecker_prior_jitter`
+        times the mean diagonal of each Kronecker factor is added to that factor.
+        """
+        if not isinstance(self.variational_distribution, KroneckerVariationalDistribution):
+            return super(GridInterpolationVariationalStrategy, self).prior_distribution
+
+        out = self.model.forward(self.inducing_points)
+        factors = _kronecker_factors(out.lazy_covariance_matrix)
+        if factors is None:
+            return self._prior_distribution(out)
+
+        chol_factors = []
+        for factor in factors:
+            eye = torch.eye(factor.size(-1), dtype=factor.dtype, device=factor.device)
+            jitter = factor.diagonal(dim1=-2, dim2=-1).mean(-1).mul(settings.kronecker_prior_jitter.value())
+            chol_factors.append(CholLazyTensor(psd_safe_cholesky(factor + eye * jitter.unsqueeze(-1).unsqueeze(-1))))
+        return MultivariateNormal(out.mean, KroneckerProductLazyTensor(*chol_factors))
+
+    def kl_divergence(self):
+        """
+        If both the prior and the variational covariance matrices are Kronecker products (see
+        :obj:`~gpytorch.variational.KroneckerVariationalDistribution`), the KL divergence is computed factor by
+        factor: :math:`\\log |K|`, :math:`\\log |S|`, :math:`\\text{tr}(K^{-1} S)` and
+        :math:`(m - \\mu)^\\top K^{-1} (m - \\mu)` only require the Cholesky factors of each Kronecker factor.
+        """
+        prior_dist = self.prior_distribution
+        prior_covar = prior_dist.lazy_covariance_matrix
+        variational_dist = self.variational_distribution.variational_distribution
+        variational_covar = variational_dist.lazy_covariance_matrix
+        if not _is_kronecker_chol(prior_covar) or not _is_kronecker_chol(
+            variational_covar, len(prior_covar.lazy_tensors)
+        ):
+            return super(GridInterpolationVariationalStrategy, self).kl_divergence()
+
+        num_induc = prior_covar.size(-1)
+
+        # K^{-1} = (P_1^{-1} kron ... kron P_d^{-1})^T (P_1^{-1} kron ... kron P_d^{-1}), where K_i = P_i P_i^T
+        prior_chols = [factor.root.evaluate() for factor in prior_covar.lazy_tensors]
+        prior_inv_chols = []
+        for prior_chol in prior_chols:
+            eye = torch.eye(prior_chol.size(-1), dtype=prior_chol.dtype, device=prior_chol.device)
+            prior_inv_chols.append(triangular_solve(eye.expand_as(prior_chol), prior_chol, upper=False))
+        prior_inv_root = KroneckerProductLazyTensor(*prior_inv_chols)
+        prior_logdet = sum(_chol_logdet(prior_chol, num_induc) for prior_chol in prior_chols)
+
+        mean_diff = (variational_dist.mean - prior_dist.mean).unsqueeze(-1)
+        mean_diff_inv_quad = prior_inv_root.matmul(mean_diff).pow(2).sum(-1).sum(-1)
+
+        # tr(K^{-1} S) = prod_i || P_i^{-1} L_i ||_F^2, where S_i = L_i L_i^T
+        variational_chols = [factor.root.evaluate() for factor in variational_covar.lazy_tensors]
+        variational_logdet = sum(_chol_logdet(chol, num_induc) for chol in variational_chols)
+        trace = 1
+        for prior_inv_chol, variational_chol in zip(prior_inv_chols, variational_chols):
+            trace = trace * prior_inv_chol.matmul(variational_chol).pow(2).sum(-1).sum(-1)
+
+        return 0.5 * (prior_logdet - variational_logdet + trace + mean_diff_inv_quad - num_induc)
+
+    def initialize_variational_dist(self):
+        if not self.variational_params_initialized.item():
+            if isinstance(self.variational_distribution, KroneckerVariationalDistribution):
+                # A Kronecker variational distribution is initialized from the (Kronecker) prior, without evaluating it
+                self.variational_distribution.initialize_variational_distribution(self.prior_distribution)
+                self.variational_params_initialized.fill_(1)
+        super(GridInterpolationVariationalStrategy, self).initialize_variational_dist()
+
     def _compute_grid(self, inputs):
         if inputs.ndimension() == 1:
             inputs = inputs.unsqueeze(1)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+from ..distributions import MultitaskMultivariateNormal
+from ..lazy import BlockDiagLazyTensor
+from ..module import Module
+
+
+class IndependentMultitaskVariationalStrategy(Module):
+    """
+    IndependentMultitaskVariationalStrategy wraps a batch :obj:`~gpytorch.variational.VariationalStrategy` to model
+    `num_tasks` independent outputs with a single (vectorized) model.
+
+    The base variational strategy should have a variational distribution with `batch_size=num_tasks`. Its inducing
+    points can either be shared across the outputs (`m x d`) or be specific to each output (`num_tasks x m x d`).
+    The prior GP of the model can share its hyperparameters across the outputs, or have per-output hyperparameters
+    (e.g. a mean and kernel with `batch_size=num_tasks`, in which case the inducing points should be per-output as
+    well). In either case, :math:`K_{UU}`, the solves, and the KL divergence are computed for all of the outputs at
+    once, as batch operations.
+
+    The inputs `x` (`n x d`) are shared by all of the outputs, and the output is a
+    :obj:`~gpytorch.distributions.MultitaskMultivariateNormal` (`n x num_tasks`). The KL divergence is summed over
+    the outputs, so that the :obj:`~gpytorch.mlls.VariationalELBO` (with a
+    :obj:`~gpytorch.likelihoods.MultitaskGaussianLikelihood`) is the ELBO of all of the outputs.
+
+    Example:
+        >>> class MultitaskSVGPModel(gpytorch.models.AbstractVariationalGP):
+        >>>     def __init__(self, inducing_points, num_tasks):
+        >>>         variational_distribution = gpytorch.variational.CholeskyVariationalDistribution(
+        >>>             inducing_points.size(-2), batch_size=num_tasks
+        >>>         )
+        >>>         variational_strategy = gpytorch.variational.IndependentMultitaskVariationalStrategy(
+        >>>             gpytorch.variational.VariationalStrategy(self, inducing_points, variational_distribution),
+        >>>             num_tasks=num_tasks,
+        >>>         )
+        >>>         super(MultitaskSVGPModel, self).__init__(variational_strategy)
+        >>>         self.mean_module = gpytorch.means.ConstantMean()
+        >>>         self.covar_module = gpytorch.kernels.ScaleKernel(gpytorch.kernels.RBFKernel())
+        >>>
+        >>> model = MultitaskSVGPModel(inducing_points, num_tasks=4)
+        >>> likelihood = gpytorch.likelihoods.MultitaskGaussianLikelihood(num_tasks=4)
+        >>> mll = gpytorch.mlls.VariationalELBO(likelihood, model, num_data=train_y.size(0))
+        >>> loss = -mll(model(train_x), train_y)  # train_y is n x num_tasks
+    """
+
+    def __init__(self, base_variational_strategy, num_tasks):
+        """
+        Args:
+            base_variational_strategy (:obj:`gpytorch.variational.VariationalStrategy`): The (batch) variational
+                strategy of the outputs.
+            num_tasks (int): The number of outputs.
+        """
+        super(IndependentMultitaskVariationalStrategy, self).__init__()
+        self.base_variational_strategy = base_variational_strategy
+        self.num_tasks = num_tasks
+
+    @property
+    def variational_distribution(self):
+        return self.base_variational_strategy.variational_distribution
+
+    @property
+    def prior_distribution(self):
+        return self.base_variational_strategy.prior_distribution
+
+    @property
+    def variational_params_initialized(self):
+        return self.base_variational_strategy.variational_params_initialized
+
+    def kl_divergence(self):
+        return self.base_variational_strategy.kl_divergence().sum(-1)
+
+    def forward(self, x):
+        """
+        Computes q(f|x) for all of the outputs in a single batch.
+
+        Args:
+            x (torch.tensor): Locations x (`n x d`) to get the variational posterior of the function values at.
+        Returns:
+            :obj:`gpytorch.distributions.MultitaskMultivariateNormal`: The distribution q(f|x) (`n x num_tasks`)
+        """
+        x = x.unsqueeze(-3).expand(*x.shape[:-2], self.num_tasks, *x.shape[-2:])
+        function_dist = self.base_variational_strategy(x)
+        return MultitaskMultivariateNormal(
+            function_dist.mean.transpose(-1, -2),
+            BlockDiagLazyTensor(function_dist.lazy_covariance_matrix, block_dim=-3),
+            interleaved=False,
+        )
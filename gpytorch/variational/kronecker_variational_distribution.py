@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import torch
+from ..lazy import CholLazyTensor, KroneckerProductLazyTensor
+from ..distributions import MultivariateNormal
+from ..utils.cholesky import psd_safe_cholesky
+from .variational_distribution import VariationalDistribution
+
+
+class KroneckerVariationalDistribution(VariationalDistribution):
+    """
+    A VariationalDistribution over the values of a `grid_size ^ num_dim` grid of inducing points, whose covariance
+    matrix is a Kronecker product of `num_dim` (`grid_size x grid_size`) covariance matrices, one per grid dimension:
+    :math:`S = L_1 L_1^\\top \\otimes \\ldots \\otimes L_d L_d^\\top`.
+
+    This only requires :math:`O(g^d + dg^2)` parameters (rather than :math:`O(g^{2d})`), and is meant to be used
+    with a :obj:`~gpytorch.variational.GridInterpolationVariationalStrategy` and a model whose prior covariance
+    on the grid has Kronecker structure (e.g. a :obj:`~gpytorch.kernels.GridKernel`). The KL divergence and the
+    predictive distribution are then computed without ever forming a `g^d x g^d` matrix.
+    """
+
+    def __init__(self, grid_size, num_dim, batch_size=None):
+        """
+        Args:
+            grid_size (int): Size of the grid in each dimension.
+            num_dim (int): Number of dimensions of the grid. The variational distribution has `grid_size ^ num_dim`
+                inducing values.
+            batch_size (int, optional): Specifies an optional batch size for the variational parameters.
+        """
+        super(VariationalDistribution, self).__init__()
+        mean_init = torch.zeros(int(pow(grid_size, num_dim)))
+        covar_init = torch.eye(grid_size, grid_size).repeat(num_dim, 1, 1)
+        if batch_size is not None:
+            mean_init = mean_init.repeat(batch_size, 1)
+            covar_init = covar_init.repeat(batch_size, 1, 1, 1)
+
+        self.num_dim = num_dim
+        self.register_parameter(name="variational_mean", parameter=torch.nn.Parameter(mean_init))
+        self.register_parameter(name="chol_variational_covar", parameter=torch.nn.Parameter(covar_init))
+
+    def initialize_variational_distribution(self, prior_dist):
+        """
+        Initializes the variational mean to the prior mean. If the prior covariance matrix is a Kronecker product of
+        `num_dim` factors, each variational covariance factor is initialized to the corresponding prior factor.
+        Otherwise, the variational covariance factors are left unchanged.
+        """
+        self.variational_mean.data.copy_(prior_dist.mean)
+        prior_covar = getattr(prior_dist, "lazy_covariance_matrix", None)
+        if isinstance(prior_covar, KroneckerProductLazyTensor) and len(prior_covar.lazy_tensors) == self.num_dim:
+            for i, factor in enumerate(prior_covar.lazy_tensors):
+                if isinstance(factor, CholLazyTensor):
+                    chol_factor = factor.root.evaluate()
+                else:
+                    chol_factor = psd_safe_cholesky(factor.evaluate())
+                self.chol_variational_covar.data[..., i, :, :].copy_(chol_factor)
+
+    @property
+    def variational_distribution(self):
+        """
+        Return the variational distribution q(u) that this module represents.
+
+        The variational covariance matrix is a :obj:`~gpytorch.lazy.KroneckerProductLazyTensor` of
+        :obj:`~gpytorch.lazy.CholLazyTensor` factors, each of which is the lower triangle of the corresponding
+        registered covariance factor parameter.
+        """
+        chol_variational_covar = self.chol_variational_covar
+        dtype = chol_variational_covar.dtype
+        device = chol_variational_covar.device
+
+        # Only consider the lower triangle of each factor
+        lower_mask = torch.ones(chol_variational_covar.shape[-2:], dtype=dtype, device=device).tril(0)
+        chol_variational_covar = chol_variational_covar.mul(lower_mask)
+
+        variational_covar = KroneckerProductLazyTensor(
+            *[CholLazyTensor(chol_variational_covar[..., i, :, :]) for i in range(self.num_dim)]
+        )
+        return MultivariateNormal(self.variational_mean, variational_covar)
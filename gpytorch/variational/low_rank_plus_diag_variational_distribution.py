@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import torch
+from ..lazy import DiagLazyTensor, LowRankRootAddedDiagLazyTensor, RootLazyTensor
+from ..distributions import MultivariateNormal
+from .variational_distribution import VariationalDistribution
+
+
+class LowRankPlusDiagVariationalDistribution(VariationalDistribution):
+    """
+    A VariationalDistribution whose covariance matrix is a low-rank matrix plus a diagonal,
+    q(u) = N(m, FF^T + diag(s^2)), where F is a `num_inducing_points x rank` factor.
+
+    This requires O(mr) parameters, and the log determinant and solves needed for the KL divergence only cost
+    O(mr^2) (see :obj:`~gpytorch.lazy.LowRankRootAddedDiagLazyTensor`). Unlike
+    :class:`~gpytorch.variational.MeanFieldVariationalDistribution`, it can capture the dominant correlations between
+    the inducing values.
+    """
+
+    def __init__(self, num_inducing_points, rank, batch_size=None):
+        """
+        Args:
+            num_inducing_points (int): Size of the variational distribution. This implies that the variational mean
+                should be this size, and the variational covariance matrix should have this many rows and columns.
+            rank (int): The rank of the low-rank part of the variational covariance matrix.
+            batch_size (int, optional): Specifies an optional batch size for the variational parameters. This is useful
+                for example when doing additive variational inference.
+        """
+        super(VariationalDistribution, self).__init__()
+        mean_init = torch.zeros(num_inducing_points)
+        # A zero factor would be a stationary point of the ELBO, so the factor starts out small rather than zero
+        cov_factor_init = torch.randn(num_inducing_points, rank).mul_(1e-3)
+        stddev_init = torch.ones(num_inducing_points)
+        if batch_size is not None:
+            mean_init = mean_init.repeat(batch_size, 1)
+            cov_factor_init = cov_factor_init.repeat(batch_size, 1, 1)
+            stddev_init = stddev_init.repeat(batch_size, 1)
+
+        self.register_parameter(name="variational_mean", parameter=torch.nn.Parameter(mean_init))
+        self.register_parameter(name="variational_cov_factor", parameter=torch.nn.Parameter(cov_factor_init))
+        self.register_parameter(name="variational_stddev", parameter=torch.nn.Parameter(stddev_init))
+
+    def initialize_variational_distribution(self, prior_dist):
+        self.variational_mean.data.copy_(prior_dist.mean)
+        self.variational_stddev.data.copy_(prior_dist.stddev)
+
+    @property
+    def variational_distribution(self):
+        """
+        Return the variational distribution q(u) that this module represents.
+
+        The variational covariance matrix is a :obj:`~gpytorch.lazy.LowRankRootAddedDiagLazyTensor`, made up of the
+        registered covariance factor and the square of the registered variational standard deviation parameter.
+        """
+        variational_covar = LowRankRootAddedDiagLazyTensor(
+            RootLazyTensor(self.variational_cov_factor), DiagLazyTensor(self.variational_stddev.pow(2))
+        )
+        return MultivariateNormal(self.variational_mean, variational_covar)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import torch
+from ..lazy import DiagLazyTensor
+from ..distributions import MultivariateNormal
+from .variational_distribution import VariationalDistribution
+
+
+class MeanFieldVariationalDistribution(VariationalDistribution):
+    """
+    A VariationalDistribution with a diagonal covariance matrix, q(u) = N(m, diag(s^2)).
+
+    This only requires O(m) parameters (rather than the O(m^2) parameters of
+    :class:`~gpytorch.variational.CholeskyVariationalDistribution`), which makes it suitable for large numbers of
+    inducing points. It is most commonly used with a :class:`~gpytorch.variational.WhitenedVariationalStrategy`,
+    where the whitened posterior is usually close to diagonal.
+    """
+
+    def __init__(self, num_inducing_points, batch_size=None):
+        """
+        Args:
+            num_inducing_points (int): Size of the variational distribution. This implies that the variational mean
+                should be this size, and the variational covariance matrix should have this many rows and columns.
+            batch_size (int, optional): Specifies an optional batch size for the variational parameters. This is useful
+                for example when doing additive variational inference.
+        """
+        super(VariationalDistribution, self).__init__()
+        mean_init = torch.zeros(num_inducing_points)
+        stddev_init = torch.ones(num_inducing_points)
+        if batch_size is not None:
+            mean_init = mean_init.repeat(batch_size, 1)
+            stddev_init = stddev_init.repeat(batch_size, 1)
+
+        self.register_parameter(name="variational_mean", parameter=torch.nn.Parameter(mean_init))
+        self.register_parameter(name="variational_stddev", parameter=torch.nn.Parameter(stddev_init))
+
+    def initialize_variational_distribution(self, prior_dist):
+        self.variational_mean.data.copy_(prior_dist.mean)
+        self.variational_stddev.data.copy_(prior_dist.stddev)
+
+    @property
+    def variational_distribution(self):
+        """
+        Return the variational distribution q(u) that this module represents.
+
+        The variational covariance matrix is a :obj:`~gpytorch.lazy.DiagLazyTensor`, whose diagonal is the square of
+        the registered variational standard deviation parameter.
+        """
+        variational_covar = DiagLazyTensor(self.variational_stddev.pow(2))
+        return MultivariateNormal(self.variational_mean, variational_covar)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import torch
+from torch.autograd import Function
+from ..lazy import CholLazyTensor
+from ..distributions import MultivariateNormal
+from ..utils.cholesky import psd_safe_cholesky, triangular_solve
+from .variational_distribution import VariationalDistribution
+
+
+def _triangular_inverse(chol):
+    eye = torch.eye(chol.size(-1), dtype=chol.dtype, device=chol.device)
+    return triangular_solve(eye.expand_as(chol), chol, upper=False)
+
+
+class _NaturalToMeanChol(Function):
+    """
+    Maps the natural parameters :math:`(\\theta_1, \\theta_2) = (S^{-1} m, -\\frac{1}{2} S^{-1})` of a Gaussian to its
+    mean :math:`m` and the Cholesky factor of its covariance :math:`S`.
+
+    The backward pass does not return the gradient with respect to the natural parameters. Instead, it returns the
+    gradient with respect to the expectation parameters :math:`(\\eta_1, \\eta_2) = (m, S + m m^\\top)`, which is the
+    natural gradient with respect to the natural parameters.
+    """
+
+    def forward(self, natural_vec, natural_mat):
+        prec_chol = psd_safe_cholesky(natural_mat.mul(-2))
+        prec_chol_inv = _triangular_inverse(prec_chol)
+        covar = prec_chol_inv.transpose(-1, -2).matmul(prec_chol_inv)
+        mean = covar.matmul(natural_vec.unsqueeze(-1)).squeeze(-1)
+        chol_covar = psd_safe_cholesky(covar)
+
+        self.save_for_backward(mean, covar)
+        return mean, chol_covar
+
+    def backward(self, grad_mean, grad_chol_covar):
+        mean, covar = self.saved_tensors
+
+        # dL / dS, from dL / dchol(S)
+        with torch.enable_grad():
+            covar = covar.detach().requires_grad_(True)
+            grad_covar, = torch.autograd.grad(psd_safe_cholesky(covar), covar, grad_chol_covar)
+        grad_covar = grad_covar.add(grad_covar.transpose(-1, -2)).mul_(0.5)
+
+        # m = eta_1 and S = eta_2 - eta_1 eta_1^T
+        grad_natural_vec = grad_mean - 2 * grad_covar.matmul(mean.unsqueeze(-1)).squeeze(-1)
+        grad_natural_mat = grad_covar
+        return grad_natural_vec, grad_natural_mat
+
+
+class NaturalVariationalDistribution(VariationalDistribution):
+    """
+    A multivariate normal variational distribution q(u) = N(m, S), parameterized by its natural parameters
+    :math:`S^{-1} m` (`natural_vec`) and :math:`-\\frac{1}{2} S^{-1}` (`natural_mat`).
+
+    The gradients of the natural parameters are *natural gradients*, so this distribution is meant to be optimized
+    with :class:`gpytorch.optim.NGD` (while the hyperparameters are optimized with e.g. Adam). With a Gaussian
+    likelihood and a :class:`~gpytorch.variational.VariationalStrategy`, a full-batch step of NGD with a learning rate
+    of 1 moves q(u) to its optimum.
+
+    Example:
+        >>> variational_distribution = gpytorch.variational.NaturalVariationalDistribution(num_inducing)
+        >>> # ... define the model ...
+        >>> variational_optimizer = gpytorch.optim.NGD(
+        >>>     model.variational_strategy.variational_distribution.parameters(), num_data=train_y.size(0), lr=0.1
+        >>> )
+        >>> hyperparameter_optimizer = torch.optim.Adam(model.hyperparameters(), lr=0.01)
+    """
+
+    def __init__(self, num_inducing_points, batch_size=None):
+        """
+        Args:
+            num_inducing_points (int): Size of the variational distribution. This implies that the variational mean
+                should be this size, and the variational covariance matrix should have this many rows and columns.
+            batch_size (int, optional): Specifies an optional batch size for the variational parameters. This is useful
+                for example when doing additive variational inference.
+        """
+        super(VariationalDistribution, self).__init__()
+        natural_vec_init = torch.zeros(num_inducing_points)
+        natural_mat_init = torch.eye(num_inducing_points, num_inducing_points).mul(-0.5)
+        if batch_size is not None:
+            natural_vec_init = natural_vec_init.repeat(batch_size, 1)
+            natural_mat_init = natural_mat_init.repeat(batch_size, 1, 1)
+
+        self.register_parameter(name="natural_vec", parameter=torch.nn.Parameter(natural_vec_init))
+        self.register_parameter(name="natural_mat", parameter=torch.nn.Parameter(natural_mat_init))
+
+    def initialize_variational_distribution(self, prior_dist):
+        prec_chol_inv = _triangular_inverse(prior_dist.scale_tril)
+        prec = prec_chol_inv.transpose(-1, -2).matmul(prec_chol_inv)
+        self.natural_vec.data.copy_(prec.matmul(prior_dist.mean.unsqueeze(-1)).squeeze(-1))
+        self.natural_mat.data.copy_(prec.mul(-0.5))
+
+    @property
+    def variational_distribution(self):
+        """
+        Return the variational distribution q(u) that this module represents, in terms of its mean and (Cholesky
+        factorized) covariance matrix.
+        """
+        mean, chol_covar = _NaturalToMeanChol()(self.natural_vec, self.natural_mat)
+        return MultivariateNormal(mean, CholLazyTensor(chol_covar))
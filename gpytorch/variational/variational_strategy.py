@@ -1,12 +1,26 @@
 #!/usr/bin/env python3
 
+import itertools
 import math
 import torch
 from .. import beta_features, settings
-from ..lazy import DiagLazyTensor, CachedCGLazyTensor, PsdSumLazyTensor, RootLazyTensor
+from ..lazy import (
+    DiagLazyTensor, CachedCGLazyTensor, CholLazyTensor, LazyEvaluatedKernelTensor, PsdSumLazyTensor, RootLazyTensor
+)
 from ..module import Module
 from ..distributions import MultivariateNormal
-from ..utils.memoize import cached
+from ..utils.cholesky import psd_safe_cholesky, triangular_solve
+from ..utils.memoize import cached, is_cached
+
+
+def _is_kernel_covar(covar):
+    # Whether covar is a lazily evaluated (symmetric) kernel matrix, that can be split into blocks
+    return (
+        isinstance(covar, LazyEvaluatedKernelTensor)
+        and covar.batch_dims is None
+        and not covar.params
+        and (covar.x2 is covar.x1 or torch.equal(covar.x2, covar.x1))
+    )
 
 
 class VariationalStrategy(Module):
@@ -62,9 +76,14 @@ class VariationalStrategy(Module):
         this is done simply by calling the user defined GP prior on the inducing point data directly.
         """
         out = self.model.forward(self.inducing_points)
-        res = MultivariateNormal(
-            out.mean, out.lazy_covariance_matrix.add_jitter()
-        )
+        return self._prior_distribution(out)
+
+    def _prior_distribution(self, out):
+        # The prior distribution of the inducing points, given the output of the model's prior on the inducing points
+        induc_induc_covar = out.lazy_covariance_matrix.add_jitter()
+        if self.inducing_points.size(-2) <= settings.max_cholesky_inducing_size.value():
+            induc_induc_covar = CholLazyTensor(psd_safe_cholesky(induc_induc_covar.evaluate()))
+        res = MultivariateNormal(out.mean, induc_induc_covar)
         return res
 
     def kl_divergence(self):
@@ -90,6 +109,39 @@ class VariationalStrategy(Module):
             self.variational_distribution.initialize_variational_distribution(eval_prior_dist)
             self.variational_params_initialized.fill_(1)
 
+    def _prior_terms(self, inducing_points, x):
+        """
+        Computes the prior means at the inducing points and at x, and the (lazy) covariances K_UU, K_UX, and K_XX.
+
+        The prior is evaluated once, on the concatenated inducing points and inputs. If the prior covariance is a
+        lazily evaluated kernel, the blocks are lazily evaluated kernels of their own, so that only the diagonal of
+        K_XX is ever computed (O(m^2 + mb) memory rather than O((m + b)^2)).
+        """
+        num_induc = inducing_points.size(-2)
+        full_inputs = torch.cat([inducing_points, x], dim=-2)
+        full_output = self.model.forward(full_inputs)
+        full_mean, full_covar = full_output.mean, full_output.lazy_covariance_matrix
+        induc_mean, data_mean = full_mean[..., :num_induc], full_mean[..., num_induc:]
+
+        if _is_kernel_covar(full_covar):
+            kernel = full_covar.kernel
+            induc_x, data_x = full_covar.x1[..., :num_induc, :], full_covar.x1[..., num_induc:, :]
+            return (
+                induc_mean,
+                data_mean,
+                LazyEvaluatedKernelTensor(induc_x, induc_x, kernel=kernel),
+                LazyEvaluatedKernelTensor(induc_x, data_x, kernel=kernel),
+                LazyEvaluatedKernelTensor(data_x, data_x, kernel=kernel),
+            )
+
+        return (
+            induc_mean,
+            data_mean,
+            full_covar[..., :num_induc, :num_induc],
+            full_covar[..., :num_induc, num_induc:],
+            full_covar[..., num_induc:, num_induc:],
+        )
+
     def forward(self, x):
         """
         The :func:`~gpytorch.variational.VariationalStrategy.forward` method determines how to marginalize out the
@@ -102,10 +154,16 @@ class VariationalStrategy(Module):
         Returns:
             :obj:`gpytorch.distributions.MultivariateNormal`: The distribution q(f|x)
         """
-        variational_dist = self.variational_distribution.variational_distribution
         inducing_points = self.inducing_points
         if inducing_points.dim() < x.dim():
             inducing_points = inducing_points.expand(*x.shape[:-2], *inducing_points.shape[-2:])
+
+        # In eval mode, we only have to compute the terms that depend on x
+        if not self.training and not torch.equal(x, inducing_points):
+            return self._cached_predictive_distribution(inducing_points, x)
+
+        variational_dist = self.variational_distribution.variational_distribution
+        if self.inducing_points.dim() < x.dim():
             variational_dist = variational_dist.expand(x.shape[:-2])
 
         # If our points equal the inducing points, we're done
@@ -115,49 +173,52 @@ class VariationalStrategy(Module):
         # Otherwise, we have to marginalize
         else:
             num_induc = inducing_points.size(-2)
-            full_inputs = torch.cat([inducing_points, x], dim=-2)
-            full_output = self.model.forward(full_inputs)
-            full_mean, full_covar = full_output.mean, full_output.lazy_covariance_matrix
+            induc_mean, test_mean, induc_induc_covar, induc_data_covar, data_data_covar = self._prior_terms(
+                inducing_points, x
+            )
 
             # Mean terms
-            test_mean = full_mean[..., num_induc:]
-            induc_mean = full_mean[..., :num_induc]
             mean_diff = (variational_dist.mean - induc_mean).unsqueeze(-1)
 
             # Covariance terms
-            induc_induc_covar = full_covar[..., :num_induc, :num_induc].add_jitter()
-            induc_data_covar = full_covar[..., :num_induc, num_induc:].evaluate()
-            data_data_covar = full_covar[..., num_induc:, num_induc:]
+            induc_induc_covar = induc_induc_covar.add_jitter()
+            induc_data_covar = induc_data_covar.evaluate()
             root_variational_covar = variational_dist.lazy_covariance_matrix.root_decomposition().root.evaluate()
 
-            # Cache the CG results
+            left_tensors = torch.cat([mean_diff, root_variational_covar], -1)
+
+            # Factorize K_uu once: the triangular solves are reused by the predictive distribution and the KL divergence
+            if num_induc <= settings.max_cholesky_inducing_size.value():
+                induc_induc_covar = CholLazyTensor(psd_safe_cholesky(induc_induc_covar.evaluate()))
+
+            # Otherwise, cache the CG results
             # For now: run variational inference without a preconditioner
             # The preconditioner screws things up for some reason
-            with settings.max_preconditioner_size(0):
-                # Cache the CG results
-                left_tensors = torch.cat([mean_diff, root_variational_covar], -1)
-                with torch.no_grad():
-                    eager_rhs = torch.cat([left_tensors, induc_data_covar], -1)
-                    solve, probe_vecs, probe_vec_norms, probe_vec_solves, tmats = CachedCGLazyTensor.precompute_terms(
-                        induc_induc_covar, eager_rhs.detach(), logdet_terms=self.training,
-                        include_tmats=(not settings.skip_logdet_forward.on())
+            else:
+                with settings.max_preconditioner_size(0):
+                    with torch.no_grad():
+                        eager_rhs = torch.cat([left_tensors, induc_data_covar], -1)
+                        precomputed_terms = CachedCGLazyTensor.precompute_terms(
+                            induc_induc_covar, eager_rhs.detach(), logdet_terms=self.training,
+                            include_tmats=(not settings.skip_logdet_forward.on())
+                        )
+                        solve, probe_vecs, probe_vec_norms, probe_vec_solves, tmats = precomputed_terms
+                        eager_rhss = [
+                            eager_rhs.detach(), eager_rhs[..., left_tensors.size(-1):].detach(),
+                            eager_rhs[..., :left_tensors.size(-1)].detach()
+                        ]
+                        solves = [
+                            solve.detach(), solve[..., left_tensors.size(-1):].detach(),
+                            solve[..., :left_tensors.size(-1)].detach()
+                        ]
+                        if settings.skip_logdet_forward.on():
+                            eager_rhss.append(torch.cat([probe_vecs, left_tensors], -1))
+                            solves.append(torch.cat([probe_vec_solves, solve[..., :left_tensors.size(-1)]], -1))
+                    induc_induc_covar = CachedCGLazyTensor(
+                        induc_induc_covar, eager_rhss=eager_rhss, solves=solves, probe_vectors=probe_vecs,
+                        probe_vector_norms=probe_vec_norms, probe_vector_solves=probe_vec_solves,
+                        probe_vector_tmats=tmats,
                     )
-                    eager_rhss = [
-                        eager_rhs.detach(), eager_rhs[..., left_tensors.size(-1):].detach(),
-                        eager_rhs[..., :left_tensors.size(-1)].detach()
-                    ]
-                    solves = [
-                        solve.detach(), solve[..., left_tensors.size(-1):].detach(),
-                        solve[..., :left_tensors.size(-1)].detach()
-                    ]
-                    if settings.skip_logdet_forward.on():
-                        eager_rhss.append(torch.cat([probe_vecs, left_tensors], -1))
-                        solves.append(torch.cat([probe_vec_solves, solve[..., :left_tensors.size(-1)]], -1))
-                induc_induc_covar = CachedCGLazyTensor(
-                    induc_induc_covar, eager_rhss=eager_rhss, solves=solves, probe_vectors=probe_vecs,
-                    probe_vector_norms=probe_vec_norms, probe_vector_solves=probe_vec_solves,
-                    probe_vector_tmats=tmats,
-                )
 
             # Compute predictive mean/covariance
             inv_products = induc_induc_covar.inv_matmul(induc_data_covar, left_tensors.transpose(-1, -2))
@@ -167,8 +228,8 @@ class VariationalStrategy(Module):
                 interp_data_data_var, _ = induc_induc_covar.inv_quad_logdet(
                     induc_data_covar, logdet=False, reduce_inv_quad=False
                 )
-                diag_correction = DiagLazyTensor((data_data_covar.diag() - interp_data_data_var).clamp(0, math.inf))
-                predictive_covar = PsdSumLazyTensor(predictive_covar, diag_correction)
+                diag_correction = (data_data_covar.diag() - interp_data_data_var).clamp(0, math.inf)
+                predictive_covar = self._add_diag_correction(predictive_covar, diag_correction)
 
             # Save the logdet, mean_diff_inv_quad, prior distribution for the ELBO
             if self.training:
@@ -176,11 +237,87 @@ class VariationalStrategy(Module):
 
             return MultivariateNormal(predictive_mean, predictive_covar)
 
+    def _add_diag_correction(self, predictive_covar, diag_correction):
+        return PsdSumLazyTensor(predictive_covar, DiagLazyTensor(diag_correction))
+
+    def _cached_covar_root(self, induc_inv_root, root_variational_covar):
+        # K_uu^{-1} R, where S = R R^T is the variational covariance
+        return induc_inv_root.matmul(induc_inv_root.transpose(-1, -2).matmul(root_variational_covar))
+
+    def _predictive_cache(self):
+        """
+        Computes the terms of the predictive distribution that do not depend on the inputs: :math:`K_{UU}^{-1}
+        (m - \\mu_U)`, a root of the predictive covariance (e.g. :math:`K_{UU}^{-1} R` where :math:`S = RR^\\top`),
+        and an inverse root of :math:`K_{UU}` (:math:`L^{-\\top}`, or a Lanczos approximation if there are more than
+        :obj:`gpytorch.settings.max_cholesky_inducing_size` inducing points).
+
+        The cache is reused in eval mode, until the model is put in train mode or its parameters change.
+        Changes are detected with the version counters of the parameters (which in-place operations and
+        :meth:`load_state_dict` update) and with the number of parameters set by :meth:`~gpytorch.Module.initialize`
+        (e.g. `kernel.lengthscale = 2.`). Other changes made through `.data` are not detected.
+        """
+        state = [(tensor, tensor._version) for tensor in itertools.chain(self.model.parameters(), self.model.buffers())]
+        num_initializations = Module._num_initializations
+        if is_cached(self, "predictive_cache_memo"):
+            cached_state, cached_num_initializations, cache = self._memoize_cache["predictive_cache_memo"]
+            if (
+                cached_num_initializations == num_initializations
+                and len(cached_state) == len(state)
+                and all(
+                    cached is tensor and cached_version == version
+                    for (cached, cached_version), (tensor, version) in zip(cached_state, state)
+                )
+            ):
+                return cache
+
+        variational_dist = self.variational_distribution.variational_distribution
+        induc_output = self.model.forward(self.inducing_points)
+        induc_induc_covar = induc_output.lazy_covariance_matrix.add_jitter()
+        mean_diff = (variational_dist.mean - induc_output.mean).unsqueeze(-1)
+        if self.inducing_points.size(-2) <= settings.max_cholesky_inducing_size.value():
+            induc_induc_chol = psd_safe_cholesky(induc_induc_covar.evaluate())
+            eye = torch.eye(induc_induc_chol.size(-1), dtype=induc_induc_chol.dtype, device=induc_induc_chol.device)
+            induc_inv_root = triangular_solve(eye.expand_as(induc_induc_chol), induc_induc_chol, upper=False)
+            induc_inv_root = induc_inv_root.transpose(-1, -2)
+            mean_cache = induc_inv_root.matmul(induc_inv_root.transpose(-1, -2).matmul(mean_diff)).squeeze(-1)
+        else:
+            induc_inv_root = induc_induc_covar.root_inv_decomposition().root.evaluate()
+            mean_cache = induc_induc_covar.inv_matmul(mean_diff).squeeze(-1)
+
+        root_variational_covar = variational_dist.lazy_covariance_matrix.root_decomposition().root.evaluate()
+        covar_root = self._cached_covar_root(induc_inv_root, root_variational_covar)
+
+        cache = (mean_cache, covar_root, induc_inv_root)
+        if settings.detach_test_caches.on():
+            cache = tuple(tensor.detach() for tensor in cache)
+        if not hasattr(self, "_memoize_cache"):
+            self._memoize_cache = dict()
+        self._memoize_cache["predictive_cache_memo"] = (state, num_initializations, cache)
+        return cache
+
+    def _cached_predictive_distribution(self, inducing_points, x):
+        mean_cache, covar_root, induc_inv_root = self._predictive_cache()
+        _, test_mean, _, induc_data_covar, data_data_covar = self._prior_terms(inducing_points, x)
+        data_induc_covar = induc_data_covar.evaluate().transpose(-1, -2)
+
+        predictive_mean = test_mean + data_induc_covar.matmul(mean_cache.unsqueeze(-1)).squeeze(-1)
+        predictive_covar = RootLazyTensor(data_induc_covar.matmul(covar_root))
+        if beta_features.diagonal_correction.on():
+            interp_data_data_var = data_induc_covar.matmul(induc_inv_root).pow(2).sum(-1)
+            diag_correction = (data_data_covar.diag() - interp_data_data_var).clamp(0, math.inf)
+            predictive_covar = self._add_diag_correction(predictive_covar, diag_correction)
+        return MultivariateNormal(predictive_mean, predictive_covar)
+
+    def train(self, mode=True):
+        if is_cached(self, "predictive_cache_memo"):
+            del self._memoize_cache["predictive_cache_memo"]
+        return super(VariationalStrategy, self).train(mode)
+
     def __call__(self, x):
         self.initialize_variational_dist()
         if self.training:
             if hasattr(self, "_memoize_cache"):
                 delattr(self, "_memoize_cache")
-                self._memoize_cache = dict()
+            self._memoize_cache = dict()
 
         return super(VariationalStrategy, self).__call__(x)
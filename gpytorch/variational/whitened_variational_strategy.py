@@ -5,8 +5,11 @@ import torch
 from .. import settings, beta_features
 from .variational_strategy import VariationalStrategy
 from ..utils.memoize import cached
-from ..lazy import RootLazyTensor, MatmulLazyTensor, CachedCGLazyTensor, DiagLazyTensor, BatchRepeatLazyTensor
+from ..lazy import (
+    RootLazyTensor, MatmulLazyTensor, CachedCGLazyTensor, CholLazyTensor, DiagLazyTensor, BatchRepeatLazyTensor
+)
 from ..distributions import MultivariateNormal
+from ..utils.cholesky import psd_safe_cholesky
 
 
 class WhitenedVariationalStrategy(VariationalStrategy):
@@ -18,15 +21,18 @@ class WhitenedVariationalStrategy(VariationalStrategy):
     def covar_trace(self):
         variational_covar = self.variational_distribution.variational_distribution.covariance_matrix
         prior_covar = self.prior_distribution.covariance_matrix
-        batch_shape = prior_covar.shape[:-2]
-        return (variational_covar * prior_covar).view(*batch_shape, -1).sum(-1)
+        # (The prior may have fewer batch dimensions than q(u), e.g. with shared inducing points)
+        return (variational_covar * prior_covar).sum([-1, -2])
 
     @cached(name="mean_diff_inv_quad_memo")
     def mean_diff_inv_quad(self):
         prior_mean = self.prior_distribution.mean
         prior_covar = self.prior_distribution.lazy_covariance_matrix
         variational_mean = self.variational_distribution.variational_distribution.mean
-        return prior_covar.inv_quad(variational_mean - prior_mean)
+        mean_diff = (variational_mean - prior_mean).unsqueeze(-1)
+        if prior_covar.dim() < mean_diff.dim():
+            prior_covar = prior_covar.expand(*mean_diff.shape[:-2], *prior_covar.shape[-2:])
+        return prior_covar.inv_quad(mean_diff)
 
     def kl_divergence(self):
         variational_dist_u = self.variational_distribution.variational_distribution
@@ -65,6 +71,13 @@ class WhitenedVariationalStrategy(VariationalStrategy):
             self.variational_distribution.initialize_variational_distribution(inv_prior_dist)
             self.variational_params_initialized.fill_(1)
 
+    def _add_diag_correction(self, predictive_covar, diag_correction):
+        return DiagLazyTensor(predictive_covar.diag() + diag_correction)
+
+    def _cached_covar_root(self, induc_inv_root, root_variational_covar):
+        # The predictive covariance is K_xu S K_ux, where S = R R^T is the variational covariance
+        return root_variational_covar
+
     def forward(self, x):
         """
         The :func:`~gpytorch.variational.VariationalStrategy.forward` method determines how to marginalize out the
@@ -77,10 +90,16 @@ class WhitenedVariationalStrategy(VariationalStrategy):
         Returns:
             :obj:`gpytorch.distributions.MultivariateNormal`: The distribution q(f|x)
         """
-        variational_dist = self.variational_distribution.variational_distribution
         inducing_points = self.inducing_points
         if inducing_points.dim() < x.dim():
             inducing_points = inducing_points.expand(*x.shape[:-2], *inducing_points.shape[-2:])
+
+        # In eval mode, we only have to compute the terms that depend on x
+        if not self.training and not torch.equal(x, inducing_points):
+            return self._cached_predictive_distribution(inducing_points, x)
+
+        variational_dist = self.variational_distribution.variational_distribution
+        if self.inducing_points.dim() < x.dim():
             variational_dist = variational_dist.expand(x.shape[:-2])
 
         # If our points equal the inducing points, we're done
@@ -103,49 +122,52 @@ class WhitenedVariationalStrategy(VariationalStrategy):
         # Otherwise, we have to marginalize
         else:
             num_induc = inducing_points.size(-2)
-            full_inputs = torch.cat([inducing_points, x], dim=-2)
-            full_output = self.model.forward(full_inputs)
-            full_mean, full_covar = full_output.mean, full_output.lazy_covariance_matrix
+            induc_mean, test_mean, induc_induc_covar, induc_data_covar, data_data_covar = self._prior_terms(
+                inducing_points, x
+            )
 
             # Mean terms
-            test_mean = full_mean[..., num_induc:]
-            induc_mean = full_mean[..., :num_induc]
             mean_diff = (variational_dist.mean - induc_mean).unsqueeze(-1)
 
             # Covariance terms
-            induc_induc_covar = full_covar[..., :num_induc, :num_induc].add_jitter()
-            induc_data_covar = full_covar[..., :num_induc, num_induc:].evaluate()
-            data_data_covar = full_covar[..., num_induc:, num_induc:]
+            induc_induc_covar = induc_induc_covar.add_jitter()
+            induc_data_covar = induc_data_covar.evaluate()
+
+            # Factorize K_uu once: the triangular solves are reused by the predictive distribution and the KL divergence
+            if num_induc <= settings.max_cholesky_inducing_size.value():
+                induc_induc_covar = CholLazyTensor(psd_safe_cholesky(induc_induc_covar.evaluate()))
 
-            # Cache the CG results
+            # Otherwise, cache the CG results
             # Do not use preconditioning for whitened VI, as it does not seem to improve performance.
-            with settings.max_preconditioner_size(0):
-                with torch.no_grad():
-                    eager_rhs = torch.cat([induc_data_covar, mean_diff], -1)
-                    solve, probe_vecs, probe_vec_norms, probe_vec_solves, tmats = CachedCGLazyTensor.precompute_terms(
+            else:
+                with settings.max_preconditioner_size(0):
+                    with torch.no_grad():
+                        eager_rhs = torch.cat([induc_data_covar, mean_diff], -1)
+                        precomputed_terms = CachedCGLazyTensor.precompute_terms(
+                            induc_induc_covar,
+                            eager_rhs.detach(),
+                            logdet_terms=self.training,
+                            include_tmats=(not settings.skip_logdet_forward.on()),
+                        )
+                        solve, probe_vecs, probe_vec_norms, probe_vec_solves, tmats = precomputed_terms
+                        eager_rhss = [eager_rhs.detach()]
+                        solves = [solve.detach()]
+                        if settings.skip_logdet_forward.on() and self.training:
+                            eager_rhss.append(torch.cat([probe_vecs, eager_rhs], -1))
+                            solves.append(torch.cat([probe_vec_solves, solve[..., : eager_rhs.size(-1)]], -1))
+                        elif not self.training:
+                            eager_rhss.append(eager_rhs[..., :-1])
+                            solves.append(solve[..., :-1])
+
+                    induc_induc_covar = CachedCGLazyTensor(
                         induc_induc_covar,
-                        eager_rhs.detach(),
-                        logdet_terms=self.training,
-                        include_tmats=(not settings.skip_logdet_forward.on()),
+                        eager_rhss=eager_rhss,
+                        solves=solves,
+                        probe_vectors=probe_vecs,
+                        probe_vector_norms=probe_vec_norms,
+                        probe_vector_solves=probe_vec_solves,
+                        probe_vector_tmats=tmats,
                     )
-                    eager_rhss = [eager_rhs.detach()]
-                    solves = [solve.detach()]
-                    if settings.skip_logdet_forward.on() and self.training:
-                        eager_rhss.append(torch.cat([probe_vecs, eager_rhs], -1))
-                        solves.append(torch.cat([probe_vec_solves, solve[..., : eager_rhs.size(-1)]], -1))
-                    elif not self.training:
-                        eager_rhss.append(eager_rhs[..., :-1])
-                        solves.append(solve[..., :-1])
-
-                induc_induc_covar = CachedCGLazyTensor(
-                    induc_induc_covar,
-                    eager_rhss=eager_rhss,
-                    solves=solves,
-                    probe_vectors=probe_vecs,
-                    probe_vector_norms=probe_vec_norms,
-                    probe_vector_solves=probe_vec_solves,
-                    probe_vector_tmats=tmats,
-                )
 
             # Compute some terms that will be necessary for the predicitve covariance and KL divergence
             if self.training:
@@ -179,12 +201,12 @@ class WhitenedVariationalStrategy(VariationalStrategy):
                 )
             else:
                 predictive_covar = MatmulLazyTensor(
-                    induc_data_covar.transpose(-1, -2), predictive_covar @ induc_data_covar
+                    induc_data_covar.transpose(-1, -2), variational_dist.lazy_covariance_matrix @ induc_data_covar
                 )
 
             if beta_features.diagonal_correction.on():
                 diag_correction = (data_data_covar.diag() - interp_data_data_var).clamp(0, math.inf)
-                predictive_covar = DiagLazyTensor(predictive_covar.diag() + diag_correction)
+                predictive_covar = self._add_diag_correction(predictive_covar, diag_correction)
 
             # Save the logdet, mean_diff_inv_quad, prior distribution for the ELBO
             if self.training:
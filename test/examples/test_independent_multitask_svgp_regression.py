@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import unittest
+from math import pi
+
+import gpytorch
+import torch
+from gpytorch.likelihoods import MultitaskGaussianLikelihood
+from gpytorch.models import AbstractVariationalGP
+from gpytorch.variational import (
+    CholeskyVariationalDistribution,
+    IndependentMultitaskVariationalStrategy,
+    VariationalStrategy,
+    WhitenedVariationalStrategy,
+)
+from torch import optim
+
+
+def train_data():
+    train_x = torch.linspace(0, 1, 100)
+    train_y = torch.stack(
+        [
+            torch.sin(train_x * (2 * pi)) + 0.01 * torch.randn(100),
+            torch.cos(train_x * (2 * pi)) + 0.01 * torch.randn(100),
+            torch.cos(train_x * pi) + 0.01 * torch.randn(100),
+        ],
+        -1,
+    )
+    return train_x, train_y
+
+
+class MultitaskSVGPModel(AbstractVariationalGP):
+    def __init__(self, inducing_points, num_tasks, strategy_cls=VariationalStrategy, batch_hypers=False):
+        variational_distribution = CholeskyVariationalDistribution(inducing_points.size(-2), batch_size=num_tasks)
+        variational_strategy = IndependentMultitaskVariationalStrategy(
+            strategy_cls(self, inducing_points, variational_distribution, learn_inducing_locations=True),
+            num_tasks=num_tasks,
+        )
+        super(MultitaskSVGPModel, self).__init__(variational_strategy)
+        if batch_hypers:
+            self.mean_module = gpytorch.means.ConstantMean(batch_size=num_tasks)
+            self.covar_module = gpytorch.kernels.ScaleKernel(
+                gpytorch.kernels.RBFKernel(batch_size=num_tasks), batch_size=num_tasks
+            )
+        else:
+            self.mean_module = gpytorch.means.ConstantMean()
+            self.covar_module = gpytorch.kernels.ScaleKernel(gpytorch.kernels.RBFKernel())
+
+    def forward(self, x):
+        mean_x = self.mean_module(x)
+        covar_x = self.covar_module(x)
+        return gpytorch.distributions.MultivariateNormal(mean_x, covar_x)
+
+
+class SVGPModel(AbstractVariationalGP):
+    def __init__(self, inducing_points, strategy_cls=VariationalStrategy):
+        variational_distribution = CholeskyVariationalDistribution(inducing_points.size(-2))
+        variational_strategy = strategy_cls(
+            self, inducing_points, variational_distribution, learn_inducing_locations=True
+        )
+        super(SVGPModel, self).__init__(variational_strategy)
+        self.mean_module = gpytorch.means.ConstantMean()
+        self.covar_module = gpytorch.kernels.ScaleKernel(gpytorch.kernels.RBFKernel())
+
+    def forward(self, x):
+        mean_x = self.mean_module(x)
+        covar_x = self.covar_module(x)
+        return gpytorch.distributions.MultivariateNormal(mean_x, covar_x)
+
+
+class TestIndependentMultitaskSVGPRegression(unittest.TestCase):
+    def setUp(self):
+        if os.getenv("UNLOCK_SEED") is None or os.getenv("UNLOCK_SEED").lower() == "false":
+            self.rng_state = torch.get_rng_state()
+            torch.manual_seed(0)
+            if torch.cuda.is_available():
+                torch.cuda.manual_seed_all(0)
+            random.seed(0)
+
+    def tearDown(self):
+        if hasattr(self, "rng_state"):
+            torch.set_rng_state(self.rng_state)
+
+    def _test_regression_error(self, inducing_points, **kwargs):
+        train_x, train_y = train_data()
+        likelihood = MultitaskGaussianLikelihood(num_tasks=3)
+        model = MultitaskSVGPModel(inducing_points, num_tasks=3, **kwargs)
+        mll = gpytorch.mlls.VariationalELBO(likelihood, model, num_data=train_y.size(0))
+
+        model.train()
+        likelihood.train()
+        optimizer = optim.Adam([{"params": model.parameters()}, {"params": likelihood.parameters()}], lr=0.05)
+        for _ in range(150):
+            optimizer.zero_grad()
+            output = model(train_x)
+            self.assertIsInstance(output, gpytorch.distributions.MultitaskMultivariateNormal)
+            loss = -mll(output, train_y)
+            self.assertEqual(loss.dim(), 0)
+            loss.backward()
+            optimizer.step()
+
+        for param in model.parameters():
+            self.assertTrue(param.grad is not None)
+            self.assertGreater(param.grad.norm().item(), 0)
+
+        model.eval()
+        likelihood.eval()
+        with torch.no_grad():
+            test_preds = model(train_x).mean
+        self.assertEqual(test_preds.shape, torch.Size([100, 3]))
+        mean_abs_error = torch.mean(torch.abs(train_y - test_preds))
+        self.assertLess(mean_abs_error.item(), 0.1)
+
+    def test_regression_error_shared_inducing_points(self):
+        self._test_regression_error(torch.linspace(0, 1, 16).unsqueeze(-1))
+
+    def test_regression_error_per_task_inducing_points(self):
+        inducing_points = torch.linspace(0, 1, 16).unsqueeze(-1).repeat(3, 1, 1)
+        self._test_regression_error(inducing_points, batch_hypers=True)
+
+    def test_regression_error_whitened(self):
+        self._test_regression_error(torch.linspace(0, 1, 16).unsqueeze(-1), strategy_cls=WhitenedVariationalStrategy)
+
+    def test_elbo_sums_over_tasks(self):
+        train_x, train_y = train_data()
+        likelihood = MultitaskGaussianLikelihood(num_tasks=3)
+        model = MultitaskSVGPModel(torch.linspace(0, 1, 16).unsqueeze(-1), num_tasks=3)
+        model.train()
+        likelihood.train()
+
+        output = model(train_x)
+        mll = gpytorch.mlls.VariationalELBO(likelihood, model, num_data=train_y.size(0), combine_terms=False)
+        log_likelihood, kl_divergence, _ = mll(output, train_y)
+
+        # Compare against the ELBOs of each of the outputs
+        base_output = model.variational_strategy.base_variational_strategy(train_x.unsqueeze(-1).repeat(3, 1, 1))
+        noise = likelihood.noise + likelihood.noise_covar.noise
+        expected_log_likelihood = torch.distributions.Normal(base_output.mean, (noise.view(3, 1)).sqrt()).log_prob(
+            train_y.t()
+        ) - 0.5 * base_output.variance / noise.view(3, 1)
+        expected_kl_divergence = model.variational_strategy.base_variational_strategy.kl_divergence()
+        self.assertEqual(expected_kl_divergence.shape, torch.Size([3]))
+        self.assertAlmostEqual(log_likelihood.item(), expected_log_likelihood.sum().item() / 100, places=3)
+        self.assertAlmostEqual(kl_divergence.item(), expected_kl_divergence.sum().item() / 100, places=4)
+
+    def test_kl_divergence_sums_over_tasks(self):
+        for strategy_cls in (VariationalStrategy, WhitenedVariationalStrategy):
+            inducing_points = torch.linspace(0, 1, 16).unsqueeze(-1)
+            model = MultitaskSVGPModel(inducing_points, num_tasks=3, strategy_cls=strategy_cls)
+            base_variational_strategy = model.variational_strategy.base_variational_strategy
+            base_variational_strategy.initialize_variational_dist()
+            variational_distribution = base_variational_strategy.variational_distribution
+            variational_distribution.variational_mean.data.normal_()
+            variational_distribution.chol_variational_covar.data.add_(
+                torch.randn_like(variational_distribution.chol_variational_covar).mul_(0.1)
+            )
+            model.train()
+
+            # Compare against the KL divergences of single-output models, with the same (shared) prior
+            expected_kl_divergences = []
+            for i in range(3):
+                task_model = SVGPModel(inducing_points, strategy_cls=strategy_cls)
+                task_model.train()
+                task_variational_strategy = task_model.variational_strategy
+                task_variational_strategy.variational_params_initialized.fill_(1)
+                task_variational_distribution = task_variational_strategy.variational_distribution
+                task_variational_distribution.variational_mean.data.copy_(variational_distribution.variational_mean[i])
+                task_variational_distribution.chol_variational_covar.data.copy_(
+                    variational_distribution.chol_variational_covar[i]
+                )
+                expected_kl_divergences.append(task_variational_strategy.kl_divergence())
+            expected_kl_divergences = torch.stack(expected_kl_divergences)
+
+            kl_divergences = base_variational_strategy.kl_divergence()
+            self.assertEqual(kl_divergences.shape, torch.Size([3]))
+            self.assertLess(((kl_divergences - expected_kl_divergences) / expected_kl_divergences).abs().max(), 1e-4)
+            kl_divergence = model.variational_strategy.kl_divergence()
+            self.assertLess(abs(kl_divergence.item() / expected_kl_divergences.sum().item() - 1), 1e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+from math import pi
+
+import os
+import random
+import torch
+import unittest
+import gpytorch
+from gpytorch.kernels import GridKernel, RBFKernel, ScaleKernel
+from gpytorch.likelihoods import GaussianLikelihood
+from gpytorch.means import ConstantMean
+from gpytorch.distributions import MultivariateNormal
+
+
+# Simple training data: a product of sinusoids on the unit square
+def make_data():
+    train_x = torch.rand(500, 2)
+    train_y = torch.sin(train_x[:, 0] * (2 * pi)) * torch.cos(train_x[:, 1] * pi) + torch.randn(500) * 0.05
+    test_x = torch.rand(100, 2)
+    test_y = torch.sin(test_x[:, 0] * (2 * pi)) * torch.cos(test_x[:, 1] * pi)
+    return train_x, train_y, test_x, test_y
+
+
+class GPRegressionModel(gpytorch.models.AbstractVariationalGP):
+    def __init__(self, grid_size=20, grid_bounds=[(0, 1), (0, 1)], kronecker=True):
+        if kronecker:
+            variational_distribution = gpytorch.variational.KroneckerVariationalDistribution(
+                grid_size=grid_size, num_dim=len(grid_bounds)
+            )
+        else:
+            variational_distribution = gpytorch.variational.CholeskyVariationalDistribution(
+                num_inducing_points=int(pow(grid_size, len(grid_bounds)))
+            )
+        variational_strategy = gpytorch.variational.GridInterpolationVariationalStrategy(
+            self, grid_size=grid_size, grid_bounds=grid_bounds, variational_distribution=variational_distribution
+        )
+        super(GPRegressionModel, self).__init__(variational_strategy)
+        self.mean_module = ConstantMean()
+        self.covar_module = ScaleKernel(GridKernel(RBFKernel(ard_num_dims=2), variational_strategy.grid))
+
+    def forward(self, x):
+        mean_x = self.mean_module(x)
+        covar_x = self.covar_module(x)
+        return MultivariateNormal(mean_x, covar_x)
+
+
+class TestKISSGPKroneckerVariationalRegression(unittest.TestCase):
+    def setUp(self):
+        if os.getenv("UNLOCK_SEED") is None or os.getenv("UNLOCK_SEED").lower() == "false":
+            self.rng_state = torch.get_rng_state()
+            torch.manual_seed(0)
+            if torch.cuda.is_available():
+                torch.cuda.manual_seed_all(0)
+            random.seed(0)
+
+    def tearDown(self):
+        if hasattr(self, "rng_state"):
+            torch.set_rng_state(self.rng_state)
+
+    def test_kl_divergence_matches_dense_kl_divergence(self):
+        model = GPRegressionModel(grid_size=6).double()
+        model.covar_module.base_kernel.base_kernel.lengthscale = torch.tensor([[0.3, 0.5]])
+        model.covar_module.outputscale = 2.0
+        variational_strategy = model.variational_strategy
+        variational_strategy.initialize_variational_dist()
+        for param in variational_strategy.variational_distribution.parameters():
+            param.data.add_(torch.randn_like(param).mul_(0.1))
+
+        prior_dist = variational_strategy.prior_distribution
+        variational_dist = variational_strategy.variational_distribution.variational_distribution
+        # Neither covariance matrix is formed explicitly
+        self.assertIsInstance(prior_dist.lazy_covariance_matrix, gpytorch.lazy.KroneckerProductLazyTensor)
+        self.assertIsInstance(variational_dist.lazy_covariance_matrix, gpytorch.lazy.KroneckerProductLazyTensor)
+
+        kl_divergence = variational_strategy.kl_divergence()
+        dense_kl_divergence = torch.distributions.kl.kl_divergence(
+            torch.distributions.MultivariateNormal(variational_dist.mean, variational_dist.covariance_matrix),
+            torch.distributions.MultivariateNormal(prior_dist.mean, prior_dist.covariance_matrix),
+        )
+        self.assertLess(abs(kl_divergence.item() - dense_kl_divergence.item()), 1e-6)
+
+        kl_divergence.backward()
+        for param in model.parameters():
+            if param.requires_grad and param is not model.mean_module.constant:
+                self.assertIsNotNone(param.grad)
+                self.assertFalse(torch.isnan(param.grad).any())
+
+    def test_kissgp_gp_mean_abs_error(self):
+        train_x, train_y, test_x, test_y = make_data()
+
+        model = GPRegressionModel()
+        likelihood = GaussianLikelihood()
+        # 20 x 20 grid, but only 400 + 2 * 20 * 20 variational parameters
+        self.assertEqual(sum(p.numel() for p in model.variational_strategy.variational_distribution.parameters()), 1200)
+
+        mll = gpytorch.mlls.VariationalELBO(likelihood, model, num_data=train_y.size(0))
+        optimizer = torch.optim.Adam([{"params": model.parameters()}, {"params": likelihood.parameters()}], lr=0.1)
+
+        # The (unwhitened) variational mean is poorly conditioned w.r.t. the KL divergence for this fine grid.
+        # A larger jitter on each Kronecker factor of the prior makes the optimization much better conditioned
+        model.train()
+        likelihood.train()
+        with gpytorch.settings.kronecker_prior_jitter(3e-2):
+            for _ in range(75):
+                optimizer.zero_grad()
+                output = model(train_x)
+                loss = -mll(output, train_y)
+                loss.backward()
+                optimizer.step()
+
+        for param in model.parameters():
+            self.assertTrue(param.grad is not None)
+            self.assertGreater(param.grad.norm().item(), 0)
+
+        # Test the model
+        model.eval()
+        likelihood.eval()
+        with torch.no_grad():
+            test_preds = likelihood(model(test_x)).mean
+            mean_abs_error = torch.mean(torch.abs(test_y - test_preds))
+        self.assertLess(mean_abs_error.squeeze().item(), 0.1)
+
+    def test_cholesky_variational_distribution_keeps_dense_prior(self):
+        model = GPRegressionModel(grid_size=6, kronecker=False)
+        model_forward = model.forward
+        num_forward_calls = []
+        model.forward = lambda x: num_forward_calls.append(x) or model_forward(x)
+        prior_covar = model.variational_strategy.prior_distribution.lazy_covariance_matrix
+        self.assertNotIsInstance(prior_covar, gpytorch.lazy.KroneckerProductLazyTensor)
+        # The prior is only evaluated once
+        self.assertEqual(len(num_forward_calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
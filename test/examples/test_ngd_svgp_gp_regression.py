@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import unittest
+from math import pi
+
+import gpytorch
+import torch
+from gpytorch.likelihoods import GaussianLikelihood
+from gpytorch.models import AbstractVariationalGP
+from gpytorch.variational import NaturalVariationalDistribution, VariationalStrategy
+from torch import optim
+
+
+def train_data(cuda=False):
+    train_x = torch.linspace(0, 1, 260)
+    train_y = torch.cos(train_x * (2 * pi))
+    if cuda:
+        return train_x.cuda(), train_y.cuda()
+    else:
+        return train_x, train_y
+
+
+class NGDSVGPRegressionModel(AbstractVariationalGP):
+    def __init__(self, inducing_points, batch_size=None):
+        variational_distribution = NaturalVariationalDistribution(inducing_points.size(-2), batch_size=batch_size)
+        variational_strategy = VariationalStrategy(self, inducing_points, variational_distribution)
+        super(NGDSVGPRegressionModel, self).__init__(variational_strategy)
+        self.mean_module = gpytorch.means.ConstantMean()
+        self.covar_module = gpytorch.kernels.ScaleKernel(gpytorch.kernels.RBFKernel())
+
+    def forward(self, x):
+        mean_x = self.mean_module(x)
+        covar_x = self.covar_module(x)
+        latent_pred = gpytorch.distributions.MultivariateNormal(mean_x, covar_x)
+        return latent_pred
+
+
+class TestNGDSVGPRegression(unittest.TestCase):
+    def setUp(self):
+        if os.getenv("UNLOCK_SEED") is None or os.getenv("UNLOCK_SEED").lower() == "false":
+            self.rng_state = torch.get_rng_state()
+            torch.manual_seed(0)
+            if torch.cuda.is_available():
+                torch.cuda.manual_seed_all(0)
+            random.seed(0)
+
+    def tearDown(self):
+        if hasattr(self, "rng_state"):
+            torch.set_rng_state(self.rng_state)
+
+    def test_one_step_optimum(self):
+        train_x, train_y = train_data()
+        train_y = train_y + torch.randn_like(train_y).mul_(0.1)
+        likelihood = GaussianLikelihood()
+        model = NGDSVGPRegressionModel(torch.linspace(0, 1, 10).unsqueeze(-1))
+        mll = gpytorch.mlls.VariationalELBO(likelihood, model, num_data=len(train_y))
+        variational_distribution = model.variational_strategy.variational_distribution
+        optimizer = gpytorch.optim.NGD(variational_distribution.parameters(), num_data=len(train_y), lr=1.)
+
+        model.train()
+        likelihood.train()
+        losses = []
+        for _ in range(3):
+            optimizer.zero_grad()
+            loss = -mll(model(train_x), train_y)
+            loss.backward()
+            optimizer.step()
+            losses.append(loss.item())
+        self.assertLess(losses[1], losses[0])
+        self.assertAlmostEqual(losses[1], losses[2], places=4)
+
+        # At the optimum, the natural gradient vanishes
+        self.assertLess(variational_distribution.natural_vec.grad.abs().max().item(), 1e-3)
+        self.assertLess(variational_distribution.natural_mat.grad.abs().max().item(), 1e-3)
+
+    def test_regression_error(self):
+        train_x, train_y = train_data()
+        likelihood = GaussianLikelihood()
+        model = NGDSVGPRegressionModel(torch.linspace(0, 1, 25).unsqueeze(-1))
+        mll = gpytorch.mlls.VariationalELBO(likelihood, model, num_data=len(train_y))
+
+        # Find optimal model hyperparameters
+        model.train()
+        likelihood.train()
+        variational_optimizer = gpytorch.optim.NGD(
+            model.variational_strategy.variational_distribution.parameters(), num_data=len(train_y), lr=0.5
+        )
+        hyperparameter_optimizer = optim.Adam(
+            [{"params": model.hyperparameters()}, {"params": likelihood.parameters()}], lr=0.1
+        )
+        for _ in range(50):
+            variational_optimizer.zero_grad()
+            hyperparameter_optimizer.zero_grad()
+            output = model(train_x)
+            loss = -mll(output, train_y)
+            loss.backward()
+            variational_optimizer.step()
+            hyperparameter_optimizer.step()
+
+        for param in model.parameters():
+            self.assertTrue(param.grad is not None)
+            self.assertGreater(param.grad.norm().item(), 0)
+
+        # Set back to eval mode
+        model.eval()
+        likelihood.eval()
+        test_preds = likelihood(model(train_x)).mean.squeeze()
+        mean_abs_error = torch.mean(torch.abs(train_y - test_preds) / 2)
+        self.assertLess(mean_abs_error.item(), 1e-1)
+
+    def test_batch_natural_parameters(self):
+        variational_distribution = NaturalVariationalDistribution(4, batch_size=2)
+        mean = torch.randn(2, 4)
+        covar = torch.randn(2, 4, 4)
+        covar = covar @ covar.transpose(-1, -2) + torch.eye(4)
+        variational_distribution.initialize_variational_distribution(
+            torch.distributions.MultivariateNormal(mean, covar)
+        )
+        dist = variational_distribution.variational_distribution
+        self.assertLess((dist.mean - mean).abs().max().item(), 1e-3)
+        self.assertLess((dist.covariance_matrix - covar).abs().max().item(), 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import unittest
+from math import pi
+
+import gpytorch
+import torch
+from gpytorch.likelihoods import GaussianLikelihood
+from gpytorch.models import AbstractVariationalGP
+from gpytorch.variational import (
+    LowRankPlusDiagVariationalDistribution,
+    MeanFieldVariationalDistribution,
+    VariationalStrategy,
+    WhitenedVariationalStrategy,
+)
+from torch import optim
+
+
+def train_data(cuda=False):
+    train_x = torch.linspace(0, 1, 260)
+    train_y = torch.cos(train_x * (2 * pi))
+    if cuda:
+        return train_x.cuda(), train_y.cuda()
+    else:
+        return train_x, train_y
+
+
+class SVGPRegressionModel(AbstractVariationalGP):
+    def __init__(self, inducing_points, variational_distribution, strategy_cls):
+        variational_strategy = strategy_cls(self, inducing_points, variational_distribution)
+        super(SVGPRegressionModel, self).__init__(variational_strategy)
+        self.mean_module = gpytorch.means.ConstantMean()
+        self.covar_module = gpytorch.kernels.ScaleKernel(gpytorch.kernels.RBFKernel())
+
+    def forward(self, x):
+        mean_x = self.mean_module(x)
+        covar_x = self.covar_module(x)
+        latent_pred = gpytorch.distributions.MultivariateNormal(mean_x, covar_x)
+        return latent_pred
+
+
+class TestScalableSVGPRegression(unittest.TestCase):
+    def setUp(self):
+        if os.getenv("UNLOCK_SEED") is None or os.getenv("UNLOCK_SEED").lower() == "false":
+            self.rng_state = torch.get_rng_state()
+            torch.manual_seed(0)
+            if torch.cuda.is_available():
+                torch.cuda.manual_seed_all(0)
+            random.seed(0)
+
+    def tearDown(self):
+        if hasattr(self, "rng_state"):
+            torch.set_rng_state(self.rng_state)
+
+    def _test_regression_error(self, variational_distribution, strategy_cls):
+        train_x, train_y = train_data()
+        likelihood = GaussianLikelihood()
+        model = SVGPRegressionModel(torch.linspace(0, 1, 25).unsqueeze(-1), variational_distribution, strategy_cls)
+        mll = gpytorch.mlls.VariationalELBO(likelihood, model, num_data=len(train_y))
+
+        # Find optimal model hyperparameters
+        model.train()
+        likelihood.train()
+        optimizer = optim.Adam([{"params": model.parameters()}, {"params": likelihood.parameters()}], lr=0.05)
+        for _ in range(150):
+            optimizer.zero_grad()
+            output = model(train_x)
+            loss = -mll(output, train_y)
+            loss.backward()
+            optimizer.step()
+
+        for param in model.parameters():
+            self.assertTrue(param.grad is not None)
+            self.assertGreater(param.grad.norm().item(), 0)
+
+        # Set back to eval mode
+        model.eval()
+        likelihood.eval()
+        with torch.no_grad():
+            test_preds = likelihood(model(train_x)).mean.squeeze()
+        mean_abs_error = torch.mean(torch.abs(train_y - test_preds) / 2)
+        self.assertLess(mean_abs_error.item(), 1e-1)
+
+    def test_mean_field_regression_error(self):
+        self._test_regression_error(MeanFieldVariationalDistribution(25), VariationalStrategy)
+
+    def test_mean_field_whitened_regression_error(self):
+        self._test_regression_error(MeanFieldVariationalDistribution(25), WhitenedVariationalStrategy)
+
+    def test_low_rank_plus_diag_regression_error(self):
+        self._test_regression_error(LowRankPlusDiagVariationalDistribution(25, rank=3), VariationalStrategy)
+
+    def test_low_rank_plus_diag_whitened_regression_error(self):
+        self._test_regression_error(LowRankPlusDiagVariationalDistribution(25, rank=3), WhitenedVariationalStrategy)
+
+    def test_kl_divergence(self):
+        variational_distribution = LowRankPlusDiagVariationalDistribution(25, rank=3)
+        inducing_points = torch.linspace(0, 1, 25).unsqueeze(-1)
+        model = SVGPRegressionModel(inducing_points, variational_distribution, VariationalStrategy)
+        variational_distribution.variational_mean.data.normal_()
+        variational_distribution.variational_cov_factor.data.normal_()
+        variational_distribution.variational_stddev.data.uniform_(0.5, 1.5)
+        model.variational_strategy.variational_params_initialized.fill_(1)
+
+        variational_dist = variational_distribution.variational_distribution
+        prior_dist = model.variational_strategy.prior_distribution
+        dense_kl = torch.distributions.kl.kl_divergence(
+            torch.distributions.MultivariateNormal(variational_dist.mean, variational_dist.covariance_matrix),
+            torch.distributions.MultivariateNormal(prior_dist.mean, prior_dist.covariance_matrix),
+        )
+        kl = model.variational_strategy.kl_divergence()
+        self.assertLess(((kl - dense_kl) / dense_kl).abs().item(), 1e-3)
+
+    def test_batch_variational_distributions(self):
+        mean_field = MeanFieldVariationalDistribution(5, batch_size=3)
+        low_rank = LowRankPlusDiagVariationalDistribution(5, rank=2, batch_size=3)
+        self.assertEqual(mean_field.variational_distribution.covariance_matrix.shape, torch.Size([3, 5, 5]))
+        self.assertEqual(low_rank.variational_distribution.covariance_matrix.shape, torch.Size([3, 5, 5]))
+        self.assertEqual(sum(p.numel() for p in low_rank.parameters()), 3 * (5 + 5 * 2 + 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -94,6 +94,24 @@ class TestSGPRRegression(unittest.TestCase):
 
         self.assertLess(mean_abs_error.squeeze().item(), 0.05)
 
+    def test_sgpr_mll_is_exact(self):
+        train_x, train_y, test_x, test_y = make_data()
+        likelihood = GaussianLikelihood()
+        gp_model = GPRegressionModel(train_x, train_y, likelihood)
+        gp_model.train()
+        likelihood.train()
+
+        # The noisy kernel matrix keeps its low-rank plus diagonal structure, so the MLL is computed with the
+        # Woodbury identity rather than with CG and Lanczos
+        output = likelihood(gp_model(train_x))
+        self.assertIsInstance(output.lazy_covariance_matrix, gpytorch.lazy.LowRankRootAddedDiagLazyTensor)
+
+        res = output.log_prob(train_y)
+        actual = torch.distributions.MultivariateNormal(
+            output.mean.double(), output.covariance_matrix.double()
+        ).log_prob(train_y.double())
+        self.assertLess(abs(res.item() - actual.item()), 1e-3)
+
     def test_sgpr_fast_pred_var(self):
         train_x, train_y, test_x, test_y = make_data()
         likelihood = GaussianLikelihood()
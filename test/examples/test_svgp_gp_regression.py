@@ -3,11 +3,13 @@
 import os
 import random
 import unittest
+from unittest import mock
 from math import pi
 from test._utils import least_used_cuda_device
 
 import gpytorch
 import torch
+from gpytorch.lazy import LazyEvaluatedKernelTensor, delazify
 from gpytorch.likelihoods import GaussianLikelihood
 from gpytorch.models import AbstractVariationalGP
 from gpytorch.variational import CholeskyVariationalDistribution, VariationalStrategy
@@ -42,6 +44,12 @@ class SVGPRegressionModel(AbstractVariationalGP):
         return latent_pred
 
 
+class ScaledSVGPRegressionModel(SVGPRegressionModel):
+    def forward(self, x):
+        latent_pred = super(ScaledSVGPRegressionModel, self).forward(x)
+        return gpytorch.distributions.MultivariateNormal(latent_pred.mean, latent_pred.lazy_covariance_matrix * 1.)
+
+
 class TestSVGPRegression(unittest.TestCase):
     def setUp(self):
         if os.getenv("UNLOCK_SEED") is None or os.getenv("UNLOCK_SEED").lower() == "false":
@@ -90,6 +98,133 @@ class TestSVGPRegression(unittest.TestCase):
     def test_regression_error_skip_logdet_forward(self):
         return self.test_regression_error(skip_logdet_forward=True)
 
+    def test_regression_error_cg(self):
+        with gpytorch.settings.max_cholesky_inducing_size(0):
+            return self.test_regression_error()
+
+    def test_cholesky_predictions(self):
+        train_x, train_y = train_data()
+        model = SVGPRegressionModel(torch.linspace(0, 1, 25))
+        variational_strategy = model.variational_strategy
+        variational_strategy.initialize_variational_dist()
+        variational_strategy.variational_distribution.variational_mean.data.normal_()
+
+        model.train()
+        model(train_x)
+        kl_divergence = variational_strategy.kl_divergence()
+        model.eval()
+        with torch.no_grad():
+            output = model(train_x)
+
+        # Compare against dense computations
+        with torch.no_grad():
+            inducing_points = variational_strategy.inducing_points
+            induc_induc_covar = model.covar_module(inducing_points).add_jitter().evaluate().double()
+            data_induc_covar = model.covar_module(train_x.unsqueeze(-1), inducing_points).evaluate().double()
+            variational_dist = variational_strategy.variational_distribution.variational_distribution
+            prior_mean = model.mean_module(inducing_points).double()
+            interp_term = data_induc_covar @ induc_induc_covar.inverse()
+            actual_mean = model.mean_module(train_x.unsqueeze(-1)).double() + interp_term.matmul(
+                variational_dist.mean.double() - prior_mean
+            )
+            actual_kl_divergence = torch.distributions.kl.kl_divergence(
+                torch.distributions.MultivariateNormal(
+                    variational_dist.mean.double(), variational_dist.covariance_matrix.double()
+                ),
+                torch.distributions.MultivariateNormal(prior_mean, induc_induc_covar),
+            )
+        self.assertLess((output.mean.double() - actual_mean).abs().max().item(), 1e-3)
+        self.assertLess(abs(kl_divergence.item() - actual_kl_divergence.item()) / actual_kl_divergence.item(), 1e-3)
+
+    def test_prior_terms(self):
+        train_x, train_y = train_data()
+        model = SVGPRegressionModel(torch.linspace(0, 1, 25))
+        concat_model = ScaledSVGPRegressionModel(torch.linspace(0, 1, 25))
+        model.variational_strategy.initialize_variational_dist()
+        model.variational_strategy.variational_distribution.variational_mean.data.normal_()
+        concat_model.load_state_dict(model.state_dict())
+
+        # The kernel blocks are evaluated separately
+        inducing_points = model.variational_strategy.inducing_points
+        terms = model.variational_strategy._prior_terms(inducing_points, train_x.unsqueeze(-1))
+        self.assertEqual([term.shape for term in terms], [
+            torch.Size([25]), torch.Size([260]), torch.Size([25, 25]), torch.Size([25, 260]), torch.Size([260, 260])
+        ])
+        self.assertTrue(all(isinstance(term, LazyEvaluatedKernelTensor) for term in terms[2:]))
+
+        # A prior that is not a lazily evaluated kernel is split into blocks. Either way, it is only evaluated once
+        concat_forward = concat_model.forward
+        num_forward_calls = []
+        concat_model.forward = lambda x: num_forward_calls.append(x) or concat_forward(x)
+        concat_terms = concat_model.variational_strategy._prior_terms(inducing_points, train_x.unsqueeze(-1))
+        self.assertEqual(len(num_forward_calls), 1)
+        for term, concat_term in zip(terms, concat_terms):
+            self.assertLess((delazify(term) - delazify(concat_term)).abs().max().item(), 1e-5)
+
+        for training in [True, False]:
+            model.train(training)
+            concat_model.train(training)
+            output = model(train_x)
+            concat_output = concat_model(train_x)
+            self.assertLess((output.mean - concat_output.mean).abs().max().item(), 1e-4)
+            self.assertLess((output.variance - concat_output.variance).abs().max().item(), 1e-4)
+
+    def test_eval_cache(self):
+        train_x, train_y = train_data()
+        model = SVGPRegressionModel(torch.linspace(0, 1, 25))
+        variational_strategy = model.variational_strategy
+        variational_strategy.initialize_variational_dist()
+        variational_strategy.variational_distribution.variational_mean.data.normal_()
+        variational_strategy.variational_distribution.chol_variational_covar.data.mul_(0.5)
+
+        model.train()
+        output = model(train_x)
+        model.eval()
+        eval_output = model(train_x)
+        self.assertLess((output.mean - eval_output.mean).abs().max().item(), 1e-3)
+        self.assertLess((output.variance - eval_output.variance).abs().max().item(), 1e-3)
+
+        # The cache is reused...
+        cache = variational_strategy._memoize_cache["predictive_cache_memo"]
+        model(train_x[:10])
+        self.assertIs(variational_strategy._memoize_cache["predictive_cache_memo"], cache)
+
+        # ...until the parameters change
+        with torch.no_grad():
+            variational_strategy.variational_distribution.variational_mean.add_(1.)
+        new_eval_output = model(train_x)
+        self.assertIsNot(variational_strategy._memoize_cache["predictive_cache_memo"], cache)
+        self.assertGreater((new_eval_output.mean - eval_output.mean).abs().max().item(), 1e-1)
+
+        # ...including hyperparameters that are set in eval mode
+        cache = variational_strategy._memoize_cache["predictive_cache_memo"]
+        model.covar_module.base_kernel.lengthscale = 0.2
+        model(train_x)
+        self.assertIsNot(variational_strategy._memoize_cache["predictive_cache_memo"], cache)
+        cache = variational_strategy._memoize_cache["predictive_cache_memo"]
+        model.covar_module.initialize(outputscale=2.)
+        eval_output = model(train_x)
+        self.assertIsNot(variational_strategy._memoize_cache["predictive_cache_memo"], cache)
+        model.train()
+        output = model(train_x)
+        model.eval()
+        self.assertLess((output.mean - eval_output.mean).abs().max().item(), 1e-2)
+        self.assertLess((output.variance - eval_output.variance).abs().max().item(), 1e-2)
+
+        # ...or the model is trained
+        model.train()
+        self.assertNotIn("predictive_cache_memo", variational_strategy._memoize_cache)
+
+        # Without a Cholesky factorization of K_uu
+        output = model(train_x)
+        model.eval()
+        with gpytorch.settings.max_cholesky_inducing_size(10), mock.patch(
+            "gpytorch.variational.variational_strategy.psd_safe_cholesky", side_effect=AssertionError
+        ):
+            eval_output = model(train_x)
+        self.assertLess((output.mean - eval_output.mean).abs().max().item(), 1e-2)
+        self.assertLess((output.variance - eval_output.variance).abs().max().item(), 1e-2)
+
     def test_regression_error_cuda(self):
         if not torch.cuda.is_available():
             return
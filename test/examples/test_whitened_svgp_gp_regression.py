@@ -138,6 +138,10 @@ class TestSVGPRegression(unittest.TestCase):
     def test_regression_error_skip_logdet_forward(self):
         self.test_regression_error(skip_logdet_forward=True)
 
+    def test_regression_error_cg(self):
+        with gpytorch.settings.max_cholesky_inducing_size(0):
+            self.test_regression_error()
+
     def test_regression_error_skip_logdet_forward_cuda(self):
         if torch.cuda.is_available():
             with least_used_cuda_device():
@@ -4,6 +4,7 @@ import unittest
 from test._utils import approx_equal
 
 import torch
+from gpytorch.functions._matmul import Matmul
 from gpytorch.lazy import NonLazyTensor
 
 
@@ -45,6 +46,20 @@ class TestMatmulNonBatch(unittest.TestCase):
         self.assertTrue(approx_equal(self.mat_copy.grad, self.mat.grad))
         self.assertTrue(approx_equal(self.vecs_copy.grad, self.vecs.grad))
 
+    def test_matmul_reconstructs_lazy_tensor_once(self):
+        lazy_tensor = NonLazyTensor(self.mat)
+        representation_tree = lazy_tensor.representation_tree()
+        num_calls = [0]
+
+        def counting_representation_tree(*args):
+            num_calls[0] += 1
+            return representation_tree(*args)
+
+        res = Matmul(counting_representation_tree)(self.vecs, *lazy_tensor.representation())
+        res.sum().backward()
+        self.assertEqual(num_calls[0], 1)
+        self.assertTrue(approx_equal(self.mat.grad, self.vecs.sum(-1).unsqueeze(0).expand(3, 3)))
+
 
 class TestMatmulBatch(unittest.TestCase):
     def setUp(self):
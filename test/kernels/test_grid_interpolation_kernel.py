@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import torch
+import unittest
+from gpytorch.kernels import RBFKernel, GridInterpolationKernel
+
+
+class TestGridInterpolationKernel(unittest.TestCase):
+    def test_interpolation_reused_for_same_inputs(self):
+        kernel = GridInterpolationKernel(RBFKernel(), grid_size=10, grid_bounds=[(0, 1)])
+        x = torch.rand(1, 20, 1)
+        covar = kernel(x, x).evaluate_kernel()
+        covar_2 = kernel(x.clone(), x.clone()).evaluate_kernel()
+        self.assertEqual(covar_2.left_interp_indices.data_ptr(), covar.left_interp_indices.data_ptr())
+        self.assertIs(covar_2.left_interp_values, covar.left_interp_values)
+        # ...and so are the sparse interpolation matrices (also by LazyTensors that are reconstructed from them)
+        interp_t = covar._sparse_left_interp()[0]
+        self.assertIs(covar_2._sparse_left_interp()[0], interp_t)
+        self.assertIs(covar_2._sparse_right_interp()[0], interp_t)
+        reconstructed = covar_2.representation_tree()(*covar_2.representation())
+        self.assertIs(reconstructed._sparse_left_interp()[0], interp_t)
+
+        # New inputs require a new interpolation
+        covar_3 = kernel(x + 0.01, x + 0.01).evaluate_kernel()
+        self.assertIsNot(covar_3.left_interp_values, covar_2.left_interp_values)
+
+        # So does a new grid
+        kernel(x, x).evaluate_kernel()
+        kernel.update_grid(kernel.grid * 1.1)
+        covar_4 = kernel(x, x).evaluate_kernel()
+        self.assertIsNot(covar_4.left_interp_values, covar_2.left_interp_values)
+        self.assertFalse(torch.equal(covar_4.left_interp_values, covar_2.left_interp_values))
+
+        # Inputs that require gradients are never cached
+        x_grad = x.clone().requires_grad_(True)
+        covar_5 = kernel(x_grad, x_grad).evaluate_kernel()
+        covar_6 = kernel(x_grad, x_grad).evaluate_kernel()
+        self.assertIsNot(covar_6.left_interp_values, covar_5.left_interp_values)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,9 @@
 
 import torch
 import unittest
-from gpytorch.kernels import RBFKernel, GridKernel, GridInterpolationKernel
-from gpytorch.lazy import KroneckerProductLazyTensor
+import gpytorch
+from gpytorch.kernels import RBFKernel, MaternKernel, ScaleKernel, GridKernel, GridInterpolationKernel
+from gpytorch.lazy import BTTBLazyTensor, KroneckerProductLazyTensor
 
 cv = GridInterpolationKernel(RBFKernel(), grid_size=10, grid_bounds=[(0, 1), (0, 2)])
 grid = cv.grid
@@ -30,6 +31,37 @@ class TestGridKernel(unittest.TestCase):
         actual_eval = base_kernel(grid_data, grid_data).evaluate()
         self.assertLess(torch.norm(grid_eval - actual_eval), 2e-5)
 
+    def test_grid_grid_nonseparable(self):
+        base_kernel = MaternKernel(nu=1.5)
+        kernel = GridKernel(base_kernel, grid)
+        grid_covar = kernel(grid_data, grid_data).evaluate_kernel()
+        self.assertIsInstance(grid_covar, BTTBLazyTensor)
+        grid_eval = grid_covar.evaluate()
+        actual_eval = base_kernel(grid_data, grid_data).evaluate()
+        self.assertLess(torch.norm(grid_eval - actual_eval), 2e-5)
+
+        with gpytorch.settings.use_toeplitz(False):
+            grid_covar = kernel(grid_data, grid_data).evaluate_kernel()
+            self.assertIsInstance(grid_covar, BTTBLazyTensor)
+            grid_eval = grid_covar.evaluate()
+        self.assertLess(torch.norm(grid_eval - actual_eval), 2e-5)
+
+    def test_grid_grid_scaled(self):
+        # The outputscale doesn't factorize over dimensions (it would be applied once per dimension)
+        base_kernel = ScaleKernel(RBFKernel())
+        base_kernel.outputscale = 3.0
+        kernel = GridKernel(base_kernel, grid)
+        grid_eval = kernel(grid_data, grid_data).evaluate()
+        actual_eval = base_kernel(grid_data, grid_data).evaluate()
+        self.assertLess(torch.norm(grid_eval - actual_eval), 1e-4)
+
+    def test_grid_grid_nonseparable_high_dimensional(self):
+        grid_4d = torch.linspace(0, 1, 3).unsqueeze(-1).repeat(1, 4)
+        kernel = GridKernel(MaternKernel(nu=1.5), grid_4d)
+        full_grid = kernel.full_grid
+        with self.assertRaises(RuntimeError):
+            kernel(full_grid, full_grid).evaluate_kernel()
+
     def test_nongrid_grid(self):
         base_kernel = RBFKernel()
         data = torch.randn(5, 2)
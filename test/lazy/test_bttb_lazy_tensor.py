@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import torch
+import unittest
+from itertools import product
+from gpytorch.lazy import BTTBLazyTensor
+from test.lazy._lazy_tensor_test_case import LazyTensorTestCase
+
+
+def _stencil(*sizes, batch_shape=torch.Size()):
+    # A (non-separable) stationary kernel evaluated at all offsets of a grid
+    offsets = torch.meshgrid(*[torch.arange(-size + 1, size, dtype=torch.float) for size in sizes])
+    dists = sum(offset.pow(2) for offset in offsets).sqrt()
+    stencil = (1 + dists) * torch.exp(-dists)
+    stencil = stencil.repeat(*batch_shape, *[1 for _ in sizes])
+    stencil[(Ellipsis, *[size - 1 for size in sizes])] += 1
+    return stencil
+
+
+def _evaluate(stencil, num_dims):
+    sizes = [(size + 1) // 2 for size in stencil.shape[-num_dims:]]
+    indices = list(product(*[range(size) for size in sizes]))
+    res = []
+    for i in indices:
+        row = [stencil[(Ellipsis, *[i_ - j_ + size - 1 for i_, j_, size in zip(i, j, sizes)])] for j in indices]
+        res.append(torch.stack(row, -1))
+    return torch.stack(res, -2)
+
+
+class TestBTTBLazyTensor(LazyTensorTestCase, unittest.TestCase):
+    seed = 0
+
+    def create_lazy_tensor(self):
+        stencil = _stencil(3, 4).requires_grad_(True)
+        return BTTBLazyTensor(stencil, 2)
+
+    def evaluate_lazy_tensor(self, lazy_tensor):
+        return _evaluate(lazy_tensor.stencil, lazy_tensor.num_dims)
+
+    def test_scaled_inv_quad_logdet_backward(self):
+        # e.g. a ScaleKernel wrapped around a GridKernel
+        lazy_tensor = self.create_lazy_tensor()
+        constant = torch.tensor(2.0, requires_grad=True)
+        rhs = torch.randn(*lazy_tensor.batch_shape, lazy_tensor.size(-1), 1)
+        inv_quad, logdet = (lazy_tensor * constant).inv_quad_logdet(rhs, logdet=True)
+        (inv_quad.sum() + logdet.sum()).backward()
+        self.assertIsNotNone(constant.grad)
+        self.assertIsNotNone(lazy_tensor.stencil.grad)
+
+
+class TestBTTBLazyTensor3d(TestBTTBLazyTensor):
+    def create_lazy_tensor(self):
+        stencil = _stencil(2, 3, 2).requires_grad_(True)
+        return BTTBLazyTensor(stencil, 3)
+
+
+class TestBTTBLazyTensorBatch(TestBTTBLazyTensor):
+    def create_lazy_tensor(self):
+        stencil = _stencil(3, 3, batch_shape=torch.Size([2]))
+        stencil[1].mul_(2)
+        return BTTBLazyTensor(stencil.requires_grad_(True), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -20,6 +20,12 @@ class TestConstantMulLazyTensor(LazyTensorTestCase, unittest.TestCase):
         column = lazy_tensor.base_lazy_tensor.column
         return sym_toeplitz(column) * constant
 
+    def test_root_decomposition_negative_constant(self):
+        # A negative constant has no square root, so the root of the base tensor can't be reused
+        lazy_tensor = ToeplitzLazyTensor(torch.tensor([5.0, 1.0, 2.0, 0.0])) * -2.5
+        root = lazy_tensor.root_decomposition().root.evaluate()
+        self.assertFalse(torch.isnan(root).any())
+
 
 class TestConstantMulLazyTensorBatch(LazyTensorTestCase, unittest.TestCase):
     seed = 0
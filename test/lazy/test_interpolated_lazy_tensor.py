@@ -1,8 +1,10 @@
 #!/usr/bin/env python3
 
 import unittest
+
 import torch
 from gpytorch.lazy import NonLazyTensor, InterpolatedLazyTensor
+from gpytorch.utils.sparse import make_sparse_from_indices_and_values
 from test.lazy._lazy_tensor_test_case import LazyTensorTestCase
 
 
@@ -42,6 +44,24 @@ class TestInterpolatedLazyTensor(LazyTensorTestCase, unittest.TestCase):
         actual = left_matrix.matmul(base_tensor).matmul(right_matrix.t())
         return actual
 
+    def test_root_decomposition_symmetric_interp(self):
+        # With identical left/right interpolation and a small base matrix, the root is exact and low rank
+        interp_indices = torch.LongTensor([[0, 1], [1, 2], [2, 0], [0, 2], [1, 0], [2, 1], [0, 0], [1, 1]])
+        interp_values = torch.rand(8, 2)
+        base_root = torch.randn(3, 3)
+        base_tensor = (base_root @ base_root.t() + torch.eye(3)).requires_grad_(True)
+        lazy_tensor = InterpolatedLazyTensor(
+            NonLazyTensor(base_tensor), interp_indices, interp_values, interp_indices, interp_values
+        )
+
+        self.assertEqual(lazy_tensor.root_decomposition_size(), 3)
+        root = lazy_tensor.root_decomposition().root.evaluate()
+        self.assertEqual(root.shape, torch.Size([8, 3]))
+        self.assertLess(((root @ root.t()) - lazy_tensor.evaluate()).abs().max().item(), 1e-4)
+
+        root.sum().backward()
+        self.assertIsNotNone(base_tensor.grad)
+
 
 class TestInterpolatedLazyTensorBatch(LazyTensorTestCase, unittest.TestCase):
     seed = 0
@@ -87,6 +107,41 @@ class TestInterpolatedLazyTensorBatch(LazyTensorTestCase, unittest.TestCase):
         return actual
 
 
+class TestInterpolatedLazyTensorBatchWithSparseInterp(TestInterpolatedLazyTensorBatch):
+    def create_lazy_tensor(self):
+        lazy_tensor = super(TestInterpolatedLazyTensorBatchWithSparseInterp, self).create_lazy_tensor()
+        left_interp_indices, left_interp_values = lazy_tensor.left_interp_indices, lazy_tensor.left_interp_values
+        right_interp_indices, right_interp_values = lazy_tensor.right_interp_indices, lazy_tensor.right_interp_values
+
+        return InterpolatedLazyTensor(
+            lazy_tensor.base_lazy_tensor,
+            left_interp_indices,
+            left_interp_values,
+            right_interp_indices,
+            right_interp_values,
+            sparse_left_interp_t=make_sparse_from_indices_and_values(
+                left_interp_indices, left_interp_values.detach(), 6
+            ),
+            sparse_right_interp_t=make_sparse_from_indices_and_values(
+                right_interp_indices, right_interp_values.detach(), 6
+            ),
+        )
+
+    def test_sparse_interp_reused_by_reconstructed_tensors(self):
+        lazy_tensor = self.create_lazy_tensor()
+        interp_t = lazy_tensor._kwargs["sparse_left_interp_t"]
+        self.assertIs(lazy_tensor._sparse_left_interp()[0], interp_t)
+
+        # LazyTensors reconstructed inside of autograd Functions reuse the sparse interpolation matrices
+        reconstructed = lazy_tensor.representation_tree()(*lazy_tensor.representation())
+        self.assertIs(reconstructed._sparse_left_interp()[0], interp_t)
+        self.assertIs(lazy_tensor.transpose(-1, -2)._sparse_right_interp()[0], interp_t)
+
+        # ...but LazyTensors with different interpolation tensors rebuild them
+        self.assertNotIn("sparse_left_interp_t", lazy_tensor[1:3]._kwargs)
+        self.assertNotIn("sparse_left_interp_t", lazy_tensor.unsqueeze(0)._kwargs)
+
+
 class TestInterpolatedLazyTensorMultiBatch(LazyTensorTestCase, unittest.TestCase):
     seed = 0
     # Because these LTs are large, we'll skil the big tests
@@ -46,6 +46,22 @@ class TestLazyEvaluatedKernelTensorBatch(LazyTensorTestCase, unittest.TestCase):
                     ((arg.grad - arg_copy.grad).abs() / arg_copy.grad.abs().clamp(1, 1e5)).max().item(), 3e-1
                 )
 
+    def test_evaluate_kernel_does_not_modify_kernel(self):
+        active_dims_seen = []
+
+        class ActiveDimsKernel(gpytorch.kernels.RBFKernel):
+            def forward(self, x1, x2, **params):
+                active_dims_seen.append(self.active_dims)
+                return super(ActiveDimsKernel, self).forward(x1, x2, **params)
+
+        kernel = ActiveDimsKernel(active_dims=torch.tensor([1, 2]))
+        mat = torch.randn(2, 5, 6)
+        lazy_tensor = kernel(mat)
+        res = lazy_tensor.evaluate_kernel().evaluate()
+        self.assertTrue(torch.equal(active_dims_seen[0], torch.tensor([1, 2])))
+        expected = gpytorch.kernels.RBFKernel()(mat[..., 1:3]).evaluate()
+        self.assertLess((res - expected).abs().max().item(), 1e-5)
+
     def test_getitem_tensor_index(self):
         # Not supported a.t.m. with LazyEvaluatedKernelTensors
         pass
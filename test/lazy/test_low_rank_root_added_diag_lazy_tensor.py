@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import torch
+import unittest
+from gpytorch.lazy import DiagLazyTensor, LowRankRootAddedDiagLazyTensor, RootLazyTensor
+from test.lazy._lazy_tensor_test_case import LazyTensorTestCase
+from test._utils import approx_equal
+
+
+class TestLowRankRootAddedDiagLazyTensor(LazyTensorTestCase, unittest.TestCase):
+    seed = 0
+    should_test_sample = True
+
+    def create_lazy_tensor(self):
+        root = torch.randn(5, 2, requires_grad=True)
+        diag = torch.tensor([1.0, 2.0, 4.0, 2.0, 3.0], requires_grad=True)
+        return LowRankRootAddedDiagLazyTensor(RootLazyTensor(root), DiagLazyTensor(diag))
+
+    def evaluate_lazy_tensor(self, lazy_tensor):
+        root = lazy_tensor._lazy_tensor.root.tensor
+        diag = lazy_tensor._diag_tensor._diag
+        return root.matmul(root.transpose(-1, -2)) + diag.diag()
+
+    def test_getitem_preserves_structure(self):
+        lazy_tensor = self.create_lazy_tensor()
+        res = lazy_tensor[1:4, 1:4]
+        self.assertIsInstance(res, LowRankRootAddedDiagLazyTensor)
+        self.assertTrue(approx_equal(res.evaluate(), self.evaluate_lazy_tensor(lazy_tensor)[1:4, 1:4]))
+
+    def test_inv_matmul_and_inv_quad_logdet_with_small_diag(self):
+        # The Woodbury identity loses precision when the diagonal is small compared to the low-rank term
+        root = torch.randn(200, 4)
+        diag = torch.full((200,), 1e-2)
+        rhs = root.matmul(torch.randn(4, 3))
+        lazy_tensor = LowRankRootAddedDiagLazyTensor(RootLazyTensor(root), DiagLazyTensor(diag))
+
+        dense = (root.matmul(root.transpose(-1, -2)) + diag.diag()).double()
+        actual_solve = torch.gesv(rhs.double(), dense)[0]
+        res_solve = lazy_tensor.inv_matmul(rhs)
+        self.assertLess(((res_solve.double() - actual_solve).norm() / actual_solve.norm()).item(), 2e-3)
+
+        actual_inv_quad = rhs.double().mul(actual_solve).sum()
+        actual_logdet = dense.logdet()
+        res_inv_quad, res_logdet = lazy_tensor.inv_quad_logdet(inv_quad_rhs=rhs, logdet=True)
+        self.assertLess(abs(res_inv_quad.item() / actual_inv_quad.item() - 1), 1e-3)
+        self.assertLess(abs(res_logdet.item() - actual_logdet.item()), 1e-2)
+
+
+class TestLowRankRootAddedDiagLazyTensorBatch(LazyTensorTestCase, unittest.TestCase):
+    seed = 4
+    should_test_sample = True
+
+    def create_lazy_tensor(self):
+        root = torch.randn(3, 5, 2, requires_grad=True)
+        diag = torch.tensor(
+            [[1.0, 2.0, 4.0, 2.0, 3.0], [2.0, 1.0, 2.0, 1.0, 4.0], [1.0, 2.0, 2.0, 3.0, 4.0]], requires_grad=True
+        )
+        return LowRankRootAddedDiagLazyTensor(RootLazyTensor(root), DiagLazyTensor(diag))
+
+    def evaluate_lazy_tensor(self, lazy_tensor):
+        root = lazy_tensor._lazy_tensor.root.tensor
+        diag = lazy_tensor._diag_tensor._diag
+        return root.matmul(root.transpose(-1, -2)) + torch.diag_embed(diag, dim1=-2, dim2=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ import torch
 import unittest
 import gpytorch.utils.toeplitz as toeplitz
 from gpytorch.lazy import ToeplitzLazyTensor
+from gpytorch.utils.memoize import is_cached
 from test.lazy._lazy_tensor_test_case import LazyTensorTestCase
 
 
@@ -17,6 +18,23 @@ class TestToeplitzLazyTensor(LazyTensorTestCase, unittest.TestCase):
     def evaluate_lazy_tensor(self, lazy_tensor):
         return toeplitz.sym_toeplitz(lazy_tensor.column)
 
+    def test_matmul_gradient_after_cached_fft(self):
+        lazy_tensor = self.create_lazy_tensor()
+        rhs = torch.randn(4, 3)
+
+        # Without gradients, the FFT of the column is cached
+        with torch.no_grad():
+            res = lazy_tensor._matmul(rhs)
+        self.assertTrue(is_cached(lazy_tensor, "circulant_fft"))
+
+        # With gradients, the cached FFT must not be used
+        res_grad = lazy_tensor._matmul(rhs)
+        grad, = torch.autograd.grad(res_grad.sum(), lazy_tensor.column)
+        actual = self.evaluate_lazy_tensor(lazy_tensor).matmul(rhs)
+        actual_grad, = torch.autograd.grad(actual.sum(), lazy_tensor.column)
+        self.assertLess((res - actual).abs().max().item(), 1e-4)
+        self.assertLess((grad - actual_grad).abs().max().item(), 1e-4)
+
 
 class TestToeplitzLazyTensorBatch(LazyTensorTestCase, unittest.TestCase):
     seed = 0
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 
+import os
+import tempfile
+import numpy as np
 import torch
 import gpytorch
 import unittest
@@ -99,6 +102,328 @@ class TestExactGP(_ModelTestCase, unittest.TestCase):
         self.assertTrue(output.lazy_covariance_matrix.size(-1) == batch_data.size(-2))
         self.assertTrue(output.lazy_covariance_matrix.size(-2) == batch_data.size(-2))
 
+    def test_repeated_predictions_only_evaluate_test_points(self):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+        likelihood.eval()
+
+        test_x = torch.randn(20, 1)
+        with torch.no_grad(), gpytorch.settings.fast_pred_var():
+            expected = model(test_x)
+            expected_mean, expected_var = expected.mean, expected.variance
+
+            forward_sizes = []
+            forward = model.forward
+
+            def recording_forward(x):
+                forward_sizes.append(x.size(-2))
+                return forward(x)
+
+            model.forward = recording_forward
+            output = model(test_x)
+            self.assertEqual(forward_sizes, [20])
+            self.assertLess((output.mean - expected_mean).abs().max().item(), 1e-4)
+            self.assertLess((output.variance - expected_var).abs().max().item(), 1e-4)
+
+    def test_repeated_batch_predictions_only_evaluate_test_points(self):
+        train_x = self.create_batch_test_data()
+        likelihood, labels = self.create_batch_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+        likelihood.eval()
+
+        test_x = torch.randn(3, 20, 1)
+        with torch.no_grad():
+            expected = model(test_x)
+            expected_mean, expected_covar = expected.mean, expected.covariance_matrix
+
+            forward_sizes = []
+            forward = model.forward
+
+            def recording_forward(x):
+                forward_sizes.append(x.size(-2))
+                return forward(x)
+
+            model.forward = recording_forward
+            output = model(test_x)
+            self.assertEqual(forward_sizes, [20])
+            self.assertLess((output.mean - expected_mean).abs().max().item(), 1e-4)
+            self.assertLess((output.covariance_matrix - expected_covar).abs().max().item(), 1e-4)
+
+    def test_predictions_fall_back_to_concatenated_points(self):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+        likelihood.eval()
+
+        test_x = torch.randn(20, 1)
+        with torch.no_grad():
+            expected = model(test_x)
+            model.prediction_strategy = None
+
+            forward_sizes = []
+
+            def new_kernel_forward(x):
+                # The forward creates a new kernel on every call, so the prior at the test points can't be paired
+                # with the training inputs
+                forward_sizes.append(x.size(-2))
+                covar_x = gpytorch.kernels.AdditiveKernel(model.covar_module)(x)
+                return gpytorch.distributions.MultivariateNormal(model.mean_module(x), covar_x)
+
+            model.forward = new_kernel_forward
+            for _ in range(3):
+                output = model(test_x)
+                self.assertLess((output.mean - expected.mean).abs().max().item(), 1e-4)
+                self.assertLess((output.variance - expected.variance).abs().max().item(), 1e-4)
+            # The test points are only evaluated separately once
+            self.assertEqual(forward_sizes, [70, 20, 70, 70])
+
+    def test_prediction_cache_round_trip(self):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+
+        test_x = torch.randn(20, 1)
+        with torch.no_grad(), gpytorch.settings.fast_pred_var():
+            expected = model(test_x)
+            expected_mean, expected_var = expected.mean, expected.variance
+        cache_state = model.prediction_cache_state_dict()
+        self.assertEqual(set(cache_state["caches"].keys()), {"mean_cache", "covar_cache"})
+
+        new_likelihood = gpytorch.likelihoods.GaussianLikelihood()
+        new_model = self.create_model(train_x, labels, new_likelihood)
+        new_model.load_state_dict(model.state_dict())
+        new_model.eval()
+        new_model.load_prediction_cache_state_dict(cache_state)
+        with torch.no_grad(), gpytorch.settings.fast_pred_var():
+            output = new_model(test_x)
+            self.assertIs(new_model.prediction_strategy.mean_cache, cache_state["caches"]["mean_cache"])
+            self.assertIs(new_model.prediction_strategy.covar_cache, cache_state["caches"]["covar_cache"])
+            self.assertTrue(torch.equal(output.mean, expected_mean))
+            self.assertTrue(torch.equal(output.variance, expected_var))
+
+    def test_stale_prediction_cache_rejected(self):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+        with torch.no_grad():
+            model(torch.randn(20, 1)).mean
+        cache_state = model.prediction_cache_state_dict()
+
+        model.covar_module.base_kernel.initialize(lengthscale=2.)
+        with self.assertRaises(RuntimeError):
+            model.load_prediction_cache_state_dict(cache_state)
+
+        model = self.create_model(train_x, labels + 1, likelihood)
+        with self.assertRaises(RuntimeError):
+            model.load_prediction_cache_state_dict(cache_state)
+
+    def test_predict_stream(self):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+
+        test_x = torch.randn(45, 1)
+        with torch.no_grad():
+            expected = model(test_x)
+            expected_mean, expected_var = expected.mean, expected.variance
+
+        chunks = list(model.predict_stream(test_x, chunk_size=20))
+        self.assertEqual([mean.size(0) for mean, _ in chunks], [20, 20, 5])
+        mean = torch.cat([mean for mean, _ in chunks])
+        var = torch.cat([var for _, var in chunks])
+        self.assertLess((mean - expected_mean).abs().max().item(), 1e-4)
+        self.assertLess((var - expected_var).abs().max().item(), 1e-4)
+
+        # Iterables of inputs, written to a preallocated output
+        mean_out, var_out = torch.zeros(45), torch.zeros(45)
+        for _ in model.predict_stream(test_x.split(15), chunk_size=10, out=(mean_out, var_out)):
+            pass
+        self.assertLess((mean_out - expected_mean).abs().max().item(), 1e-4)
+        self.assertLess((var_out - expected_var).abs().max().item(), 1e-4)
+
+    def test_predict_stream_memmap_output(self):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+
+        test_x = torch.randn(3, 30, 1)
+        with torch.no_grad():
+            expected_mean = model(test_x).mean
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mean_out = np.memmap(os.path.join(tmpdir, "mean.dat"), dtype=np.float32, mode="w+", shape=(3, 30))
+            var_out = np.memmap(os.path.join(tmpdir, "var.dat"), dtype=np.float32, mode="w+", shape=(3, 30))
+            for _ in model.predict_stream(test_x, chunk_size=7, out=(mean_out, var_out)):
+                pass
+            mean_out.flush()
+            mean = torch.from_numpy(np.array(np.memmap(os.path.join(tmpdir, "mean.dat"), dtype=np.float32,
+                                                       shape=(3, 30))))
+            del mean_out, var_out
+        self.assertLess((mean - expected_mean).abs().max().item(), 1e-4)
+
+        model.train()
+        with self.assertRaises(RuntimeError):
+            next(model.predict_stream(test_x))
+
+    def test_compile_predictor(self):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+
+        test_x = torch.randn(20, 1)
+        for fast_pred_var in (True, False):
+            with gpytorch.settings.fast_pred_var(fast_pred_var):
+                predictor = model.compile_predictor()
+                with torch.no_grad():
+                    expected = model(test_x)
+            # Settings are captured at compile time
+            mean, variance = predictor.predict(test_x)
+            self.assertLess((mean - expected.mean).abs().max().item(), 1e-4)
+            self.assertLess((variance - expected.variance).abs().max().item(), 1e-4)
+
+        with gpytorch.settings.skip_posterior_variances():
+            self.assertTrue(torch.equal(model.compile_predictor().predict(test_x)[1], torch.zeros(20)))
+
+        # Changing the model does not change the predictor
+        model.covar_module.base_kernel.initialize(lengthscale=3.)
+        model.train()
+        self.assertTrue(torch.equal(predictor.predict(test_x)[0], mean))
+
+    def test_compile_predictor_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+        with gpytorch.settings.fast_pred_var():
+            predictor = model.compile_predictor()
+
+        test_xs = [torch.randn(5, 1) for _ in range(50)]
+        expected = [predictor.predict(test_x) for test_x in test_xs]
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(predictor.predict, test_xs))
+        for (mean, variance), (expected_mean, expected_variance) in zip(results, expected):
+            self.assertTrue(torch.equal(mean, expected_mean))
+            self.assertTrue(torch.equal(variance, expected_variance))
+
+    def _get_fantasy_and_expected_predictions(self, fant_x, fant_y):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+
+        test_x = torch.randn(20, 1)
+        with torch.no_grad(), gpytorch.settings.fast_pred_var():
+            model(test_x).mean
+            fant_model = model.get_fantasy_model(fant_x, fant_y)
+            output = fant_model(test_x)
+
+            expected = []
+            for sub_fant_x, sub_fant_y in zip(fant_x.view(-1, *fant_x.shape[-2:]), fant_y.view(-1, fant_y.size(-1))):
+                full_model = self.create_model(
+                    torch.cat([train_x, sub_fant_x]), torch.cat([labels, sub_fant_y]), likelihood
+                )
+                full_model.eval()
+                with gpytorch.settings.fast_pred_var(False):
+                    expected.append(full_model(test_x))
+        return output, expected
+
+    def test_fantasy_predictions(self):
+        fant_x, fant_y = torch.randn(5, 1), torch.randn(5)
+        for max_cholesky_size in (1000, 0):
+            with gpytorch.settings.max_cholesky_fantasy_size(max_cholesky_size):
+                output, (expected,) = self._get_fantasy_and_expected_predictions(fant_x, fant_y)
+                self.assertLess((output.mean - expected.mean).abs().max().item(), 1e-3)
+                self.assertLess((output.variance - expected.variance).abs().max().item(), 1e-3)
+
+    def test_batch_fantasy_predictions(self):
+        fant_x, fant_y = torch.randn(3, 5, 1), torch.randn(3, 5)
+        for max_cholesky_size in (1000, 0):
+            with gpytorch.settings.max_cholesky_fantasy_size(max_cholesky_size):
+                output, expected = self._get_fantasy_and_expected_predictions(fant_x, fant_y)
+                for i in range(3):
+                    self.assertLess((output.mean[i] - expected[i].mean).abs().max().item(), 1e-3)
+                    self.assertLess((output.variance[i] - expected[i].variance).abs().max().item(), 1e-3)
+
+    def test_batch_fantasy_shares_base_caches(self):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+
+        fant_x, fant_y = torch.randn(3, 5, 1, requires_grad=True), torch.randn(3, 5)
+        test_x = torch.randn(3, 4, 1)
+        with gpytorch.settings.fast_pred_var():
+            model(test_x[0]).mean
+            base_root = model.prediction_strategy.cholesky_inv_root
+            fant_model = model.get_fantasy_model(fant_x, fant_y)
+            output = fant_model(test_x)
+            fant_strat = fant_model.prediction_strategy
+            self.assertNotIn("covar_cache", fant_strat._memoize_cache)
+            self.assertIs(fant_strat._memoize_cache["covar_cache_blocks"][0], base_root)
+
+            # Gradients flow to the fantasy inputs
+            output.variance.sum().backward()
+            self.assertIsNotNone(fant_x.grad)
+
+            # The materialized root gives the same predictions
+            shared_variance = output.variance.detach()
+            fant_strat.covar_cache
+            del fant_strat._memoize_cache["covar_cache_blocks"]
+            self.assertEqual(fant_strat.covar_cache.shape, torch.Size([3, 55, 55]))
+            self.assertLess((fant_model(test_x).variance.detach() - shared_variance).abs().max().item(), 1e-4)
+
+    def test_append_train_data(self):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        new_x, new_y = torch.randn(3, 1), torch.randn(3)
+        test_x = torch.randn(20, 1)
+
+        for max_num_train in (None, 50, 20):
+            model = self.create_model(train_x, labels, likelihood)
+            model.eval()
+            with torch.no_grad(), gpytorch.settings.fast_pred_var():
+                model(test_x).mean
+                model.append_train_data(new_x, new_y, max_num_train=max_num_train)
+                self.assertIsNotNone(model.prediction_strategy)
+                output = model(test_x)
+
+                num_removed = 0 if max_num_train is None else train_x.size(0) + 3 - max_num_train
+                expected_x = torch.cat([train_x[num_removed:], new_x])
+                expected_y = torch.cat([labels[num_removed:], new_y])
+                self.assertTrue(torch.equal(model.train_inputs[0], expected_x))
+                self.assertTrue(torch.equal(model.train_targets, expected_y))
+
+                full_model = self.create_model(expected_x, expected_y, likelihood)
+                full_model.eval()
+                with gpytorch.settings.fast_pred_var(False):
+                    expected = full_model(test_x)
+                self.assertLess((output.mean - expected.mean).abs().max().item(), 1e-3)
+                self.assertLess((output.variance - expected.variance).abs().max().item(), 1e-3)
+
+    def test_append_train_data_without_caches(self):
+        train_x = self.create_test_data()
+        likelihood, labels = self.create_likelihood_and_labels()
+        model = self.create_model(train_x, labels, likelihood)
+        model.eval()
+        model.append_train_data(torch.randn(3, 1), torch.randn(3), max_num_train=20)
+        self.assertIsNone(model.prediction_strategy)
+        self.assertEqual(model.train_inputs[0].shape, torch.Size([20, 1]))
+        self.assertTrue(torch.equal(model.train_targets[:17], labels[-17:]))
+
+        with self.assertRaises(RuntimeError):
+            model.append_train_data(torch.randn(30, 1), torch.randn(30), max_num_train=20)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import asyncio
+import torch
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from gpytorch.models import PredictionBatcher
+
+
+class TestPredictionBatcher(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.batch_sizes = []
+
+    def tearDown(self):
+        self.loop.close()
+
+    def predict_fn(self, x):
+        self.batch_sizes.append(x.size(-2))
+        return x.sum(-1), x.prod(-1)
+
+    def run_requests(self, batcher, requests):
+        async def run():
+            results = await asyncio.gather(*(batcher.predict(x) for x in requests))
+            await batcher.close()
+            return results
+
+        return self.loop.run_until_complete(run())
+
+    def test_predict(self):
+        requests = [torch.randn(i % 5 + 1, 3) for i in range(40)]
+        batcher = PredictionBatcher(self.predict_fn, max_batch_size=16, max_latency=0.01)
+        results = self.run_requests(batcher, requests)
+
+        for x, (res_sum, res_prod) in zip(requests, results):
+            self.assertTrue(torch.equal(res_sum, x.sum(-1)))
+            self.assertTrue(torch.equal(res_prod, x.prod(-1)))
+        self.assertTrue(all(batch_size <= 16 for batch_size in self.batch_sizes))
+        self.assertEqual(sum(self.batch_sizes), sum(x.size(0) for x in requests))
+        self.assertLess(len(self.batch_sizes), len(requests))
+
+        stats = batcher.stats()
+        self.assertEqual(stats["requests"], 40)
+        self.assertEqual(stats["points"], sum(self.batch_sizes))
+        self.assertEqual(stats["batches"], len(self.batch_sizes))
+        self.assertGreaterEqual(stats["max_latency"], stats["mean_latency"])
+
+    def test_predict_waits_for_latency_budget(self):
+        batcher = PredictionBatcher(lambda x: x.sum(-1), max_batch_size=100, max_latency=0.01)
+
+        async def run():
+            first = asyncio.ensure_future(batcher.predict(torch.ones(2, 3)))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(batcher.predict(torch.ones(1, 3)))
+            return await first, await second
+
+        first, second = self.loop.run_until_complete(run())
+        self.assertTrue(torch.equal(first, torch.full((2,), 3.)))
+        self.assertTrue(torch.equal(second, torch.full((1,), 3.)))
+        self.assertEqual(batcher.stats()["batches"], 1)
+
+    def test_predict_with_executor(self):
+        requests = [torch.randn(3, 2) for _ in range(20)]
+        with ThreadPoolExecutor(2) as executor:
+            batcher = PredictionBatcher(self.predict_fn, max_batch_size=8, max_latency=0.01, executor=executor)
+            results = self.run_requests(batcher, requests)
+        for x, (res_sum, _) in zip(requests, results):
+            self.assertTrue(torch.equal(res_sum, x.sum(-1)))
+
+    def test_errors_are_propagated(self):
+        def predict_fn(x):
+            raise ValueError("bad input")
+
+        batcher = PredictionBatcher(predict_fn, max_batch_size=4, max_latency=0.01)
+        with self.assertRaises(ValueError):
+            self.run_requests(batcher, [torch.randn(2, 2) for _ in range(3)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import asyncio
+import threading
+import unittest
+
+from gpytorch import settings
+
+
+class TestSettings(unittest.TestCase):
+    def test_nested_settings(self):
+        self.assertFalse(settings.fast_pred_var.on())
+        self.assertEqual(settings.max_cg_iterations.value(), 1000)
+        fast_pred_var = settings.fast_pred_var()
+        with fast_pred_var, settings.max_cg_iterations(10):
+            self.assertTrue(settings.fast_pred_var.on())
+            with settings.fast_pred_var(False), settings.max_cg_iterations(20):
+                self.assertTrue(settings.fast_pred_var.off())
+                self.assertEqual(settings.max_cg_iterations.value(), 20)
+                with fast_pred_var:
+                    self.assertTrue(settings.fast_pred_var.on())
+                self.assertTrue(settings.fast_pred_var.off())
+            self.assertTrue(settings.fast_pred_var.on())
+            self.assertEqual(settings.max_cg_iterations.value(), 10)
+        self.assertFalse(settings.fast_pred_var.on())
+        self.assertEqual(settings.max_cg_iterations.value(), 1000)
+
+    def test_fast_computations(self):
+        with settings.fast_computations(covar_root_decomposition=False, log_prob=False):
+            self.assertFalse(settings.fast_computations.covar_root_decomposition.on())
+            self.assertFalse(settings.fast_computations.log_prob.on())
+        self.assertTrue(settings.fast_computations.covar_root_decomposition.on())
+        self.assertTrue(settings.fast_computations.log_prob.on())
+
+    def test_settings_are_thread_local(self):
+        entered = threading.Event()
+        checked = threading.Event()
+        results = {}
+
+        def set_settings():
+            with settings.fast_pred_var(), settings.max_cg_iterations(10):
+                entered.set()
+                checked.wait()
+                results["worker"] = (settings.fast_pred_var.on(), settings.max_cg_iterations.value())
+
+        thread = threading.Thread(target=set_settings)
+        thread.start()
+        entered.wait()
+        results["main"] = (settings.fast_pred_var.on(), settings.max_cg_iterations.value())
+        checked.set()
+        thread.join()
+
+        self.assertEqual(results["main"], (False, 1000))
+        self.assertEqual(results["worker"], (True, 10))
+
+    def test_num_probe_vectors_are_thread_local(self):
+        entered = threading.Event()
+        checked = threading.Event()
+        results = {}
+
+        def set_settings():
+            with settings.fast_pred_var(num_probe_vectors=5):
+                entered.set()
+                checked.wait()
+                results["worker"] = settings.fast_pred_var.num_probe_vectors()
+
+        thread = threading.Thread(target=set_settings)
+        thread.start()
+        entered.wait()
+        results["main"] = settings.fast_pred_var.num_probe_vectors()
+        with settings.fast_pred_var(num_probe_vectors=3):
+            results["main_context"] = settings.fast_pred_var.num_probe_vectors()
+        checked.set()
+        thread.join()
+
+        self.assertEqual(results, {"main": 1, "main_context": 3, "worker": 5})
+        self.assertEqual(settings.fast_pred_var.num_probe_vectors(), 1)
+
+    def test_captured_settings(self):
+        with settings.max_cg_iterations(5), settings.debug(False), settings.fast_pred_var(num_probe_vectors=2):
+            captured = settings._captured_settings()
+        results = []
+
+        def get_settings():
+            return (
+                settings.max_cg_iterations.value(),
+                settings.debug.on(),
+                settings.fast_pred_var.on(),
+                settings.fast_pred_var.num_probe_vectors(),
+            )
+
+        def run_captured():
+            with captured:
+                results.append(get_settings())
+            results.append(get_settings())
+
+        thread = threading.Thread(target=run_captured)
+        thread.start()
+        thread.join()
+        self.assertEqual(results, [(5, False, True, 2), (1000, True, False, 1)])
+
+    def test_settings_are_task_local(self):
+        if settings.ContextVar is None:
+            return
+
+        async def predict(tolerance, ready, results):
+            with settings.eval_cg_tolerance(tolerance):
+                ready.set()
+                await asyncio.sleep(0.01)
+                results.append(settings.eval_cg_tolerance.value())
+
+        async def run():
+            results = []
+            ready = asyncio.Event()
+            task = asyncio.ensure_future(predict(0.1, ready, results))
+            await ready.wait()
+            results.append(settings.eval_cg_tolerance.value())
+            await task
+            return results
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertEqual(results, [0.01, 0.1])
+
+
+if __name__ == "__main__":
+    unittest.main()
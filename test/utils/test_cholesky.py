@@ -5,7 +5,7 @@ import warnings
 from test._utils import least_used_cuda_device
 
 import torch
-from gpytorch.utils.cholesky import psd_safe_cholesky
+from gpytorch.utils.cholesky import _batch_trtrs, psd_safe_cholesky, triangular_solve
 
 
 class TestPSDSafeCholesky(unittest.TestCase):
@@ -85,5 +85,26 @@ class TestPSDSafeCholesky(unittest.TestCase):
                 self.test_psd_safe_cholesky_psd(cuda=True)
 
 
+class TestTriangularSolve(unittest.TestCase):
+    def test_triangular_solve(self):
+        A = torch.randn(3, 2, 5, 5).tril()
+        A.diagonal(dim1=-2, dim2=-1).abs_().add_(1)
+        b = torch.randn(2, 5, 4)
+        for upper in (False, True):
+            tri = A.transpose(-1, -2) if upper else A
+            for transpose in (False, True):
+                lhs = tri.transpose(-1, -2) if transpose else tri
+                expected = torch.stack([
+                    torch.stack([torch.inverse(lhs[i, j]).matmul(b[j]) for j in range(2)]) for i in range(3)
+                ])
+                # The batches are broadcast (with a loop over the batches for PyTorch < 1.1)
+                for res in (
+                    triangular_solve(b.expand(3, 2, 5, 4), tri, upper=upper, transpose=transpose),
+                    _batch_trtrs(b, tri, upper=upper, transpose=transpose),
+                ):
+                    self.assertEqual(res.shape, torch.Size([3, 2, 5, 4]))
+                    self.assertLess((res - expected).abs().max().item(), 1e-4)
+
+
 if __name__ == "__main__":
     unittest.main()
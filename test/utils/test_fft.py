@@ -83,6 +83,17 @@ class TestFFT(unittest.TestCase):
         self.assertLess(torch.norm(input.double() - recon), 1e-5)
         self.assertTrue(isinstance(res, torch.DoubleTensor))
 
+    def test_next_fast_len(self):
+        self.assertEqual([fft.next_fast_len(size) for size in (1, 7, 11, 13, 17, 31, 97)], [1, 8, 12, 15, 18, 32, 100])
+
+    def test_irfft1_inverts_rfft1(self):
+        input = torch.randn(3, 6, 7)
+        res = fft.rfft1(input, 10)
+        self.assertEqual(tuple(res.size()), (3, 6, 6, 2))
+        recon = fft.irfft1(res, 10)
+        self.assertLess(torch.norm(recon[..., :7] - input), 1e-5)
+        self.assertLess(torch.norm(recon[..., 7:]), 1e-5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import unittest
+
+import torch
+import torch.utils.data
+from gpytorch.kernels import RBFKernel
+from gpytorch.utils import pivoted_cholesky
+from gpytorch.utils.inducing_points import kmeans_inducing_points, pivoted_cholesky_inducing_points
+
+
+class TestInducingPoints(unittest.TestCase):
+    def setUp(self):
+        if os.getenv("UNLOCK_SEED") is None or os.getenv("UNLOCK_SEED").lower() == "false":
+            self.rng_state = torch.get_rng_state()
+            torch.manual_seed(0)
+            if torch.cuda.is_available():
+                torch.cuda.manual_seed_all(0)
+            random.seed(0)
+
+    def tearDown(self):
+        if hasattr(self, "rng_state"):
+            torch.set_rng_state(self.rng_state)
+
+    def clustered_data(self):
+        self.cluster_centers = torch.tensor([[0.0, 0.0], [3.0, 3.0], [-3.0, 3.0], [3.0, -3.0]])
+        return torch.cat([torch.randn(500, 2).mul(0.1).add(center) for center in self.cluster_centers])
+
+    def nystrom_error(self, kernel, x, inducing_points):
+        data_induc_covar = kernel(x, inducing_points).evaluate()
+        induc_induc_covar = kernel(inducing_points).evaluate() + 1e-4 * torch.eye(inducing_points.size(0))
+        approx_var = (data_induc_covar @ induc_induc_covar.inverse() * data_induc_covar).sum(-1)
+        return (kernel(x, diag=True) - approx_var).mean().item()
+
+    def assertFindsClusters(self, inducing_points):
+        self.assertEqual(inducing_points.shape, torch.Size([4, 2]))
+        dists = (inducing_points.unsqueeze(-2) - self.cluster_centers).norm(dim=-1)
+        self.assertLess(dists.min(0)[0].max().item(), 0.1)
+
+    def test_kmeans_inducing_points(self):
+        x = self.clustered_data()
+        self.assertFindsClusters(kmeans_inducing_points(x, 4))
+        self.assertFindsClusters(kmeans_inducing_points(x, 4, chunk_size=128))
+
+    def test_kmeans_inducing_points_data_loader(self):
+        x = self.clustered_data()
+        loader = torch.utils.data.DataLoader(torch.utils.data.TensorDataset(x, x[:, 0]), batch_size=128, shuffle=True)
+        self.assertFindsClusters(kmeans_inducing_points(loader, 4, num_iter=3))
+
+    def test_kmeans_inducing_points_1d(self):
+        inducing_points = kmeans_inducing_points(torch.linspace(0, 1, 100), 5)
+        self.assertEqual(inducing_points.shape, torch.Size([5, 1]))
+
+    def test_pivoted_cholesky_inducing_points(self):
+        kernel = RBFKernel()
+        kernel.initialize(lengthscale=0.3)
+        x = torch.rand(1000, 2)
+
+        inducing_points = pivoted_cholesky_inducing_points(x, 30, kernel)
+        self.assertEqual(inducing_points.shape, torch.Size([30, 2]))
+        # The inducing points are data points
+        self.assertTrue(all((x == point).all(-1).any() for point in inducing_points))
+
+        # The greedy selection is a better approximation of the kernel than a random subset
+        random_inducing_points = x[torch.randperm(1000)[:30]]
+        selected_error = self.nystrom_error(kernel, x, inducing_points)
+        self.assertLess(selected_error, self.nystrom_error(kernel, x, random_inducing_points))
+
+        # Streaming over chunks gives a comparable approximation
+        chunked_inducing_points = pivoted_cholesky_inducing_points(x, 30, kernel, chunk_size=200)
+        self.assertLess(self.nystrom_error(kernel, x, chunked_inducing_points), 2 * selected_error)
+
+    def test_pivoted_cholesky_inducing_points_low_rank(self):
+        # Only 3 distinct points: the kernel matrix has rank 3
+        x = torch.tensor([0.0, 1.0, 2.0]).repeat(10)
+        inducing_points = pivoted_cholesky_inducing_points(x, 5, RBFKernel())
+        self.assertEqual(inducing_points.shape, torch.Size([3, 1]))
+        self.assertEqual(set(inducing_points.view(-1).tolist()), {0.0, 1.0, 2.0})
+
+    def test_pivoted_cholesky_returns_pivots(self):
+        x = torch.rand(50, 1)
+        covar = RBFKernel()(x).evaluate()
+        piv_chol, pivots = pivoted_cholesky.pivoted_cholesky(covar, 10, return_pivots=True)
+        self.assertEqual(pivots.shape, torch.Size([piv_chol.size(-1)]))
+        self.assertEqual(pivots[0].item(), covar.diag().argmax().item())
+        # The rows of the pivots are reconstructed exactly
+        self.assertTrue(torch.allclose((piv_chol @ piv_chol.t())[pivots], covar[pivots], atol=1e-4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -143,6 +143,19 @@ class TestCubicInterpolation(unittest.TestCase):
         )
         self.assertTrue(test._utils.approx_equal(values, actual_values))
 
+    def test_boundary_interpolation(self):
+        grid = torch.linspace(0.0, 1.0, 11).unsqueeze(1).repeat(1, 2)
+        x = torch.tensor([[0.0, 0.52], [0.52, 1.0], [0.03, 0.98]])
+
+        indices, values = Interpolation().interpolate(grid, x)
+        self.assertEqual(indices.shape, torch.Size([3, 16]))
+
+        # Points near the boundary put all of their weight (along that dimension) on the closest grid point
+        grid_values = grid[:, 0].unsqueeze(-1) * 10 + grid[:, 1].unsqueeze(-2)
+        res = left_interp(indices, values, grid_values.view(-1, 1)).squeeze(-1)
+        actual = torch.tensor([0.52, 6.2, 1.0])
+        self.assertTrue(test._utils.approx_equal(res, actual))
+
 
 class TestInterp(unittest.TestCase):
     def setUp(self):
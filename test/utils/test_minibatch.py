@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import tempfile
+import unittest
+from math import pi
+
+import numpy as np
+import torch
+import gpytorch
+from gpytorch.utils.minibatch import MinibatchLoader, train_variational
+
+
+class SVGPRegressionModel(gpytorch.models.AbstractVariationalGP):
+    def __init__(self, inducing_points):
+        variational_distribution = gpytorch.variational.CholeskyVariationalDistribution(inducing_points.size(-2))
+        variational_strategy = gpytorch.variational.VariationalStrategy(
+            self, inducing_points, variational_distribution, learn_inducing_locations=True
+        )
+        super(SVGPRegressionModel, self).__init__(variational_strategy)
+        self.mean_module = gpytorch.means.ConstantMean()
+        self.covar_module = gpytorch.kernels.ScaleKernel(gpytorch.kernels.RBFKernel())
+
+    def forward(self, x):
+        mean_x = self.mean_module(x)
+        covar_x = self.covar_module(x)
+        return gpytorch.distributions.MultivariateNormal(mean_x, covar_x)
+
+
+class TestMinibatchLoader(unittest.TestCase):
+    def setUp(self):
+        if os.getenv("UNLOCK_SEED") is None or os.getenv("UNLOCK_SEED").lower() == "false":
+            self.rng_state = torch.get_rng_state()
+            torch.manual_seed(0)
+            if torch.cuda.is_available():
+                torch.cuda.manual_seed_all(0)
+            random.seed(0)
+
+    def tearDown(self):
+        if hasattr(self, "rng_state"):
+            torch.set_rng_state(self.rng_state)
+
+    def _check_epoch(self, loader, inputs, num_points=None):
+        batches = [(x_batch.clone(), y_batch.clone()) for x_batch, y_batch in loader]
+        self.assertEqual(len(batches), len(loader))
+        x_seen = torch.cat([x_batch for x_batch, _ in batches])
+        y_seen = torch.cat([y_batch for _, y_batch in batches])
+        # Targets stay paired with their inputs, and each point is seen (at most) once
+        self.assertTrue(torch.equal(y_seen, x_seen.sum(-1)))
+        self.assertEqual(x_seen.size(0), num_points or inputs.shape[0])
+        self.assertEqual(torch.unique(x_seen[:, 0]).numel(), x_seen.size(0))
+        return batches
+
+    def test_epoch_covers_data(self):
+        inputs = torch.rand(1000, 2)
+        targets = inputs.sum(-1)
+        self._check_epoch(MinibatchLoader(inputs, targets, batch_size=64), inputs)
+        self._check_epoch(MinibatchLoader(inputs, targets, batch_size=64, num_workers=1, prefetch=1), inputs)
+        self._check_epoch(MinibatchLoader(inputs, targets, batch_size=64, drop_last=True), inputs, num_points=960)
+
+        batches = self._check_epoch(MinibatchLoader(inputs, targets, batch_size=100, shuffle=False), inputs)
+        self.assertTrue(torch.equal(batches[0][0], inputs[:100]))
+
+    def test_reuses_buffers(self):
+        inputs = torch.rand(1000, 2)
+        loader = MinibatchLoader(inputs, inputs.sum(-1), batch_size=100, prefetch=2)
+        buffer_ptrs = set(x_buffer.data_ptr() for x_buffer, _ in loader._buffers)
+        for _ in range(2):
+            for x_batch, _ in loader:
+                self.assertIn(x_batch.data_ptr(), buffer_ptrs)
+
+    def test_sorted_batches_are_local(self):
+        inputs = torch.rand(2000, 2)
+        targets = inputs.sum(-1)
+        unsorted_batches = self._check_epoch(MinibatchLoader(inputs, targets, batch_size=100), inputs)
+        sorted_batches = self._check_epoch(
+            MinibatchLoader(inputs, targets, batch_size=100, sort_dim=1, bucket_size=250), inputs
+        )
+
+        def mean_range(batches):
+            return sum((x[:, 1].max() - x[:, 1].min()).item() for x, _ in batches) / len(batches)
+
+        self.assertGreater(mean_range(unsorted_batches), 0.9)
+        self.assertLess(mean_range(sorted_batches), 0.3)
+
+    def test_memory_mapped_data(self):
+        inputs = np.random.rand(500, 3).astype(np.float32)
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, "inputs.npy")
+            np.save(filename, inputs)
+            mmap_inputs = np.load(filename, mmap_mode="r")
+            loader = MinibatchLoader(mmap_inputs, inputs.sum(-1), batch_size=64, sort_dim=0)
+            self._check_epoch(loader, torch.from_numpy(inputs))
+            del mmap_inputs, loader
+
+    def test_train_variational(self):
+        train_x = torch.linspace(0, 1, 1000)
+        train_y = torch.sin(train_x * (2 * pi)) + torch.randn(1000) * 0.05
+        loader = MinibatchLoader(train_x.unsqueeze(-1), train_y, batch_size=100)
+
+        model = SVGPRegressionModel(torch.linspace(0, 1, 16).unsqueeze(-1))
+        likelihood = gpytorch.likelihoods.GaussianLikelihood()
+        optimizer = torch.optim.Adam([{"params": model.parameters()}, {"params": likelihood.parameters()}], lr=0.1)
+
+        epochs_seen = []
+        history = train_variational(
+            model, likelihood, loader, optimizer, num_epochs=10, callback=lambda stats: epochs_seen.append(stats)
+        )
+        self.assertEqual(len(history), 10)
+        self.assertEqual(epochs_seen, history)
+        self.assertEqual(history[-1]["samples"], 1000)
+        self.assertGreater(history[-1]["samples_per_sec"], 0)
+        self.assertLess(history[-1]["loss"], history[0]["loss"])
+
+        model.eval()
+        likelihood.eval()
+        with torch.no_grad():
+            test_x = torch.linspace(0.05, 0.95, 51)
+            test_preds = likelihood(model(test_x.unsqueeze(-1))).mean
+            mean_abs_error = torch.mean(torch.abs(torch.sin(test_x * (2 * pi)) - test_preds))
+        self.assertLess(mean_abs_error.item(), 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -58,6 +58,26 @@ class TestToeplitz(unittest.TestCase):
         res = utils.toeplitz.toeplitz_matmul(col.unsqueeze(0), row.unsqueeze(0), rhs_mat)
         self.assertTrue(test._utils.approx_equal(res, actual))
 
+    def test_toeplitz_matmul_with_circulant_fft(self):
+        col = torch.randn(7)
+        row = torch.cat([col[:1], torch.randn(6)])
+        rhs_mat = torch.randn(7, 3)
+
+        # The padded FFT size has only small prime factors
+        self.assertEqual(utils.toeplitz.toeplitz_fft_size(7), 15)
+        self.assertEqual(utils.toeplitz.toeplitz_fft_size(9), 18)
+
+        # Actual
+        lhs_mat = utils.toeplitz.toeplitz(col, row)
+        actual = torch.matmul(lhs_mat, rhs_mat)
+
+        # Fast toeplitz, with a precomputed FFT
+        circulant_fft = utils.toeplitz.toeplitz_circulant_fft(col, row)
+        res = utils.toeplitz.toeplitz_matmul(col, row, rhs_mat, circulant_fft=circulant_fft)
+        self.assertTrue(test._utils.approx_equal(res, actual))
+        res = utils.toeplitz.toeplitz_matmul(col, row, rhs_mat[:, 0], circulant_fft=circulant_fft)
+        self.assertTrue(test._utils.approx_equal(res, actual[:, 0]))
+
 
 if __name__ == "__main__":
     unittest.main()